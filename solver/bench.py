@@ -0,0 +1,288 @@
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Timings only mean something without answers coming from a cache
+os.environ["WGC_CACHE"] = "off"
+
+from wgc.game import JOB, HAZARD, COMPOSITIONS, probability, convert_to_skill_point
+from wgc import calc, backends
+from wgc.team import legacy_team
+from sweep import parse_levels
+
+# Solver benchmarks, run from the solver folder:
+#
+#   python bench.py all --json bench.json
+#   python bench.py all --baseline bench.json
+#
+# solvers: cold and warm seconds of solve_maxmin_no_soldier, _soldier and
+# _soldier_two_or_three (one, two and three allocations) on every backend,
+# level and hazard. Cold is a first solve after the backend's caches were
+# dropped (cbc's models, native's leader splits), warm a solve repeating it.
+# highs has no legacy functions and solves the same team through solve_team.
+# calculate: what Calculate runs behind the window (calc.calculate), from an
+# answer in memory, from the disk cache and solved cold.
+# warm: the GUI case of changing one input at a time. Every case solves a
+# random team, nudges one field and solves again, once cold and once warm
+# started from the first answer (see native._search), and checks both give
+# the same answer.
+# Every timing is the best of --repeat runs of the same thing, on the same
+# inputs for the same --seed: a busy machine only ever makes a run slower,
+# so the best one is what moves least between two benchmark runs.
+# startup: seconds to import wgc (all the window needs) and the solver in a
+# fresh interpreter, and the startup report of the window when there is a
+# display.
+#
+# Every timing goes into one flat {name: seconds} dict. --json writes it
+# with a few facts about the machine, --baseline compares against such a
+# file and exits with 1 when something got slower by more than --tolerance
+# (and by at least --min-delta seconds, so noise on tiny timings does not
+# count).
+
+SUCCESS = list(probability)
+FUNCTIONS = {"no_soldier": [JOB.Nat_Scientist, JOB.Soc_Scientist, JOB.Soc_Scientist],
+             "soldier": [JOB.Soldier, JOB.Nat_Scientist, JOB.Soc_Scientist],
+             "soldier_two_or_three": [JOB.Soldier, JOB.Soldier, JOB.Soc_Scientist]}
+FACILITY = (1.2, 1.1, 1.0) # obstacle, shooting, library
+ROLLS = probability["90%"]
+
+################################
+########### Solvers ############
+################################
+
+def best_of(repeat, run):
+    # Fewest seconds run() returned
+    return min(run() for _ in range(repeat))
+
+def drop_caches(name):
+    if name == "native":
+        backends.get("native")._splits.cache_clear()
+    elif name == "cbc":
+        backends.get("cbc")._models.clear()
+
+def solve_once(name, function, level, hazard):
+    module = backends.get(name)
+    skill_leader = convert_to_skill_point(level, True)
+    skill = convert_to_skill_point(level, False)
+    nb_soldiers = {"no_soldier": 0, "soldier": 1, "soldier_two_or_three": 2}[function]
+    options = FUNCTIONS[function]
+    start = time.perf_counter()
+    if hasattr(module, "solve_maxmin_" + function):
+        getattr(module, "solve_maxmin_" + function)(*FACILITY, skill_leader, *[skill] * nb_soldiers, skill, *ROLLS,
+                                                    options, hazard)
+    else:
+        module.solve_team(legacy_team(*FACILITY, skill_leader, [skill] * nb_soldiers, skill, *ROLLS,
+                                      options, hazard))
+    return time.perf_counter() - start
+
+def bench_solvers(names, levels, repeat):
+    metrics = {}
+    for name in names:
+        if not backends.available(name):
+            print(f"{name}: not available here, skipped")
+            continue
+        for function in FUNCTIONS:
+            cold, warm = [], []
+            for level in levels:
+                for hazard in HAZARD:
+                    key = f"solve/{name}/{function}/L{level}/{hazard.name}"
+                    metrics[key + "/cold"] = best_of(repeat, lambda: drop_caches(name)
+                                                     or solve_once(name, function, level, hazard))
+                    metrics[key + "/warm"] = best_of(repeat, lambda: solve_once(name, function, level, hazard))
+                    cold.append(metrics[key + "/cold"])
+                    warm.append(metrics[key + "/warm"])
+            print(f"{name:<7}{function:<22}cold {1000 * statistics.mean(cold):8.1f} ms, "
+                  f"warm {1000 * statistics.mean(warm):8.1f} ms mean, {1000 * max(warm):8.1f} ms worst "
+                  f"(levels {levels[0]}-{levels[-1]}, {len(HAZARD)} hazards)")
+    return metrics
+
+################################
+########## Calculate ###########
+################################
+
+def random_inputs(rng):
+    option = list(rng.choice(COMPOSITIONS))
+    soldier_1 = rng.randint(10, 100) if option[0] == JOB.Soldier else None
+    soldier_2 = rng.randint(10, 100) if option[:2] == [JOB.Soldier, JOB.Soldier] else None
+    return [option, rng.randint(10, 100), soldier_1, soldier_2, rng.randint(10, 100),
+            rng.randrange(0, 101, 10), rng.randrange(0, 101, 10), rng.randrange(0, 101, 10), rng.choice(SUCCESS)]
+
+def nudge(rng, args):
+    # One field of the GUI moved by one step
+    args = list(args)
+    fields = [1, 4, 5, 6, 7, 8] + [i for i in (2, 3) if args[i] is not None]
+    i = rng.choice(fields)
+    step = rng.choice([-1, 1])
+    if i == 8:
+        k = SUCCESS.index(args[8]) + step
+        args[8] = SUCCESS[k if 0 <= k < len(SUCCESS) else k - 2 * step]
+    elif i in (5, 6, 7):
+        args[i] = max(0, args[i] + 10 * step)
+    else:
+        args[i] = max(1, args[i] + step)
+    return args
+
+def solve(args, warm):
+    # One calculate without the answer caches; warm keeps the last answer of
+    # the team shape around, cold forgets it
+    calc.reset_caches(keep_warm=warm)
+    start = time.perf_counter()
+    res = calc.calculate(*args)
+    return res, time.perf_counter() - start
+
+def timed(f, *args):
+    start = time.perf_counter()
+    f(*args)
+    return time.perf_counter() - start
+
+def bench_calculate(cases, seed, repeat):
+    calc.use_answer_table(None)
+    rng = random.Random(seed)
+    inputs = [random_inputs(rng) for _ in range(cases)]
+    solved = [best_of(repeat, lambda: solve(args, False)[1]) for args in inputs]
+    memory = [best_of(repeat, lambda: timed(calc.cached, *args)) for args in inputs]
+
+    # The disk cache on a file of its own
+    with tempfile.TemporaryDirectory() as folder:
+        calc.use_disk_cache(os.path.join(folder, "answers.sqlite"))
+        for args in inputs:
+            calc.calculate(*args)
+        disk = [best_of(repeat, lambda: calc.reset_caches() or timed(calc.cached, *args)) for args in inputs]
+        calc.use_disk_cache(None)
+    calc.reset_caches()
+
+    metrics = {"calculate/solve": statistics.median(solved),
+               "calculate/solve_worst": max(solved),
+               "calculate/memory_hit": statistics.median(memory),
+               "calculate/disk_hit": statistics.median(disk)}
+    print(f"{cases} random inputs: solve {1000 * metrics['calculate/solve']:.1f} ms median "
+          f"({1000 * metrics['calculate/solve_worst']:.1f} ms worst), answer in memory "
+          f"{1e6 * metrics['calculate/memory_hit']:.0f} us, on disk {1e6 * metrics['calculate/disk_hit']:.0f} us")
+    return metrics
+
+def bench_warm(cases, seed, repeat):
+    calc.use_answer_table(None)
+    rng = random.Random(seed)
+    cold_total = warm_total = 0
+    for _ in range(cases):
+        args = random_inputs(rng)
+        moved = nudge(rng, args)
+        cold_times, warm_times = [], []
+        for _ in range(repeat):
+            solve(args, False)
+            cold, seconds = solve(moved, False)
+            cold_times.append(seconds)
+            solve(args, False)
+            warm, seconds = solve(moved, True)
+            warm_times.append(seconds)
+            if cold != warm:
+                raise SystemExit(f"warm and cold answers differ for {moved}: {warm} != {cold}")
+        cold_total += min(cold_times)
+        warm_total += min(warm_times)
+    print(f"{cases} one-field changes: cold {1000 * cold_total / cases:.1f} ms, "
+          f"warm {1000 * warm_total / cases:.1f} ms per solve ({cold_total / warm_total:.2f}x)")
+    return {"warm/cold": cold_total / cases, "warm/warm": warm_total / cases}
+
+################################
+########### Startup ############
+################################
+
+def fresh(code, repeat):
+    # Best of repeat runs of code in a new interpreter, as seconds from start
+    # to the end of code
+    times = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", "import time; start = time.perf_counter()\n" + code
+                              + "\nprint(time.perf_counter() - start)"],
+                             capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        times.append(float(out.stdout.split()[-1]))
+    return min(times)
+
+def bench_startup(repeat):
+    metrics = {"startup/import_wgc": fresh("import wgc", repeat),
+               "startup/import_solver": fresh("import wgc.native", repeat)}
+    print(f"import wgc {1000 * metrics['startup/import_wgc']:.1f} ms, "
+          f"with the solver {1000 * metrics['startup/import_solver']:.1f} ms")
+    if sys.platform == "win32" or os.environ.get("DISPLAY"):
+        out = subprocess.run([sys.executable, "solver.py", "--startup-report"], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)))
+        # Lines of "phase   seconds ms", see report_startup in solver.py
+        for line in out.stdout.splitlines():
+            if line.endswith(" ms"):
+                metrics["startup/window/" + line[:16].strip().replace(" ", "_")] = float(line[16:-3]) / 1000
+                print(line)
+    else:
+        print("no display, window startup skipped")
+    return metrics
+
+################################
+########### Baseline ###########
+################################
+
+def compare(metrics, baseline, tolerance, min_delta, args):
+    # Regressions against an earlier --json, printed; True when there are any
+    old = baseline["metrics"]
+    then = baseline["meta"].get("args", {})
+    differ = [name for name in ("levels", "repeat", "cases", "seed") if name in then and then[name] != vars(args)[name]]
+    if differ:
+        print("the baseline ran with other " + ", ".join(f"--{name} ({then[name]})" for name in differ)
+              + ", timings are not of the same inputs")
+    common = [name for name in metrics if name in old]
+    slower = [name for name in common
+              if metrics[name] > old[name] * (1 + tolerance) and metrics[name] - old[name] >= min_delta]
+    faster = [name for name in common
+              if metrics[name] < old[name] / (1 + tolerance) and old[name] - metrics[name] >= min_delta]
+    print(f"{len(common)} timings compared with the baseline ({baseline['meta'].get('date', '?')}): "
+          f"{len(slower)} slower, {len(faster)} faster by more than {100 * tolerance:.0f}%")
+    for name in sorted(slower, key=lambda name: old[name] / metrics[name]):
+        print(f"  slower {name}: {1000 * old[name]:.2f} -> {1000 * metrics[name]:.2f} ms "
+              f"({metrics[name] / old[name]:.2f}x)")
+    return bool(slower)
+
+def main():
+    parser = argparse.ArgumentParser(description="Solver benchmarks")
+    parser.add_argument("bench", choices=["all", "solvers", "calculate", "warm", "startup"])
+    parser.add_argument("--backends", default="native,highs", help="backends for solvers, from " + ", ".join(backends.MODULES))
+    parser.add_argument("--levels", default="1,10,25,50,100,150,200", help="levels for solvers, e.g. 1,10-20")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per timing, the best one counts")
+    parser.add_argument("--cases", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", default=None, help="write the timings to this file")
+    parser.add_argument("--baseline", default=None, help="compare with timings written by --json")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown, 0.25 = 25%%")
+    parser.add_argument("--min-delta", type=float, default=0.002, help="ignore slowdowns under this many seconds")
+    args = parser.parse_args()
+
+    run = ["solvers", "calculate", "warm", "startup"] if args.bench == "all" else [args.bench]
+    metrics = {}
+    if "solvers" in run:
+        metrics.update(bench_solvers(args.backends.split(","), parse_levels(args.levels), args.repeat))
+    if "calculate" in run:
+        metrics.update(bench_calculate(args.cases, args.seed, args.repeat))
+    if "warm" in run:
+        metrics.update(bench_warm(args.cases, args.seed, args.repeat))
+    if "startup" in run:
+        metrics.update(bench_startup(args.repeat))
+
+    if args.json:
+        import numpy
+        meta = {"date": time.strftime("%Y-%m-%d %H:%M:%S"), "python": platform.python_version(),
+                "numpy": numpy.__version__, "machine": platform.machine(), "system": platform.platform(),
+                "processor": platform.processor(), "solver_version": calc.SOLVER_VERSION, "args": vars(args)}
+        with open(args.json, "w") as f:
+            json.dump({"meta": meta, "metrics": metrics}, f, indent=1)
+        print(f"wrote {len(metrics)} timings to {args.json}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            if compare(metrics, json.load(f), args.tolerance, args.min_delta, args):
+                sys.exit(1)
+
+if __name__ == "__main__":
+    main()
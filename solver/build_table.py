@@ -0,0 +1,109 @@
+import argparse
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Answers must come from the solver, not from a cache left by an older run
+os.environ["WGC_CACHE"] = "off"
+
+from wgc.game import JOB, HAZARD, probability, success_rolls
+from wgc import calc, table
+from sweep import parse_levels
+
+# Builds the precomputed answer table (see wgc/table.py) that the app looks up
+# before solving anything:
+#
+#   python build_table.py --levels 1-60 --member-levels 1-60 --facility 0,10,20,30 --out answers.tbl
+#
+# Every combination of the axes is solved with calc.calculate, so the size (and
+# the build time) is the product of the axis lengths: keep the facility and
+# level lists to what players actually type in. Inputs outside the grid, or
+# with soldiers at other levels than the rest of the team, are still solved
+# live.
+
+ALL_OPTIONS = [list(option) for option in itertools.product(JOB, repeat=3)]
+
+def parse_ints(text):
+    return [int(x) for x in text.split(",")]
+
+def parse_options(text):
+    # "Soldier,Nat_Scientist,Soc_Scientist;Soldier,Soldier,Nat_Scientist" or "all"
+    if text == "all":
+        return ALL_OPTIONS
+    return [[JOB[name.strip()] for name in option.split(",")] for option in text.split(";")]
+
+def run_task(task, facility):
+    # One (option, leader level, member level): every facility point and
+    # success chance of it, in grid order
+    option, leader_lvl, member_lvl = task
+    answers = []
+    for shoot, obst, lib in itertools.product(facility["shoot"], facility["obst"], facility["lib"]):
+        for success in facility["success"]:
+            answers.append(calc.calculate(option, leader_lvl, member_lvl, member_lvl, member_lvl,
+                                          shoot, obst, lib, success))
+    return task, answers
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the precomputed answer table")
+    parser.add_argument("--options", default="all", help='compositions as "Soldier,Nat_Scientist,Soc_Scientist;..." (default all 27)')
+    parser.add_argument("--levels", default="1-60", help="leader levels, e.g. 1,5,10-20")
+    parser.add_argument("--member-levels", default=None, help="member levels (default same as --levels)")
+    parser.add_argument("--facility", default="0", help="facility levels as typed in the GUI, for all three facilities")
+    parser.add_argument("--shoot", default=None, help="shooting range levels (default --facility)")
+    parser.add_argument("--obst", default=None, help="obstacle course levels (default --facility)")
+    parser.add_argument("--lib", default=None, help="library levels (default --facility)")
+    parser.add_argument("--success", default=",".join(probability), help="success chances, e.g. 100%%,90%%")
+    parser.add_argument("--out", default="answers.tbl", help="table file")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    args = parser.parse_args()
+
+    options = parse_options(args.options)
+    levels = parse_levels(args.levels)
+    member_levels = parse_levels(args.member_levels) if args.member_levels else levels
+    facility = {name: parse_ints(getattr(args, name) or args.facility) for name in ("shoot", "obst", "lib")}
+    facility["success"] = args.success.split(",")
+    for success in facility["success"]:
+        try:
+            success_rolls(success)
+        except ValueError as e:
+            sys.exit(str(e))
+
+    axes = {"option": [[job.name for job in option] for option in options],
+            "leader_lvl": levels,
+            "member_lvl": member_levels,
+            "shoot": facility["shoot"],
+            "obst": facility["obst"],
+            "lib": facility["lib"],
+            "success": facility["success"]}
+    tasks = list(itertools.product(range(len(options)), levels, member_levels))
+    per_task = len(facility["shoot"]) * len(facility["obst"]) * len(facility["lib"]) * len(facility["success"])
+    print(f"{len(tasks) * per_task} answers in {len(tasks)} tasks")
+
+    # Grid order is AXES order with the last axis fastest, so a task fills one
+    # contiguous block
+    hazards = [h.name for h in HAZARD]
+    values = {name: [0] * (len(tasks) * per_task * width) for name, _, width in table.COLUMNS}
+    start = time.perf_counter()
+    # Nor from the answer table being rebuilt
+    with ProcessPoolExecutor(args.workers, initializer=calc.use_answer_table, initargs=(None,)) as pool:
+        futures = {pool.submit(run_task, (options[o], l, m), facility): n for n, (o, l, m) in enumerate(tasks)}
+        for done, future in enumerate(as_completed(futures), 1):
+            _, answers = future.result()
+            block = futures[future] * per_task
+            for i, res in enumerate(answers):
+                point = block + i
+                values["t"][point] = res["t"]
+                values["max_level"][point] = res["max_level"]
+                values["hazard"][point] = hazards.index(res["hazard"].name)
+                for row in table.ROWS:
+                    values[row][point * 3:point * 3 + 3] = res[row]
+            print(f"\r{done}/{len(tasks)} tasks, {time.perf_counter() - start:.0f}s", end="", flush=True)
+    print()
+
+    table.write_table(args.out, calc.SOLVER_VERSION, axes, hazards, values)
+    print(f"wrote {args.out} ({os.path.getsize(args.out) / 1e6:.1f} MB)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+import argparse
+import gzip
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from wgc.game import JOB, HAZARD, COMPOSITIONS, probability, success_rolls, convert_to_skill_point, whole_level
+from wgc.team import LEADER_LB, legacy_team, legacy_result, z_values, best_hazard
+from wgc import backends
+
+# Golden grid: CBC's answers (the pulp models the app started with) for a
+# spread of inputs, stored, so a faster backend can be checked against them
+# without running CBC again:
+#
+#   python golden.py build --cases 200        (slow, writes golden.jsonl.gz)
+#   python golden.py check --backend native   (exits with 1 on a mismatch)
+#
+# A case is one input of solve_maxmin_no_soldier / _soldier /
+# _soldier_two_or_three (picked from the composition like calc does) with
+# random levels 1-200, facility levels, success chance and rolls, solved for
+# every hazard approach. Checking solves the same calls on the backend and
+# compares per hazard:
+#   t      the optimum, to TOLERANCE
+#   level  the max level the app shows (whole_level(t): t within TOLERANCE
+#          can still land on both sides of a whole number)
+#   valid  the allocation spends every budget, keeps the lower bounds and
+#          really reaches t (z recomputed from it)
+# and per case the winning hazard (ties go to the first, like
+# solve_maxmin_all_hazards). Those are mismatches. Differences that are only
+# another optimum are counted but allowed (--strict fails on them too):
+#   z        z0-z6 of the allocation (ties in the non-binding checks)
+#   integer  z0-z6 as get_integer_results rounds them
+# Speed is compared with the CBC seconds stored at build time, so it means
+# most on the machine that built the grid; --workers 1 keeps timings clean.
+
+GOLDEN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden.jsonl.gz")
+TOLERANCE = 1e-6
+FUNCTIONS = {0: "no_soldier", 1: "soldier", 2: "soldier_two_or_three"}
+
+################################
+############ Cases #############
+################################
+
+def random_level(rng):
+    # Mostly low and mid levels, where players are, but up to 200
+    return rng.choice([rng.randint(1, 30), rng.randint(1, 100), rng.randint(1, 200)])
+
+def random_case(rng):
+    option = list(rng.choice(COMPOSITIONS))
+    nb_explicit = 2 if option[:2] == [JOB.Soldier, JOB.Soldier] else int(option[0] == JOB.Soldier)
+    if rng.random() < 0.5:
+        success = rng.choice(list(probability))
+    else:
+        success = f"{rng.randint(500, 1000) / 10:g}%"
+    ri, rg = success_rolls(success)
+    return {
+        "function": FUNCTIONS[nb_explicit],
+        "options": [job.name for job in option],
+        "obst_lvl": 1 + rng.choice([0, rng.randint(0, 200)]) / 100,
+        "shoot_lvl": 1 + rng.choice([0, rng.randint(0, 200)]) / 100,
+        "lib_lvl": 1 + rng.choice([0, rng.randint(0, 200)]) / 100,
+        "skill_leader": convert_to_skill_point(random_level(rng), True),
+        "skill_soldiers": [convert_to_skill_point(random_level(rng), False) for _ in range(nb_explicit)],
+        "skill_other": convert_to_skill_point(random_level(rng), False),
+        "success": success,
+        "roll_indiv": ri,
+        "roll_group": rg
+    }
+
+def case_team(case, hazard):
+    return legacy_team(case["obst_lvl"], case["shoot_lvl"], case["lib_lvl"], case["skill_leader"],
+                       case["skill_soldiers"], case["skill_other"], case["roll_indiv"], case["roll_group"],
+                       [JOB[name] for name in case["options"]], hazard)
+
+def solve(name, case, hazard):
+    # The legacy call of this case on a backend, and its seconds. highs has no
+    # legacy functions, it solves the same team through solve_team.
+    module = backends.get(name)
+    options = [JOB[name] for name in case["options"]]
+    start = time.perf_counter()
+    if hasattr(module, "solve_maxmin_" + case["function"]):
+        res = getattr(module, "solve_maxmin_" + case["function"])(
+            case["obst_lvl"], case["shoot_lvl"], case["lib_lvl"], case["skill_leader"], *case["skill_soldiers"],
+            case["skill_other"], case["roll_indiv"], case["roll_group"], options, hazard)
+    else:
+        res = legacy_result(module.solve_team(case_team(case, hazard)), len(case["skill_soldiers"]), False)
+    return res, time.perf_counter() - start
+
+def winner(ts):
+    # The hazard solve_maxmin_all_hazards picks: highest t, first on ties
+    names = [haz.name for haz in HAZARD]
+    return names[best_hazard([ts[name] for name in names])]
+
+def answer(res, seconds):
+    alloc = [res["x1"], res["a"]] + [res[f"x{i}"] for i in (2, 3) if f"x{i}" in res]
+    return {"t": float(res["t"]), "z": {k: float(v) for k, v in res["z"].items()},
+            "alloc": [[int(x) for x in row] for row in alloc], "seconds": seconds}
+
+def solve_case(name, case):
+    out = {}
+    for haz in HAZARD:
+        res, seconds = solve(name, case, haz)
+        out[haz.name] = answer(res, seconds)
+    return out
+
+################################
+########### Compare ############
+################################
+
+def valid(case, hazard, got):
+    # Whether the allocation is one the game allows and reaches its t
+    team = case_team(case, hazard)
+    leader, others, soldiers = got["alloc"][0], got["alloc"][1], got["alloc"][2:]
+    rows = [(leader, case["skill_leader"], LEADER_LB)] + [(others, case["skill_other"], team["pools"][0]["lb"])]
+    rows += [(x, budget, team["pools"][1]["lb"]) for x, budget in zip(soldiers, case["skill_soldiers"])]
+    if any(sum(x) != budget or any(v < lb for v, lb in zip(x, lbs)) for x, budget, lbs in rows):
+        return False
+    pools = [np.array([others], dtype=float), np.array(soldiers, dtype=float).reshape(-1, 3)]
+    z = z_values(team, leader, pools)
+    return min(z.values()) >= got["t"] - TOLERANCE * max(1, abs(got["t"]))
+
+def compare(case, got):
+    # {kind: [hazard, ...]} of every difference from the stored answers
+    found = {}
+    ref = case["answers"]
+    for haz in HAZARD:
+        a, b = ref[haz.name], got[haz.name]
+        tol = TOLERANCE * max(1, abs(a["t"]))
+        kinds = []
+        if abs(a["t"] - b["t"]) > tol:
+            kinds.append("t")
+        if whole_level(a["t"]) != whole_level(b["t"]):
+            kinds.append("level")
+        if not valid(case, haz, b):
+            kinds.append("valid")
+        if any(abs(a["z"][k] - b["z"][k]) > tol for k in a["z"]):
+            kinds.append("z")
+        if any(whole_level(a["z"][k]) != whole_level(b["z"][k]) for k in a["z"]):
+            kinds.append("integer")
+        for kind in kinds:
+            found.setdefault(kind, []).append(haz.name)
+    if winner({h: ref[h]["t"] for h in ref}) != winner({h: got[h]["t"] for h in got}):
+        found["hazard"] = ["all"]
+    return found
+
+FAIL = ["t", "level", "valid", "hazard"]
+ALLOWED = ["z", "integer"]
+
+################################
+############ Tasks #############
+################################
+
+def build_chunk(cases):
+    return [{**case, "answers": solve_case("cbc", case)} for case in cases]
+
+def check_chunk(name, cases):
+    out = []
+    for case in cases:
+        got = solve_case(name, case)
+        out.append((case["id"], compare(case, got), sum(a["seconds"] for a in got.values())))
+    return out
+
+def chunks(items, workers):
+    size = max(1, min(10, len(items) // (4 * workers)))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def load(path):
+    with gzip.open(path, "rt") as f:
+        lines = [json.loads(line) for line in f if line.strip()]
+    return lines[0], lines[1:]
+
+def build(args):
+    import pulp
+    if not backends.available("cbc"):
+        sys.exit("building the grid needs pulp with its CBC binary")
+    rng = random.Random(args.seed)
+    cases = [{"id": i, **random_case(rng)} for i in range(args.cases)]
+    start = time.perf_counter()
+    done = []
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for part in pool.map(build_chunk, chunks(cases, args.workers)):
+            done += part
+            print(f"\r{len(done)}/{len(cases)} cases", end="", file=sys.stderr, flush=True)
+    print(file=sys.stderr)
+    meta = {"date": time.strftime("%Y-%m-%d %H:%M:%S"), "seed": args.seed, "cases": len(done),
+            "pulp": pulp.__version__, "workers": args.workers, "seconds": time.perf_counter() - start}
+    with gzip.open(args.grid, "wt") as f:
+        for line in [meta] + done:
+            f.write(json.dumps(line) + "\n")
+    print(f"wrote {len(done)} cases ({len(done) * len(HAZARD)} solves) to {args.grid} "
+          f"in {meta['seconds']:.0f} s")
+
+def check(args):
+    meta, cases = load(args.grid)
+    if args.limit:
+        cases = cases[:args.limit]
+    if not backends.available(args.backend):
+        sys.exit(f"{args.backend} is not available here")
+    by_id = {case["id"]: case for case in cases}
+    counts = {kind: 0 for kind in FAIL + ALLOWED}
+    failed = []
+    ratios = []
+    total = reference = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        work = chunks(cases, args.workers)
+        parts = pool.map(check_chunk, [args.backend] * len(work), work)
+        for n, (i, found, seconds) in enumerate((r for part in parts for r in part), start=1):
+            case = by_id[i]
+            ref_seconds = sum(a["seconds"] for a in case["answers"].values())
+            total += seconds
+            reference += ref_seconds
+            ratios.append(ref_seconds / seconds)
+            for kind in found:
+                counts[kind] += 1
+            if any(kind in FAIL or args.strict for kind in found):
+                failed.append((case, found))
+            print(f"\r{n}/{len(cases)} cases", end="", file=sys.stderr, flush=True)
+    print(file=sys.stderr)
+
+    print(f"{args.backend} on {len(cases)} cases of {args.grid} (CBC answers from {meta['date']}), "
+          f"{time.perf_counter() - start:.1f} s on {args.workers} workers")
+    print("cases with  " + ", ".join(f"{kind} {counts[kind]}" for kind in FAIL)
+          + "  |  other optimum: " + ", ".join(f"{kind} {counts[kind]}" for kind in ALLOWED))
+    print(f"speed: {reference / total:.1f}x CBC in total, {statistics.median(ratios):.1f}x median per case, "
+          f"{min(ratios):.2f}x worst ({1000 * total / len(cases):.1f} ms per case against "
+          f"{1000 * reference / len(cases):.1f} ms)")
+    for case, found in failed[:args.show]:
+        inputs = {k: v for k, v in case.items() if k != "answers"}
+        print(f"  case {case['id']}: " + ", ".join(f"{kind} ({', '.join(h)})" for kind, h in found.items()))
+        print(f"    {json.dumps(inputs)}")
+    if failed:
+        print(f"{len(failed)} cases do not match")
+        sys.exit(1)
+    print("all cases match")
+
+def main():
+    parser = argparse.ArgumentParser(description="Check a solver backend against stored CBC answers")
+    parser.add_argument("command", choices=["build", "check"])
+    parser.add_argument("--grid", default=GOLDEN, help="the grid file (default golden.jsonl.gz next to this script)")
+    parser.add_argument("--backend", default="native", help="backend to check, from " + ", ".join(backends.MODULES))
+    parser.add_argument("--cases", type=int, default=200, help="cases to build")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the cases to build")
+    parser.add_argument("--limit", type=int, default=None, help="check only the first cases")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--strict", action="store_true", help="also fail on another optimum (z differences)")
+    parser.add_argument("--show", type=int, default=10, help="mismatching cases to print")
+    args = parser.parse_args()
+    if args.command == "build":
+        build(args)
+    else:
+        check(args)
+
+if __name__ == "__main__":
+    main()
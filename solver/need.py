@@ -0,0 +1,48 @@
+import argparse
+
+from wgc.game import JOB
+from wgc import calc
+
+# What it takes to clear a difficulty: the lowest level of every facility and
+# member that gets the team there, each one moved on its own with the rest as
+# given:
+#
+#   python need.py --target 40 --leader 40 --soldiers 35 --others 30 --lib 10 --success 90%
+#
+# See calc.minimum_level; every answer takes a handful of feasibility checks.
+
+NAMES = {"leader": "Leader level", "soldier_1": "Soldier 1 level", "soldier_2": "Soldier 2 level",
+         "others": "Others level", "shoot": "Shooting range", "obst": "Obstacle course", "lib": "Library"}
+
+def main():
+    parser = argparse.ArgumentParser(description="Lowest levels that reach a difficulty")
+    parser.add_argument("--target", type=int, required=True, help="difficulty level to reach")
+    parser.add_argument("--jobs", default="Soldier,Nat_Scientist,Soc_Scientist", help="jobs of slots 2-4")
+    parser.add_argument("--leader", type=int, required=True, help="leader level")
+    parser.add_argument("--soldiers", default="", help="levels of the soldiers in slots 2 and 3 (default --others)")
+    parser.add_argument("--others", type=int, required=True, help="level of the other members")
+    parser.add_argument("--shoot", type=int, default=0, help="shooting range level")
+    parser.add_argument("--obst", type=int, default=0, help="obstacle course level")
+    parser.add_argument("--lib", type=int, default=0, help="library level")
+    parser.add_argument("--success", default="100%", help="success chance, e.g. 90%%")
+    parser.add_argument("--fields", default=",".join(calc.LEVEL_FIELDS), help="inputs to search, from " + ", ".join(calc.LEVEL_FIELDS))
+    args = parser.parse_args()
+
+    option = [JOB[name.strip()] for name in args.jobs.split(",")]
+    soldiers = [int(x) for x in args.soldiers.split(",") if x]
+    nb_soldiers = 2 if option[:2] == [JOB.Soldier, JOB.Soldier] else int(option[0] == JOB.Soldier)
+    soldiers = (soldiers + [args.others] * 2)[:nb_soldiers] + [None, None]
+    inputs = (option, args.leader, soldiers[0], soldiers[1], args.others, args.shoot, args.obst, args.lib, args.success)
+
+    res = calc.calculate(*inputs)
+    print(f"Max level now {res['max_level']} ({res['hazard'].name}), target {args.target} at {args.success}")
+    needs = calc.minimum_levels(args.target, *inputs, fields=args.fields.split(","))
+    for field, level in needs.items():
+        now = inputs[calc.LEVEL_FIELDS[field][0]]
+        if level is None:
+            print(f"{NAMES[field]:<16} out of reach (up to {calc.LEVEL_FIELDS[field][2]})")
+        else:
+            print(f"{NAMES[field]:<16} {level:>6}   (now {now})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import argparse
+import cProfile
+import io
+import os
+import pstats
+import sys
+import time
+
+from wgc import capture, backends
+
+# Solves captured by WGC_CAPTURE (see wgc/capture.py) solved again, to time
+# and profile them away from the app:
+#
+#   python replay.py                      lists the captured solves
+#   python replay.py 3                    solves entry 3 again
+#   python replay.py 3 --profile          ... under cProfile
+#   python replay.py 3 --backend highs    ... on another backend
+#
+# An entry is its number, or the path of its folder.
+
+def find(entry, folder):
+    if os.path.isdir(entry):
+        return entry
+    for path in capture.entries(folder):
+        if int(os.path.basename(path).split("-")[0]) == int(entry):
+            return path
+    sys.exit(f"no captured solve {entry} in {folder or capture.default_folder()}")
+
+def show(folder):
+    kept = capture.entries(folder)
+    if not kept:
+        print(f"no captured solves in {folder or capture.default_folder()} (set WGC_CAPTURE=1 to capture some)")
+        return
+    print(f"{'entry':>6}  {'backend':<8}{'call':<24}{'seconds':>9}  {'status':<14}{'date'}")
+    for path in kept:
+        inputs, _ = capture.load(path)
+        number = int(os.path.basename(path).split("-")[0])
+        print(f"{number:>6}  {inputs['backend']:<8}{inputs['call']:<24}{inputs['seconds']:>9.3f}  "
+              f"{inputs['status']:<14}{inputs['date']}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve captured slow solves again")
+    parser.add_argument("entry", nargs="?", help="entry number or folder (none lists them)")
+    parser.add_argument("--folder", default=None, help="captures folder (default: WGC_CAPTURE or next to the cache)")
+    parser.add_argument("--backend", default=None, help="solve on this backend instead, from " + ", ".join(backends.MODULES))
+    parser.add_argument("--repeat", type=int, default=1, help="solves to time")
+    parser.add_argument("--profile", action="store_true", help="profile the last solve")
+    parser.add_argument("--top", type=int, default=25, help="functions the profile prints")
+    args = parser.parse_args()
+
+    folder = args.folder or capture.folder
+    if args.entry is None:
+        show(folder)
+        return
+    path = find(args.entry, folder)
+    inputs, call_args = capture.load(path)
+    name = args.backend or inputs["backend"]
+    if name != inputs["backend"]:
+        call_args.pop("warm", None) # only native takes a warm start
+    call = getattr(backends.get(name), inputs["call"])
+    capture.disable() # replaying must not capture again
+
+    print(f"{os.path.basename(path)}: {inputs['backend']} {inputs['call']}, {inputs['seconds']:.3f} s "
+          f"({inputs['status']}, kept as {inputs['reason']}) on {inputs['date']}")
+    times = []
+    for k in range(args.repeat):
+        profile = cProfile.Profile() if args.profile and k == args.repeat - 1 else None
+        start = time.perf_counter()
+        if profile:
+            profile.enable()
+        res = call(**call_args)
+        if profile:
+            profile.disable()
+        times.append(time.perf_counter() - start)
+    status = res.get("status", "Optimal")
+    print(f"{name}: {min(times):.3f} s best of {len(times)}, t {float(res['t']):.6f} ({status})")
+    if profile:
+        out = io.StringIO()
+        pstats.Stats(profile, stream=out).sort_stats("cumulative").print_stats(args.top)
+        print(out.getvalue())
+
+if __name__ == "__main__":
+    main()
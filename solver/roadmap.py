@@ -0,0 +1,66 @@
+import argparse
+import csv
+import sys
+
+from wgc.game import JOB
+from wgc import calc
+
+# The best distribution for every level a team goes through, to plan respecs:
+#
+#   python roadmap.py --jobs Soldier,Nat_Scientist,Soc_Scientist --to 60 --shoot 20 --success 90%
+#
+# Starts from the levels given (all 1 by default) and adds one level to every
+# member per row until the leader is at --to. All rows are solved in one pass,
+# each starting from the answer of the row before (see native.solve_roadmap).
+
+ROWS = ["leader", "slot1", "slot2", "others"]
+STATS = ["pow", "ath", "wit"]
+COLUMNS = (["leader_lvl", "soldier_1_lvl", "soldier_2_lvl", "others_lvl", "hazard", "max_level"]
+           + [f"{row}_{stat}" for row in ROWS for stat in STATS])
+
+def main():
+    parser = argparse.ArgumentParser(description="Best distribution at every level of a team")
+    parser.add_argument("--jobs", default="Soldier,Nat_Scientist,Soc_Scientist", help="jobs of slots 2-4")
+    parser.add_argument("--leader", type=int, default=1, help="leader level to start from")
+    parser.add_argument("--soldiers", default="", help="levels of the soldiers in slots 2 and 3 to start from (default --others)")
+    parser.add_argument("--others", type=int, default=1, help="level of the other members to start from")
+    parser.add_argument("--to", type=int, required=True, help="last leader level")
+    parser.add_argument("--shoot", type=int, default=0, help="shooting range level")
+    parser.add_argument("--obst", type=int, default=0, help="obstacle course level")
+    parser.add_argument("--lib", type=int, default=0, help="library level")
+    parser.add_argument("--success", default="100%", help="success chance, e.g. 90%%")
+    parser.add_argument("--out", default=None, help="write a .csv instead of printing a table")
+    args = parser.parse_args()
+
+    option = [JOB[name.strip()] for name in args.jobs.split(",")]
+    soldiers = [int(x) for x in args.soldiers.split(",") if x]
+    nb_soldiers = 2 if option[:2] == [JOB.Soldier, JOB.Soldier] else int(option[0] == JOB.Soldier)
+    soldiers = (soldiers + [args.others] * 2)[:nb_soldiers] + [None, None]
+
+    def progress(done, total):
+        print(f"\r{done}/{total} levels", end="", file=sys.stderr, flush=True)
+
+    rows = calc.roadmap(option, args.leader, soldiers[0], soldiers[1], args.others,
+                        args.shoot, args.obst, args.lib, args.success, args.to, progress=progress)
+    print(f"\r{len(rows)}/{len(rows)} levels", file=sys.stderr)
+    table = [list(res["levels"]) + [res["hazard"].name, res["max_level"]] + [x for row in ROWS for x in res[row]]
+             for res in rows]
+
+    if args.out:
+        with open(args.out, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(COLUMNS)
+            writer.writerows(table)
+        print(f"wrote {len(table)} levels to {args.out}")
+        return
+    header = ["Level", "Sold. 1", "Sold. 2", "Others", "Hazard", "Max"] + [row.capitalize() for row in ROWS]
+    print(f"{header[0]:>5} {header[1]:>7} {header[2]:>7} {header[3]:>6} {header[4]:<12}{header[5]:>4}  "
+          + "".join(f"{h:<13}" for h in header[6:]))
+    for line in table:
+        levels = ["" if x is None else x for x in line[:4]]
+        points = ["/".join(str(x) for x in line[6 + 3 * r:9 + 3 * r]) for r in range(len(ROWS))]
+        print(f"{levels[0]:>5} {levels[1]:>7} {levels[2]:>7} {levels[3]:>6} {line[4]:<12}{line[5]:>4}  "
+              + "".join(f"{p:<13}" for p in points))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import argparse
+import os
+
+# The answer is solved fresh, the simulation is what is being checked
+os.environ.setdefault("WGC_CACHE", "off")
+
+from wgc.game import JOB
+from wgc.dice import parse_success
+from wgc import calc, montecarlo
+
+# Rolls the dice for the answer of one team (the inputs of the GUI) and
+# reports how often each challenge is really cleared at the max level shown,
+# next to the exact chance and the chance asked for:
+#
+#   python simulate.py --jobs Soldier,Soldier,Soc_Scientist --leader 40 --soldiers 35,35 --others 30 --success 90%
+#
+# See wgc/montecarlo.py for how the expeditions are rolled.
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo check of a recommended distribution")
+    parser.add_argument("--jobs", default="Soldier,Nat_Scientist,Soc_Scientist", help="jobs of slots 2-4")
+    parser.add_argument("--leader", type=int, required=True, help="leader level")
+    parser.add_argument("--soldiers", default="", help="levels of the soldiers in slots 2 and 3, e.g. 35,35 (default --others)")
+    parser.add_argument("--others", type=int, required=True, help="level of the other members")
+    parser.add_argument("--shoot", type=int, default=0, help="shooting range level")
+    parser.add_argument("--obst", type=int, default=0, help="obstacle course level")
+    parser.add_argument("--lib", type=int, default=0, help="library level")
+    parser.add_argument("--success", default="100%", help="success chance, e.g. 90%%")
+    parser.add_argument("--level", type=int, default=None, help="difficulty level (default the max level)")
+    parser.add_argument("--trials", type=int, default=montecarlo.TRIALS, help="expeditions")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    option = [JOB[name.strip()] for name in args.jobs.split(",")]
+    soldiers = [int(x) for x in args.soldiers.split(",") if x]
+    nb_soldiers = 2 if option[:2] == [JOB.Soldier, JOB.Soldier] else int(option[0] == JOB.Soldier)
+    soldiers = (soldiers + [args.others] * 2)[:nb_soldiers] + [None, None]
+    inputs = (option, args.leader, soldiers[0], soldiers[1], args.others, args.shoot, args.obst, args.lib, args.success)
+    res = calc.calculate(*inputs)
+    _, skill_leader, soldierLvls, skill_other, obst_lvl, shoot_lvl, lib_lvl, _ = calc.solve_key(*inputs)
+    legacy = {"t": res["t"], "x1": res["leader"], "x2": res["slot1"], "x3": res["slot2"], "a": res["others"],
+              "hazard": res["hazard"]}
+    sim = montecarlo.simulate(legacy, obst_lvl, shoot_lvl, lib_lvl, skill_leader, list(soldierLvls), skill_other,
+                              option, level=args.level, trials=args.trials, seed=args.seed)
+
+    target = float(parse_success(args.success))
+    print(f"{res['hazard'].name}, level {sim['level']}, {sim['trials']} expeditions "
+          f"({sim['trials_per_s'] / 1e6:.1f}M/s), asked for {100 * target:g}% per challenge")
+    print(f"{'check':<6}{'need':>5}{'observed':>11}{'95% interval':>21}{'exact':>10}")
+    for name, check in list(sim["checks"].items()) + [("all", {**sim["all"], "need": ""})]:
+        print(f"{name:<6}{check['need']:>5}{100 * check['rate']:>10.3f}%"
+              f"   [{100 * check['low']:7.3f}%, {100 * check['high']:7.3f}%]{100 * check['exact']:>9.3f}%")
+    weakest = sim["weakest"]
+    verdict = "holds" if weakest["exact"] >= target else "does NOT hold"
+    print(f"weakest check {weakest['check']} at {100 * weakest['rate']:.3f}%: the {100 * target:g}% chance {verdict}")
+
+if __name__ == "__main__":
+    main()
@@ -1,503 +1,15 @@
-import numpy as np
-import pulp # type: ignore
-
-from enum import Enum
+import time
+STARTUP = time.perf_counter()
 
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, filedialog
 import sys
 import os
+import threading
+import queue
 
-class JOB(Enum):
-    Soldier = 1
-    Nat_Scientist = 2
-    Soc_Scientist = 3
-    
-    @classmethod
-    def toEnumOption(cls, stringJob):
-        match stringJob:
-            case "Soldier":
-                return JOB.Soldier
-            case "Natural Scientist":
-                return JOB.Nat_Scientist
-            case "Social Scientist":
-                return JOB.Soc_Scientist
-        return None
-
-class HAZARD(Enum):
-    Neutral =   [1, 1, 1, 1]
-    Negotiation = [0.9, 1.1, 1, 1]
-    Agressive = [1.25, 0.85, 1, 1]
-    Recon =     [1, 0.85, 0.9, 1.25]
-
-probability = {
-    "100%": [1,4],
-    "90%": [3,27],
-    "80%": [5,32],
-    "70%": [7,36],
-    "60%": [9,39],
-    "50%": [11,42]
-}
-
-def solve_maxmin_no_soldier(obst_lvl,
-                            shoot_lvl,
-                            lib_lvl,
-                            skill_leader,
-                            skill_other,
-                            roll_indiv = 1,
-                            roll_group = 4,
-                            options = [JOB.Soldier, JOB.Nat_Scientist, JOB.Soc_Scientist],
-                            hazard_approach = HAZARD.Neutral,
-                            verbose=False,
-                            get_integer_results = False):
-    # Conditional branching
-    use_leader_nat_sci = all(j != JOB.Nat_Scientist for j in options)
-    use_leader_soc_sci = all(j != JOB.Soc_Scientist for j in options)
-    nb_soldier = options.count(JOB.Soldier)
-    haz_mod = hazard_approach._value_
-    
-    # Define the problem
-    prob = pulp.LpProblem("MaxMinProblem", pulp.LpMaximize)
-    
-    # Decision variables
-    x11 = pulp.LpVariable("x11", lowBound=1, cat="Integer")
-    x12 = pulp.LpVariable("x12", lowBound=1, cat="Integer")
-    x13 = pulp.LpVariable("x13", lowBound=1, cat="Integer")
-    
-    # Covering all cases
-    a1_bound = 1
-    a2_bound = 1
-    a3_bound = 2
-
-    if nb_soldier == 0: # No soldiers = lower bound for pow/ath doesn't matter
-        a1_bound = 0
-        a2_bound = 0
-    elif nb_soldier == 3: # All soldiers = lower bound for wit doesn't matter
-        a3_bound = 0
-
-    a1 = pulp.LpVariable("a1", lowBound=a1_bound, cat="Integer")
-    a2 = pulp.LpVariable("a2", lowBound=a2_bound, cat="Integer")
-    a3 = pulp.LpVariable("a3", lowBound=a3_bound, cat="Integer")
-    
-    t = pulp.LpVariable("t", cat="Continuous")  # max-min varValue
-    
-    # Auxiliary variables for min/max
-    w0 = pulp.LpVariable("w0")
-    w1 = pulp.LpVariable("w1")
-    
-    # y values
-    y11 = x11
-    y41 = a1 + 0.5 * x11
-
-    y12 = x12
-    y42 = a2 + 0.5 * x12
-    
-    # Binaries
-    b1 = pulp.LpVariable("b1_w1", cat="Binary")
-    b3 = pulp.LpVariable("b3_w1", cat="Binary")
-    M = 10_000
-
-    # Row-sum constraints
-    prob += (x11 + x12 + x13 == skill_leader)
-    prob += (a1 + a2 + a3 == skill_other)
-    prob += w0 <= y11
-    prob += w0 <= y41
-    prob += w1 >= y12
-    prob += w1 >= y42
-    
-    prob += b1 + b3 == 1
-    prob += w1 <= y12 + M * (1 - b1)
-    prob += w1 <= y42 + M * (1 - b3)
-    
-    # z definitions (reduced & linearized)
-    z0 = (w0 * shoot_lvl + roll_indiv - 10) / 1.5
-    z1 = (w1 * obst_lvl + roll_indiv - (10*haz_mod[3])) / (1.5*haz_mod[3])
-    z2 = lib_lvl * x13 + roll_indiv - 10 if use_leader_nat_sci else ((a3 + 0.5 * x13) * lib_lvl + roll_indiv - 10) / 1.5
-    z3 = lib_lvl * x13 + roll_indiv - 10 if use_leader_soc_sci else ((a3 + 0.5 * x13) * lib_lvl + roll_indiv - (10*haz_mod[0])) / (1.5*haz_mod[0])
-
-    z4 = (shoot_lvl * (x11 + (3 + nb_soldier) * a1) + roll_group - (40*haz_mod[1])) / (4*haz_mod[1])
-    z5 = (obst_lvl * (x12 + 3 * a2) + roll_group - (40*haz_mod[3])) / (4*haz_mod[3])
-    z6 = (lib_lvl * (x13 + (3.5 - (nb_soldier * 0.5)) * a3) + roll_group - (40*haz_mod[2])) / (4*haz_mod[2])
-
-    # Max–min constraints
-    for z in [z0, z1, z2, z3, z4, z5, z6]:
-        prob += t <= z
-
-    # Objective
-    prob += t
-
-    # Solve
-    prob.solve(pulp.PULP_CBC_CMD(msg=False))
-
-    if verbose:
-        print(f"Conditions: {options}; {hazard_approach}")
-        print("status:", pulp.LpStatus[prob.status])
-        print("t:", t.varValue)
-        print("x1:", x11.varValue, x12.varValue, x13.varValue)
-        print("a :", a1.varValue, a2.varValue, a3.varValue)
-    
-    
-    x1_vals = np.array([x11.varValue, x12.varValue, x13.varValue])
-    a_vals = np.array([a1.varValue, a2.varValue, a3.varValue])
-    z_values = {
-        "z0": ((a_vals[0] + 0.5 * x1_vals[0]) * shoot_lvl + roll_indiv - 10) / 1.5,
-        "z1": ((a_vals[1] + 0.5 * x1_vals[1]) * obst_lvl + roll_indiv - (10 * haz_mod[3])) / (1.5 * haz_mod[3]),
-        "z2": lib_lvl * x1_vals[2] if use_leader_nat_sci else ((a_vals[2] + 0.5 * x1_vals[2]) * lib_lvl + roll_indiv - 10) / 1.5,
-        "z3": lib_lvl * x1_vals[2] if use_leader_soc_sci else ((a_vals[2] + 0.5 * x1_vals[2]) * lib_lvl + roll_indiv - (10 * haz_mod[0])) / (1.5 * haz_mod[0]),
-        "z4": (shoot_lvl * (x1_vals[0] + (3 + nb_soldier) * a_vals[0]) + roll_group - (40 * haz_mod[1])) / (4 * haz_mod[1]),
-        "z5": (obst_lvl * (x1_vals[1] + 3 * a_vals[1]) + roll_group - (40 * haz_mod[3])) / (4 * haz_mod[3]),
-        "z6": (lib_lvl * (x1_vals[2] + (3.5 - (nb_soldier * 0.5)) * a_vals[2]) + roll_group - (40 * haz_mod[2])) / (4 * haz_mod[2])
-    }
-    if get_integer_results:
-        z_values = {k: int(v) for k,v in z_values.items()}
-    
-    return {
-        "t": t.varValue,
-        "x1": x1_vals.astype(int),
-        "a": a_vals.astype(int),
-        "z": z_values
-    }
-def solve_maxmin_soldier(obst_lvl,
-                        shoot_lvl,
-                        lib_lvl,
-                        skill_leader,
-                        skill_soldier,
-                        skill_other,
-                        roll_indiv = 1,
-                        roll_group = 4,
-                        options = [JOB.Soldier, JOB.Nat_Scientist, JOB.Soc_Scientist],
-                        hazard_approach = HAZARD.Neutral,
-                        verbose=False,
-                        get_integer_results = False):
-    # Conditional branching
-    use_leader_nat_sci = all(j != JOB.Nat_Scientist for j in options)
-    use_leader_soc_sci = all(j != JOB.Soc_Scientist for j in options)
-    nb_soldier = options.count(JOB.Soldier) - 1
-    haz_mod = hazard_approach._value_
-    
-    # Define the problem
-    prob = pulp.LpProblem("MaxMinProblem", pulp.LpMaximize)
-    
-    # Decision variables
-    x11 = pulp.LpVariable("x11", lowBound=1, cat="Integer")
-    x12 = pulp.LpVariable("x12", lowBound=1, cat="Integer")
-    x13 = pulp.LpVariable("x13", lowBound=1, cat="Integer")
-    
-    # Soldier variables
-    x21 = pulp.LpVariable("x21", lowBound=1, cat="Integer")
-    x22 = pulp.LpVariable("x22", lowBound=1, cat="Integer")
-    x23 = pulp.LpVariable("x23", lowBound=0, cat="Integer")
-    
-    # Covering all cases
-    a1_bound = 1
-    a2_bound = 1
-    a3_bound = 2
-
-    if nb_soldier == 0: # No soldiers = lower bound for pow/ath doesn't matter
-        a1_bound = 0
-        a2_bound = 0
-    elif nb_soldier == 2: # All soldiers = lower bound for wit doesn't matter
-        a3_bound = 0
-    a1 = pulp.LpVariable("a1", lowBound=a1_bound, cat="Integer")
-    a2 = pulp.LpVariable("a2", lowBound=a2_bound, cat="Integer")
-    a3 = pulp.LpVariable("a3", lowBound=a3_bound, cat="Integer")
-    
-    t = pulp.LpVariable("t", cat="Continuous")  # max-min varValue
-    
-    # Auxiliary variables for min/max
-    w0 = pulp.LpVariable("w0")
-    w1 = pulp.LpVariable("w1")
-    
-    # y values
-    y11 = x11
-    y21 = x21 + 0.5 * x11
-    y41 = a1 + 0.5 * x11
-
-    y12 = x12
-    y22 = x22 + 0.5 * x12
-    y42 = a2 + 0.5 * x12
-    
-    # Binaries
-    b1 = pulp.LpVariable("b1_w1", cat="Binary")
-    b2 = pulp.LpVariable("b2_w1", cat="Binary")
-    b3 = pulp.LpVariable("b3_w1", cat="Binary")
-    M = 10_000
-
-    # Row-sum constraints
-    prob += (x11 + x12 + x13 == skill_leader)
-    prob += (x21 + x22 + x23 == skill_soldier)
-    prob += (a1 + a2 + a3 == skill_other)
-    prob += w0 <= y11
-    prob += w0 <= y21
-    prob += w0 <= y41
-    prob += w1 >= y12
-    prob += w1 >= y22
-    prob += w1 >= y42
-    
-    prob += b1 + b2 + b3 == 1
-    prob += w1 <= y12 + M * (1 - b1)
-    prob += w1 <= y22 + M * (1 - b2)
-    prob += w1 <= y42 + M * (1 - b3)
-    
-    # z definitions (reduced & linearized)
-    z0 = (w0 * shoot_lvl + roll_indiv - 10) / 1.5
-    z1 = (w1 * obst_lvl + roll_indiv - (10*haz_mod[3])) / (1.5*haz_mod[3])
-    z2 = lib_lvl * x13 + roll_indiv - 10 if use_leader_nat_sci else ((a3 + 0.5 * x13) * lib_lvl + roll_indiv - 10) / 1.5
-    z3 = lib_lvl * x13 + roll_indiv - 10 if use_leader_soc_sci else ((a3 + 0.5 * x13) * lib_lvl + roll_indiv - (10*haz_mod[0])) / (1.5*haz_mod[0])
-
-    z4 = (shoot_lvl * (x11 + x21 * 2 + (2 + nb_soldier) * a1) + roll_group - (40*haz_mod[1])) / (4*haz_mod[1])
-    z5 = (obst_lvl * (x12 + x22 + 2 * a2) + roll_group - (40*haz_mod[3])) / (4*haz_mod[3])
-    z6 = (lib_lvl * (x13 + x23 + (3 - (nb_soldier * 0.5)) * a3) + roll_group - (40*haz_mod[2])) / (4*haz_mod[2])
-
-    # Max–min constraints
-    for z in [z0, z1, z2, z3, z4, z5, z6]:
-        prob += t <= z
-
-    # Objective
-    prob += t
-
-    # Solve
-    prob.solve(pulp.PULP_CBC_CMD(msg=False))
-
-    if verbose:
-        print(f"Conditions: {options}; {hazard_approach}")
-        print("status:", pulp.LpStatus[prob.status])
-        print("t:", t.varValue)
-        print("x1:", x11.varValue, x12.varValue, x13.varValue)
-        print("a :", a1.varValue, a2.varValue, a3.varValue)
-    
-    
-    x1_vals = np.array([x11.varValue, x12.varValue, x13.varValue])
-    x2_vals = np.array([x21.varValue, x22.varValue, x23.varValue])
-    a_vals = np.array([a1.varValue, a2.varValue, a3.varValue])
-    z_values = {
-        "z0": (w0.varValue * shoot_lvl + roll_indiv - 10) / 1.5,
-        "z1": (w1.varValue * obst_lvl + roll_indiv - (10 * haz_mod[3])) / (1.5 * haz_mod[3]),
-        "z2": lib_lvl * x1_vals[2] if use_leader_nat_sci else ((a_vals[2] + 0.5 * x1_vals[2]) * lib_lvl + roll_indiv - 10) / 1.5,
-        "z3": lib_lvl * x1_vals[2] if use_leader_soc_sci else ((a_vals[2] + 0.5 * x1_vals[2]) * lib_lvl + roll_indiv - (10 * haz_mod[0])) / (1.5 * haz_mod[0]),
-        "z4": (shoot_lvl * (x1_vals[0] + x2_vals[0] * 2 + (2 + nb_soldier) * a_vals[0]) + roll_group - (40 * haz_mod[1])) / (4 * haz_mod[1]),
-        "z5": (obst_lvl * (x1_vals[1] + x2_vals[1] + 2 * a_vals[1]) + roll_group - (40 * haz_mod[3])) / (4 * haz_mod[3]),
-        "z6": (lib_lvl * (x1_vals[2] + x2_vals[2] + (3 - (nb_soldier * 0.5)) * a_vals[2]) + roll_group - (40 * haz_mod[2])) / (4 * haz_mod[2])
-    }
-    if get_integer_results:
-        z_values = {k: int(v) for k,v in z_values.items()}
-    
-    return {
-        "t": t.varValue,
-        "x1": x1_vals.astype(int),
-        "x2": x2_vals.astype(int),
-        "a": a_vals.astype(int),
-        "z": z_values
-    }
-def solve_maxmin_soldier_two_or_three(obst_lvl,
-                        shoot_lvl,
-                        lib_lvl,
-                        skill_leader,
-                        skill_soldier_1,
-                        skill_soldier_2,
-                        skill_other,
-                        roll_indiv = 1,
-                        roll_group = 4,
-                        options = [JOB.Soldier, JOB.Nat_Scientist, JOB.Soc_Scientist],
-                        hazard_approach = HAZARD.Neutral,
-                        verbose=False,
-                        get_integer_results = False):
-    # Conditional branching
-    use_leader_nat_sci = all(j != JOB.Nat_Scientist for j in options)
-    use_leader_soc_sci = all(j != JOB.Soc_Scientist for j in options)
-    nb_soldier = options.count(JOB.Soldier) - 2
-    haz_mod = hazard_approach._value_
-    
-    # Define the problem
-    prob = pulp.LpProblem("MaxMinProblem", pulp.LpMaximize)
-    
-    # Decision variables
-    x11 = pulp.LpVariable("x11", lowBound=1, cat="Integer")
-    x12 = pulp.LpVariable("x12", lowBound=1, cat="Integer")
-    x13 = pulp.LpVariable("x13", lowBound=1, cat="Integer")
-    
-    # Soldier 1 variables
-    x21 = pulp.LpVariable("x21", lowBound=1, cat="Integer")
-    x22 = pulp.LpVariable("x22", lowBound=1, cat="Integer")
-    x23 = pulp.LpVariable("x23", lowBound=0, cat="Integer")
-    
-    # Soldier 2 variables
-    x31 = pulp.LpVariable("x31", lowBound=1, cat="Integer")
-    x32 = pulp.LpVariable("x32", lowBound=1, cat="Integer")
-    x33 = pulp.LpVariable("x33", lowBound=0, cat="Integer")
-    
-    # Covering all cases
-    a1_bound = 1
-    a2_bound = 1
-    a3_bound = 2
-
-    if nb_soldier == 0: # No soldiers = lower bound for pow/ath doesn't matter
-        a1_bound = 0
-        a2_bound = 0
-    else: # All soldiers = lower bound for wit doesn't matter
-        a3_bound = 0
-    x41 = pulp.LpVariable("x41", lowBound=a1_bound, cat="Integer")
-    x42 = pulp.LpVariable("x42", lowBound=a2_bound, cat="Integer")
-    x43 = pulp.LpVariable("x43", lowBound=a3_bound, cat="Integer")
-    
-    t = pulp.LpVariable("t", cat="Continuous")  # max-min varValue
-    
-    # Auxiliary variables for min/max
-    w0 = pulp.LpVariable("w0")
-    w1 = pulp.LpVariable("w1")
-    
-    # y values
-    y11 = x11
-    y21 = x21 + 0.5 * x11
-    y31 = x31 + 0.5 * x11
-    y41 = x41 + 0.5 * x11
-
-    y12 = x12
-    y22 = x22 + 0.5 * x12
-    y32 = x32 + 0.5 * x12
-    y42 = x42 + 0.5 * x12
-    
-    # Binaries
-    b1 = pulp.LpVariable("b1_w1", cat="Binary")
-    b2 = pulp.LpVariable("b2_w1", cat="Binary")
-    b3 = pulp.LpVariable("b3_w1", cat="Binary")
-    b4 = pulp.LpVariable("b4_w1", cat="Binary")
-    M = 10_000
-
-    # Row-sum constraints
-    prob += (x11 + x12 + x13 == skill_leader)
-    prob += (x21 + x22 + x23 == skill_soldier_1)
-    prob += (x31 + x32 + x33 == skill_soldier_2)
-    prob += (x41 + x42 + x43 == skill_other)
-    
-    prob += w0 <= y11
-    prob += w0 <= y21
-    prob += w0 <= y31
-    prob += w0 <= y41
-    
-    prob += w1 >= y12
-    prob += w1 >= y22
-    prob += w1 >= y32
-    prob += w1 >= y42
-    
-    prob += b1 + b2 + b3 + b4 == 1
-    prob += w1 <= y12 + M * (1 - b1)
-    prob += w1 <= y22 + M * (1 - b2)
-    prob += w1 <= y32 + M * (1 - b3)
-    prob += w1 <= y42 + M * (1 - b4)
-    
-    # z definitions (reduced & linearized)
-    z0 = (w0 * shoot_lvl + roll_indiv - 10) / 1.5
-    z1 = (w1 * obst_lvl + roll_indiv - (10*haz_mod[3])) / (1.5*haz_mod[3])
-    z2 = lib_lvl * x13 + roll_indiv - 10 if use_leader_nat_sci else ((x43 + 0.5 * x13) * lib_lvl + roll_indiv - 10) / 1.5
-    z3 = lib_lvl * x13 + roll_indiv - 10 if use_leader_soc_sci else ((x43 + 0.5 * x13) * lib_lvl + roll_indiv - (10*haz_mod[0])) / (1.5*haz_mod[0])
-
-    z4 = (shoot_lvl * (x11 + x21 * 2 + x31 * 2 + (1 + nb_soldier) * x41) + roll_group - (40*haz_mod[1])) / (4*haz_mod[1])
-    z5 = (obst_lvl * (x12 + x22 + x32 + x42) + roll_group - (40*haz_mod[3])) / (4*haz_mod[3])
-    z6 = (lib_lvl * (x13 + x23 + x33 + (1.5 - (nb_soldier * 0.5)) * x43) + roll_group - (40*haz_mod[2])) / (4*haz_mod[2])
-
-    # Max–min constraints
-    for z in [z0, z1, z2, z3, z4, z5, z6]:
-        prob += t <= z
-
-    # Objective
-    prob += t
-
-    # Solve
-    prob.solve(pulp.PULP_CBC_CMD(msg=False))
-
-    if verbose:
-        print(f"Conditions: {options}; {hazard_approach}")
-        print("status:", pulp.LpStatus[prob.status])
-        print("t:", t.varValue)
-        print("x1:", x11.varValue, x12.varValue, x13.varValue)
-        print("a :", x41.varValue, x42.varValue, x43.varValue)
-    
-    
-    x1_vals = np.array([x11.varValue, x12.varValue, x13.varValue])
-    x2_vals = np.array([x21.varValue, x22.varValue, x23.varValue])
-    x3_vals = np.array([x31.varValue, x32.varValue, x33.varValue])
-    x4_vals = np.array([x41.varValue, x42.varValue, x43.varValue])
-    z_values = {
-        "z0": (w0.varValue * shoot_lvl + roll_indiv - 10) / 1.5,
-        "z1": (w1.varValue * obst_lvl + roll_indiv - (10 * haz_mod[3])) / (1.5 * haz_mod[3]),
-        "z2": lib_lvl * x1_vals[2] if use_leader_nat_sci else ((x4_vals[2] + 0.5 * x1_vals[2]) * lib_lvl + roll_indiv - 10) / 1.5,
-        "z3": lib_lvl * x1_vals[2] if use_leader_soc_sci else ((x4_vals[2] + 0.5 * x1_vals[2]) * lib_lvl + roll_indiv - (10 * haz_mod[0])) / (1.5 * haz_mod[0]),
-        "z4": (shoot_lvl * (x1_vals[0] + x2_vals[0] * 2 + x3_vals[0] * 2 + (1 + nb_soldier) * x4_vals[0]) + roll_group - (40 * haz_mod[1])) / (4 * haz_mod[1]),
-        "z5": (obst_lvl * (x1_vals[1] + x2_vals[1] + x3_vals[1] + x4_vals[1]) + roll_group - (40 * haz_mod[3])) / (4 * haz_mod[3]),
-        "z6": (lib_lvl * (x1_vals[2] + x2_vals[2] + x3_vals[2] + (1.5 - (nb_soldier * 0.5)) * x4_vals[2]) + roll_group - (40 * haz_mod[2])) / (4 * haz_mod[2])
-    }
-    if get_integer_results:
-        z_values = {k: int(v) for k,v in z_values.items()}
-    
-    return {
-        "t": t.varValue,
-        "x1": x1_vals.astype(int),
-        "x2": x2_vals.astype(int),
-        "x3": x3_vals.astype(int),
-        "a": x4_vals.astype(int), # Should be x4 but for consistency keep as 'a'
-        "z": z_values
-    }
-
-def convert_to_skill_point(points, is_leader):
-    modifier = 8 if is_leader else 7
-    return (points-1) * 2 + modifier
-
-# p = "100%"
-# ri, rg = probability[p]
-
-# all_jobs = list(JOB)
-# scorecard = {f"{ji}, {jj}, {jk}": 0
-#              for ji in range(3)
-#              for jj in range(ji, 3)
-#              for jk in range(jj, 3)}
-# level = 50
-# lvllist = [1,1.33,1.66,2]
-
-# for ol in lvllist:
-#     for sl in lvllist:
-#         for ll in lvllist:
-#             best_distr = [-100]
-#             for haz in HAZARD:
-#             #     for i in range(3):
-#             #         potential_job_1 = all_jobs[i]
-#             #         for j in range(i, 3):
-#             #             potential_job_2 = all_jobs[j]
-#             #             for k in range(j, 3):
-#             #                 potential_job_3 = all_jobs[k]
-#                 option = [JOB.Soldier, JOB.Soldier, JOB.Soc_Scientist]
-#                 #print(option)
-#                 res = solve_maxmin(obst_lvl=ol, shoot_lvl=sl, lib_lvl=ll, skill_leader=convert_to_skill_point(level, True), skill_other=convert_to_skill_point(level, True), roll_indiv=ri, roll_group=rg, options=option, hazard_approach=haz, verbose=False, get_integer_results = True)
-#                 #print()
-                
-#                 if res["t"] > best_distr[0]:
-#                     best_distr = [res["t"], res, option, haz, [i,j,k]]
-#                 #print(res)
-
-#             res_best = best_distr[1]
-#             i_fin,j_fin,k_fin = best_distr[4]
-#             scorecard[f"{i_fin}, {j_fin}, {k_fin}"] += 1
-
-#             print(f"{level}: Individual roll +{ri}; Group roll +{rg}")
-#             print(f"Minimum level to get {p}% success: {int(res_best["t"])}", end="\t\t")
-#             print("\t\tZ-results:", end="\t")
-#             for z_stat in res_best["z"]:
-#                 print(f"{res_best["z"][z_stat]}", end=", ")
-#             print("\nLeader stats:", end="\t\t")
-#             for leader_stat in res_best["x1"]:
-#                 print(f"{leader_stat}", end=", ")
-#             print("\t\t\t\tOthers' stats:", end="\t\t")
-#             for others_stat in res_best["a"]:
-#                 print(f"{others_stat}", end=", ")
-#             print()
-#             print("Respective jobs:", end="\t")
-#             for jobs_to_do in best_distr[2]:
-#                 print(f"{jobs_to_do.name}", end=", ")
-#             print(f"\tHazard approach:\t{best_distr[3].name}")
-#             print("\n")
-
-# for job_key in scorecard:
-#     print(f"{job_key}: {scorecard[job_key]}")
+from wgc import JOB, success_rolls, calculate, rank_compositions, frontier, trace
+from wgc.calc import cached, solve_key
 
 ################################
 ######### Global  Vars #########
@@ -549,7 +61,8 @@ curr_theme = DARK_THEME
 ##### Processing Functions #####
 ################################
 
-def validate_user_inputs():
+def validate_user_inputs(quiet=False):
+    # quiet: don't complain about missing inputs (auto-solve while typing)
     global class_vars, lvl_vars, top_inputs, err_msg
     users_info = {"Job1":"", "Job2": "", "Job3": "", "LeaderLvl": "", "SoldierLvl1": "", "SoldierLvl2": "", "OthersLvl": "", "Shoot": "", "Obst": "", "Lib": "", "Success": ""}
     #print(f"{type(class_vars)} {type(lvl_vars)} {type(top_inputs)}")
@@ -565,120 +78,271 @@ def validate_user_inputs():
         #print(f"{user_key}: {(value is None or value == "")} and {(user_key != "SoldierLvl")} or {(users_info["Job1"] != "Soldier")}")
         if ((value is None or value == "") and (user_key != "SoldierLvl1" or users_info["Job1"] == "Soldier")) and\
                                                ((user_key != "SoldierLvl2" or users_info["Job2"] == "Soldier")):
-            err_msg.set("Not all inputs filled.")
+            if not quiet:
+                err_msg.set("Not all inputs filled.")
             #print()
             return {} # stop immediately if anything is unset
 
+    # Any chance can be typed in, not just the ones in the dropdown
+    try:
+        success_rolls(users_info["Success"])
+    except ValueError:
+        if not quiet:
+            err_msg.set("Success chance must be above 0% and at most 100%.")
+        return {}
     
     err_msg.set("")
     return users_info
     
 
-def calculate_and_set():
+def team_args(users_info):
+    # The inputs of calculate, without the success chance
+    option = [JOB.toEnumOption(users_info["Job1"]), JOB.toEnumOption(users_info["Job2"]), JOB.toEnumOption(users_info["Job3"])]
+    soldier_1_lvl = int(users_info["SoldierLvl1"]) if users_info["SoldierLvl1"] else None
+    soldier_2_lvl = int(users_info["SoldierLvl2"]) if users_info["SoldierLvl2"] else None
+    return (option,
+            int(users_info["LeaderLvl"]),
+            soldier_1_lvl,
+            soldier_2_lvl,
+            int(users_info["OthersLvl"]),
+            int(users_info["Shoot"]),
+            int(users_info["Obst"]),
+            int(users_info["Lib"]))
+
+def calculate_and_set(quiet=False):
+    global latest_request, latest_key
+
+    # Traced under the request number this click gets if it goes anywhere
+    with trace.request(latest_request + 1):
+        with trace.phase("gui/parse"):
+            users_info = validate_user_inputs(quiet)
+        if users_info == {}:
+            return
+        args = team_args(users_info) + (users_info["Success"],)
+
+        # Known answers are shown right away, the same inputs as the running solve
+        # are left alone; anything else goes to the worker and makes the running
+        # solve stale
+        key = solve_key(*args)
+        res_best = cached(*args)
+        if res_best is not None:
+            latest_request += 1
+            latest_key = key
+            show_solving(False)
+            with trace.phase("gui/show"):
+                set_results(res_best)
+            return
+    if key == latest_key and calculate_button.cget("text") == "Cancel":
+        return
+    latest_request += 1
+    latest_key = key
+    solve_requests.put((latest_request, "solve", args))
+    show_solving(True)
+
+def find_best_jobs():
+    # Ranks every job composition for the levels and facilities entered (all
+    # three members at the others' level) on the worker
+    global latest_request, latest_key
+
     users_info = validate_user_inputs()
     if users_info == {}:
         return
-    
-    option = [JOB.toEnumOption(users_info["Job1"]), JOB.toEnumOption(users_info["Job2"]), JOB.toEnumOption(users_info["Job3"])]
-    leaderLvl = convert_to_skill_point(int(users_info["LeaderLvl"]), True)
-    othersLvl = convert_to_skill_point(int(users_info["OthersLvl"]), False)
-    obstLvl = 1 + int(users_info["Obst"])/100
-    shotLvl = 1 + int(users_info["Shoot"])/100
-    librLvl = 1 + int(users_info["Lib"])/100
-    ri, rg = probability[users_info["Success"]]
-    
-    best_distr = [-100]
-    
-    if option[0] == JOB.Soldier and option[1] == JOB.Soldier:
-        soldieLvl1 = convert_to_skill_point(int(users_info["SoldierLvl1"]), False)
-        soldieLvl2 = convert_to_skill_point(int(users_info["SoldierLvl2"]), False)
-        for haz in HAZARD:
-            results = solve_maxmin_soldier_two_or_three(obst_lvl=obstLvl,
-                                            shoot_lvl=shotLvl,
-                                            lib_lvl=librLvl,
-                                            skill_leader=leaderLvl,
-                                            skill_soldier_1=soldieLvl1,
-                                            skill_soldier_2=soldieLvl2,
-                                            skill_other=othersLvl,
-                                            roll_indiv=ri,
-                                            roll_group=rg,
-                                            options=option,
-                                            hazard_approach=haz,
-                                            verbose=False,
-                                            get_integer_results = True)
-            
-            if results["t"] > best_distr[0]:
-                best_distr = [results["t"], results, option, haz]
-    elif option[0] == JOB.Soldier:
-        soldieLvl1 = convert_to_skill_point(int(users_info["SoldierLvl1"]), False)
-        for haz in HAZARD:
-            results = solve_maxmin_soldier(obst_lvl=obstLvl,
-                                            shoot_lvl=shotLvl,
-                                            lib_lvl=librLvl,
-                                            skill_leader=leaderLvl,
-                                            skill_soldier=soldieLvl1,
-                                            skill_other=othersLvl,
-                                            roll_indiv=ri,
-                                            roll_group=rg,
-                                            options=option,
-                                            hazard_approach=haz,
-                                            verbose=False,
-                                            get_integer_results = True)
-            
-            if results["t"] > best_distr[0]:
-                best_distr = [results["t"], results, option, haz]
-    else:
-        for haz in HAZARD:
-            results = solve_maxmin_no_soldier(obst_lvl=obstLvl,
-                                            shoot_lvl=shotLvl,
-                                            lib_lvl=librLvl,
-                                            skill_leader=leaderLvl,
-                                            skill_other=othersLvl,
-                                            roll_indiv=ri,
-                                            roll_group=rg,
-                                            options=option,
-                                            hazard_approach=haz,
-                                            verbose=False,
-                                            get_integer_results = True)
-            
-            if results["t"] > best_distr[0]:
-                best_distr = [results["t"], results, option, haz]
-    res_best = best_distr[1]
-    leader_power_var.set(res_best["x1"][0])
-    leader_ath_var.set(res_best["x1"][1])
-    leader_wit_var.set(res_best["x1"][2])
-    
-    if option[0] == JOB.Soldier:
-        sold_1_power_var.set(res_best["x2"][0])
-        sold_1_ath_var.set(res_best["x2"][1])
-        sold_1_wit_var.set(res_best["x2"][2])
-    else:
-        sold_1_power_var.set(res_best["a"][0])
-        sold_1_ath_var.set(res_best["a"][1])
-        sold_1_wit_var.set(res_best["a"][2])
-    
-    if option[0] == JOB.Soldier and option[1] == JOB.Soldier:
-        sold_2_power_var.set(res_best["x3"][0])
-        sold_2_ath_var.set(res_best["x3"][1])
-        sold_2_wit_var.set(res_best["x3"][2])
-    else:
-        sold_2_power_var.set(res_best["a"][0])
-        sold_2_ath_var.set(res_best["a"][1])
-        sold_2_wit_var.set(res_best["a"][2])
-    
-    others_power_var.set(res_best["a"][0])
-    others_ath_var.set(res_best["a"][1])
-    others_wit_var.set(res_best["a"][2])
-    
-    hazard_var.set(best_distr[3].name)
-    
-    max_level.set(int(res_best["t"]))
-    
-    #print(res_best["z"])
+    args = (int(users_info["LeaderLvl"]),
+            int(users_info["OthersLvl"]),
+            int(users_info["Shoot"]),
+            int(users_info["Obst"]),
+            int(users_info["Lib"]),
+            users_info["Success"])
+    latest_request += 1
+    latest_key = None
+    solve_requests.put((latest_request, "rank", args))
+    show_solving(True)
+
+def find_chances():
+    # Max level of the team entered for every success chance, on the worker
+    global latest_request, latest_key
+
+    users_info = validate_user_inputs()
+    if users_info == {}:
+        return
+    latest_request += 1
+    latest_key = None
+    solve_requests.put((latest_request, "frontier", team_args(users_info)))
+    show_solving(True)
+
+def show_table(title, headers, rows):
+    # A small window listing rows under headers, replacing the last one
+    global table_window
+
+    if table_window is not None:
+        table_window.destroy()
+    table_window = tk.Toplevel(root)
+    table_window.title(title)
+    table_window.configure(bg=curr_theme["bg"])
+    for col, text in enumerate(headers):
+        tk.Label(table_window, text=text, font=("Arial", 10, "bold"),
+                 bg=curr_theme["bg"], fg=curr_theme["fg"]).grid(row=0, column=col, padx=5, pady=5)
+    for row, values in enumerate(rows, start=1):
+        for col, text in enumerate(values):
+            tk.Label(table_window, text=text, bg=curr_theme["bg"], fg=curr_theme["fg"],
+                     anchor="w" if col == 0 else "center").grid(row=row, column=col, padx=5, sticky="we")
+
+def apply_ranking(ranked):
+    # Picks the best composition (its answer is cached, so it shows at once)
+    # and lists all of them in a small window
+    best = ranked[0]
+    for var, job in zip(class_vars, best["option"]):
+        var.set(class_options[job.value - 1])
+    for var, job in zip([sold_1_lvl_var, sold_2_lvl_var], best["option"]):
+        if job == JOB.Soldier and var.get() == "":
+            var.set(others_lvl_var.get())
+    on_combo_change()
+    calculate_and_set(quiet=True)
+
+    show_table("Best jobs", ["Jobs", "Hazard\nApproach", "Max Level"],
+               [[", ".join(class_options[job.value - 1] for job in res["option"]), res["hazard"].name, res["max_level"]]
+                for res in ranked])
+
+def apply_frontier(answers):
+    show_table("Success chances", ["Success\nChance", "Hazard\nApproach", "Max Level"],
+               [[success, res["hazard"].name, res["max_level"]] for success, res in answers.items()])
+
+def show_diagnostics(event=None):
+    # Where the time of the last solves went, one row per phase (see
+    # wgc/trace.py). Recording starts the first time this is opened, unless
+    # WGC_TRACE turned it on already.
+    if not trace.enabled:
+        trace.enable()
+    events = trace.recent(DIAGNOSTICS_ROWS)
+    rows = [[event["request"] or "", event["phase"], event.get("backend", ""), event.get("hazard", ""),
+             f"{1000 * event['seconds']:.1f}", event.get("status") or event.get("source") or "",
+             "" if event.get("nodes") is None else event["nodes"],
+             "" if event.get("gap") is None else f"{100 * event['gap']:.2f}%"] for event in events]
+    if not rows:
+        rows = [["", "Recording, solve something and refresh"] + [""] * 6]
+    show_table("Diagnostics", ["Request", "Phase", "Backend", "Hazard", "ms", "Status", "Nodes", "Gap"], rows)
+    buttons = tk.Frame(table_window, bg=curr_theme["bg"])
+    buttons.grid(row=len(rows) + 1, column=0, columnspan=8, pady=5)
+    tk.Button(buttons, text="Refresh", command=show_diagnostics).pack(side="left", padx=5)
+    tk.Button(buttons, text="Clear", command=clear_diagnostics).pack(side="left", padx=5)
+    tk.Button(buttons, text="Export JSONL", command=export_diagnostics).pack(side="left", padx=5)
+
+def clear_diagnostics():
+    trace.clear()
+    show_diagnostics()
+
+def export_diagnostics():
+    path = filedialog.asksaveasfilename(parent=table_window, defaultextension=".jsonl",
+                                        filetypes=[("JSON lines", "*.jsonl")], initialfile="wgc-trace.jsonl")
+    if path:
+        trace.export(path)
+
+def set_results(res_best):
+    leader_power_var.set(res_best["leader"][0])
+    leader_ath_var.set(res_best["leader"][1])
+    leader_wit_var.set(res_best["leader"][2])
+    
+    sold_1_power_var.set(res_best["slot1"][0])
+    sold_1_ath_var.set(res_best["slot1"][1])
+    sold_1_wit_var.set(res_best["slot1"][2])
+    
+    sold_2_power_var.set(res_best["slot2"][0])
+    sold_2_ath_var.set(res_best["slot2"][1])
+    sold_2_wit_var.set(res_best["slot2"][2])
+    
+    others_power_var.set(res_best["others"][0])
+    others_ath_var.set(res_best["others"][1])
+    others_wit_var.set(res_best["others"][2])
+    
+    hazard_var.set(res_best["hazard"].name)
+    
+    max_level.set(res_best["max_level"])
 
 ################################
-####### Helper Functions #######
-################################    
+######## Solver Worker #########
+################################
+
+# Solves run on one background thread so the window never freezes. The worker
+# only talks to the window through solve_results, which the Tk thread empties
+# every POLL_MS with root.after. Only the newest request matters: requests
+# waiting in the queue are skipped and a running one stops at its next step.
+# A request is a "solve" (calculate), a "rank" (rank_compositions) or a
+# "frontier" (frontier).
+solve_requests = queue.Queue()
+solve_results = queue.Queue()
+latest_request = 0
+latest_key = None
+table_window = None
+POLL_MS = 30
+DIAGNOSTICS_ROWS = 40
+
+class SolveSuperseded(Exception):
+    pass
+
+def solve_worker():
+    while True:
+        request_id, kind, args = solve_requests.get()
+        while not solve_requests.empty():
+            request_id, kind, args = solve_requests.get_nowait()
+        if request_id != latest_request:
+            continue
+
+        def progress(step, steps):
+            if request_id != latest_request:
+                raise SolveSuperseded()
+            solve_results.put((request_id, "progress", (step, steps)))
+
+        try:
+            work = {"solve": calculate, "rank": rank_compositions, "frontier": frontier}[kind]
+            with trace.request(request_id):
+                solve_results.put((request_id, kind, work(*args, progress=progress)))
+        except SolveSuperseded:
+            pass
+        except Exception as e:
+            solve_results.put((request_id, "error", e))
+
+def cancel_solve():
+    global latest_request
+    latest_request += 1
+    show_solving(False)
+
+def on_calculate_button():
+    if calculate_button.cget("text") == "Cancel":
+        cancel_solve()
+    else:
+        calculate_and_set()
+
+def show_solving(solving):
+    if solving:
+        progress_var.set(0)
+        progress_bar.grid()
+        calculate_button.config(text="Cancel")
+    else:
+        progress_bar.grid_remove()
+        calculate_button.config(text="Calculate")
+
+def poll_results():
+    while not solve_results.empty():
+        request_id, kind, value = solve_results.get_nowait()
+        if request_id != latest_request:
+            continue # an answer nobody is waiting for anymore
+        if kind == "progress":
+            step, steps = value
+            progress_var.set(100 * step / max(steps, 1))
+        elif kind == "solve":
+            with trace.request(request_id), trace.phase("gui/show"):
+                set_results(value)
+            show_solving(False)
+        elif kind == "rank":
+            show_solving(False)
+            apply_ranking(value)
+        elif kind == "frontier":
+            show_solving(False)
+            apply_frontier(value)
+        else:
+            err_msg.set("Could not solve these inputs.")
+            show_solving(False)
+    root.after(POLL_MS, poll_results)
 
 def resource_path(relative_path):
     try:
@@ -780,6 +444,68 @@ def on_combo_change(event=None):
 def close_window(event):
     root.destroy()
 
+################################
+########## Auto-solve ##########
+################################
+
+# With "Auto" ticked every edit schedules a solve DEBOUNCE_MS later; edits in
+# between push it back, so typing "120" solves once and not for 1, 12 and 120
+auto_after_id = None
+DEBOUNCE_MS = 300
+
+def schedule_auto_solve(*_):
+    global auto_after_id
+    if not auto_var.get():
+        return
+    if auto_after_id is not None:
+        root.after_cancel(auto_after_id)
+    auto_after_id = root.after(DEBOUNCE_MS, auto_solve)
+
+def auto_solve():
+    global auto_after_id
+    auto_after_id = None
+    calculate_and_set(quiet=True)
+
+################################
+####### Startup Functions ######
+################################
+
+# Seconds since the start of solver.py for every startup phase, printed with
+# --startup-report (which also closes the app once everything is loaded)
+startup_times = {}
+STARTUP_BUDGET = 1.0 # seconds until the window shows
+startup_exit = 0
+
+def mark_startup(phase):
+    startup_times[phase] = time.perf_counter() - STARTUP
+
+def warm_backend():
+    # numpy and the solver load here, after the window is up, so the first
+    # Calculate does not have to wait for them
+    import wgc.native
+    mark_startup("backend loaded")
+
+def on_window_shown():
+    mark_startup("window shown")
+    warm_thread = threading.Thread(target=warm_backend, daemon=True)
+    warm_thread.start()
+    root.after(20, wait_for_backend, warm_thread)
+
+def wait_for_backend(warm_thread):
+    if warm_thread.is_alive():
+        root.after(20, wait_for_backend, warm_thread)
+    elif "--startup-report" in sys.argv:
+        report_startup()
+
+def report_startup():
+    global startup_exit
+    for phase, seconds in startup_times.items():
+        print(f"{phase:<16}{seconds * 1000:8.1f} ms")
+    if startup_times["window shown"] > STARTUP_BUDGET:
+        print(f"window took longer than {STARTUP_BUDGET} s")
+        startup_exit = 1
+    root.destroy()
+
 ################################
 ######## Style Functions #######
 ################################
@@ -798,6 +524,14 @@ def apply_theme(theme):
                 activebackground=theme["entry_bg"],
                 activeforeground=theme["entry_fg"]
             )
+        elif isinstance(widget, tk.Checkbutton):
+            widget.configure(
+                bg=theme["bg"],
+                fg=theme["fg"],
+                selectcolor=theme["entry_bg"],
+                activebackground=theme["bg"],
+                activeforeground=theme["fg"]
+            )
 
     err_msg_label.configure(fg=theme["error_fg"])
     
@@ -808,6 +542,7 @@ def apply_theme(theme):
         background=theme["entry_bg"],
         foreground=theme["entry_fg"],
         arrowcolor=theme["entry_fg"],
+        insertcolor=theme["entry_fg"],
         selectbackground=theme["entry_bg"],
         selectforeground=theme["entry_fg"],
         
@@ -854,225 +589,257 @@ def switch_color_scheme():
 
     apply_theme(curr_theme)
     
-################################
-######### Window Setup #########
-################################
+# Building the window only happens when run as the app, importing this file
+# (or the wgc package) has no GUI side effects
+if __name__ == "__main__":
+    mark_startup("imports")
 
-root = tk.Tk()
-root.title("Terraforming Titans WGC Team Optimizer")
-root.configure(bg="#f0f0f0")
-vcmd = root.register(only_digits)
-
-style = ttk.Style()
-style.theme_use("clam")
-# Normal entry
-style.configure(
-    "App.TEntry",
-    fieldbackground=curr_theme["entry_bg"],
-    foreground=curr_theme["entry_fg"],
-    insertcolor=curr_theme["entry_fg"],
-    justify="center",
-    
-    bordercolor=curr_theme["border"],
-    lightcolor=curr_theme["border"],
-    darkcolor=curr_theme["border"],
-)
-# Disabled entry
-style.map(
-    "App.TEntry",
-    fieldbackground=[("disabled", curr_theme["disabled_bg"])],
-    foreground=[("disabled", curr_theme["disabled_fg"])]
-)
-
-style.configure(
-    "App.TCombobox",
-    fieldbackground=curr_theme["entry_bg"],
-    background=curr_theme["entry_bg"],
-    foreground=curr_theme["entry_fg"],
-    arrowcolor=curr_theme["entry_fg"],
-    selectbackground=curr_theme["entry_bg"],
-    selectforeground=curr_theme["entry_fg"],
-    
-    bordercolor=curr_theme["border"],
-    lightcolor=curr_theme["border"],
-    darkcolor=curr_theme["border"],
-)
-
-style.map(
-    "App.TCombobox",
-    fieldbackground=[
-        ("readonly", curr_theme["entry_bg"]),
-        ("disabled", curr_theme["disabled_bg"])
-    ],
-    foreground=[
-        ("readonly", curr_theme["entry_fg"]),
-        ("disabled", curr_theme["disabled_fg"])
-    ],
-    selectbackground=[
-        ("readonly", curr_theme["entry_bg"]),
-        ("focus", curr_theme["entry_bg"])
-    ],
-    selectforeground=[
-        ("readonly", curr_theme["entry_fg"]),
-        ("focus", curr_theme["entry_fg"])
-    ],
-    background=[("active", curr_theme["hover_bg"])],
-)
-
-icon = tk.PhotoImage(file=resource_path("tt.png"))
-root.iconphoto(True, icon)
-
-# Top labels
-labels_top = ["Shooting\nRange Level", "Obstacle\nCourse Level", "Library\nLevel", "Success\nChance", "", "Hazard\nApproach", "Max Level"]
-for col, text in enumerate(labels_top):
-    tk.Label(root, text=text, font=("Arial", 10, "bold"), width=col_width[col]).grid(row=0, column=col, padx=5, pady=5)
-
-hazard_var = tk.StringVar()
-create_entry(1, 5, hazard_var)
-
-# Buttons
-root.bind("<Return>", lambda event: calculate_and_set())
-tk.Button(root, text="Calculate", command=calculate_and_set).grid(row=7, column=1, pady=10)
-
-root.bind('<Escape>', close_window)
-tk.Button(root, text="Quit", command=root.destroy).grid(row=7, column=5, pady=10)
-
-light_button = tk.Button(root, text="Light Mode", command=switch_color_scheme)
-light_button.grid(row=7, column=6, pady=10)
-
-# Error message
-err_msg = tk.StringVar()
-err_msg.set("")
-err_msg_label = tk.Label(root, textvariable=err_msg, justify="center", fg="#DB2121")
-err_msg_label.grid(row=7, column=2, columnspan=3, padx=5, pady=5)
-
-# Max level possible
-max_level = tk.StringVar()
-create_entry(1, 6, max_level)
+    ################################
+    ######### Window Setup #########
+    ################################
 
-################################
-######### User Section #########
-################################
+    root = tk.Tk()
+    root.title("Terraforming Titans WGC Team Optimizer")
+    root.configure(bg="#f0f0f0")
+    vcmd = root.register(only_digits)
 
-# Second row: user inputs and dropdown
-shoot_entry = ttk.Entry(root, width=col_width[0], style="App.TEntry", justify="center", validate="key", validatecommand=(vcmd, "%P"))
-shoot_entry.grid(row=1, column=0, padx=5, pady=5)
-obstacle_entry = ttk.Entry(root, width=col_width[1], style="App.TEntry", justify="center", validate="key", validatecommand=(vcmd, "%P"))
-obstacle_entry.grid(row=1, column=1, padx=5, pady=5)
-library_entry = ttk.Entry(root, width=col_width[2], style="App.TEntry", justify="center", validate="key", validatecommand=(vcmd, "%P"))
-library_entry.grid(row=1, column=2, padx=5, pady=5)
-
-success_var = tk.StringVar()
-success_dropdown = ttk.Combobox(root, textvariable=success_var, width=col_width[3], style="App.TCombobox", 
-                                values=[str(i) + "%" for i in range(100,49,-10)], state="readonly")
-success_dropdown.current(0)
-success_dropdown.grid(row=1, column=3, padx=5, pady=5)
-
-top_inputs = [shoot_entry, obstacle_entry, library_entry, success_var]
-
-# Third row: Titles
-labels_top = ["Slot", "Job", "Level", "", "Power", "Athletics", "Wit"]
-for col, text in enumerate(labels_top):
-    tk.Label(root, text=text, font=("Arial", 10, "bold"), width=col_width[col]).grid(row=2, column=col, padx=5, pady=5)
-
-for i in range(4):
-    # Slot numbers
-    slot_label = tk.StringVar()
-    slot_label.set(i+1)
-    class_label = tk.Label(root, textvariable=slot_label, width=col_width[0])
-    class_label.grid(row=i+3, column=0, padx=5, pady=5)
-    #class_vars.append(slot_label)
+    style = ttk.Style()
+    style.theme_use("clam")
+    # Normal entry
+    style.configure(
+        "App.TEntry",
+        fieldbackground=curr_theme["entry_bg"],
+        foreground=curr_theme["entry_fg"],
+        insertcolor=curr_theme["entry_fg"],
+        justify="center",
     
-    # Class dropdown
-    c_var = tk.StringVar()
-    if i == 0:
-        c_var.set("Leader")
-        class_label = tk.Label(root, textvariable=c_var, width=col_width[1], justify="center")
-        class_label.grid(row=3, column=1, padx=5, pady=5)
-    else:
-        class_dropdown = ttk.Combobox(root, textvariable=c_var, values=class_options, style="App.TCombobox", width=col_width[1], justify="center", state="readonly")
-        class_dropdown.grid(row=i+3, column=1, padx=5, pady=5)
-        class_dropdown.current(i-1)
-        
-        class_dropdown_vars.append(class_dropdown)
-        class_vars.append(c_var)
-        
-class_dropdown_vars[0].bind("<<ComboboxSelected>>", on_combo_change)
-class_dropdown_vars[1].bind("<<ComboboxSelected>>", on_combo_change)
-
-leader_lvl_var = tk.StringVar()
-sold_1_lvl_var = tk.StringVar()
-sold_2_lvl_var = tk.StringVar()
-others_lvl_var = tk.StringVar()
-lvl_vars.append(leader_lvl_var)
-lvl_vars.append(sold_1_lvl_var)
-lvl_vars.append(sold_2_lvl_var)
-lvl_vars.append(others_lvl_var)
-lvl_dropdown_vars.append(create_level_entry(3, leader_lvl_var))  # Leader level
-lvl_dropdown_vars.append(create_level_entry(4, sold_1_lvl_var))  # Soldier's level
-lvl_dropdown_vars.append(create_level_entry(5, sold_2_lvl_var))  # Soldier's level
-lvl_dropdown_vars.append(create_level_entry(5, others_lvl_var, rowspan=2, sticky="ns"))  # Others' level
+        bordercolor=curr_theme["border"],
+        lightcolor=curr_theme["border"],
+        darkcolor=curr_theme["border"],
+    )
+    # Disabled entry
+    style.map(
+        "App.TEntry",
+        fieldbackground=[("disabled", curr_theme["disabled_bg"])],
+        foreground=[("disabled", curr_theme["disabled_fg"])]
+    )
 
-################################
-### PAW that gets calculated ###
-################################
+    style.configure(
+        "App.TCombobox",
+        fieldbackground=curr_theme["entry_bg"],
+        background=curr_theme["entry_bg"],
+        foreground=curr_theme["entry_fg"],
+        arrowcolor=curr_theme["entry_fg"],
+        insertcolor=curr_theme["entry_fg"],
+        selectbackground=curr_theme["entry_bg"],
+        selectforeground=curr_theme["entry_fg"],
+    
+        bordercolor=curr_theme["border"],
+        lightcolor=curr_theme["border"],
+        darkcolor=curr_theme["border"],
+    )
 
-# Power, Athlete, Wit (Leader)
-leader_power_var = tk.StringVar()
-leader_ath_var = tk.StringVar()
-leader_wit_var = tk.StringVar()
-create_entry(3, 4, leader_power_var)
-create_entry(3, 5, leader_ath_var)
-create_entry(3, 6, leader_wit_var)
-
-# Power, Athlete, Wit (Soldier)
-sold_1_power_var = tk.StringVar()
-sold_1_ath_var = tk.StringVar()
-sold_1_wit_var = tk.StringVar()
-soldier_1_result_vars.append(create_entry(4, 4, sold_1_power_var))
-soldier_1_result_vars.append(create_entry(4, 5, sold_1_ath_var))
-soldier_1_result_vars.append(create_entry(4, 6, sold_1_wit_var))
-
-# Power, Athlete, Wit (Soldier)
-sold_2_power_var = tk.StringVar()
-sold_2_ath_var = tk.StringVar()
-sold_2_wit_var = tk.StringVar()
-soldier_2_result_vars.append(create_entry(5, 4, sold_2_power_var))
-soldier_2_result_vars.append(create_entry(5, 5, sold_2_ath_var))
-soldier_2_result_vars.append(create_entry(5, 6, sold_2_wit_var))
-
-# Power, Athlete, Wit (Others)
-others_power_var = tk.StringVar()
-others_ath_var = tk.StringVar()
-others_wit_var = tk.StringVar()
-others_result_vars.append(create_entry(5, 4, others_power_var, rowspan=2, sticky="ns"))
-others_result_vars.append(create_entry(5, 5, others_ath_var, rowspan=2, sticky="ns"))
-others_result_vars.append(create_entry(5, 6, others_wit_var, rowspan=2, sticky="ns"))
+    style.map(
+        "App.TCombobox",
+        fieldbackground=[
+            ("readonly", curr_theme["entry_bg"]),
+            ("disabled", curr_theme["disabled_bg"])
+        ],
+        foreground=[
+            ("readonly", curr_theme["entry_fg"]),
+            ("disabled", curr_theme["disabled_fg"])
+        ],
+        selectbackground=[
+            ("readonly", curr_theme["entry_bg"]),
+            ("focus", curr_theme["entry_bg"])
+        ],
+        selectforeground=[
+            ("readonly", curr_theme["entry_fg"]),
+            ("focus", curr_theme["entry_fg"])
+        ],
+        background=[("active", curr_theme["hover_bg"])],
+    )
 
-################################
-##### Open window to center ####
-################################
+    icon = tk.PhotoImage(file=resource_path("tt.png"))
+    root.iconphoto(True, icon)
+
+    # Top labels
+    labels_top = ["Shooting\nRange Level", "Obstacle\nCourse Level", "Library\nLevel", "Success\nChance", "", "Hazard\nApproach", "Max Level"]
+    for col, text in enumerate(labels_top):
+        tk.Label(root, text=text, font=("Arial", 10, "bold"), width=col_width[col]).grid(row=0, column=col, padx=5, pady=5)
+
+    hazard_var = tk.StringVar()
+    create_entry(1, 5, hazard_var)
+
+    # Buttons
+    root.bind("<Return>", lambda event: calculate_and_set())
+    calculate_button = tk.Button(root, text="Calculate", command=on_calculate_button)
+    calculate_button.grid(row=7, column=1, pady=10)
+    tk.Button(root, text="Best jobs", command=find_best_jobs).grid(row=2, column=3, padx=5, pady=5)
+    tk.Button(root, text="Chances", command=find_chances).grid(row=0, column=4, padx=5, pady=5)
 
-# Style
-style = ttk.Style(root)
-apply_theme(curr_theme)
+    # Shown while a solve is running
+    progress_var = tk.DoubleVar()
+    progress_bar = ttk.Progressbar(root, variable=progress_var, maximum=100, length=70, mode="determinate")
+    progress_bar.grid(row=7, column=0, padx=5, pady=10)
+    progress_bar.grid_remove()
+
+    root.bind('<Escape>', close_window)
+    root.bind("<F12>", show_diagnostics)
+    tk.Button(root, text="Quit", command=root.destroy).grid(row=7, column=5, pady=10)
+
+    light_button = tk.Button(root, text="Light Mode", command=switch_color_scheme)
+    light_button.grid(row=7, column=6, pady=10)
+
+    # Error message
+    err_msg = tk.StringVar()
+    err_msg.set("")
+    err_msg_label = tk.Label(root, textvariable=err_msg, justify="center", fg="#DB2121")
+    err_msg_label.grid(row=7, column=2, columnspan=3, padx=5, pady=5)
+
+    # Max level possible
+    max_level = tk.StringVar()
+    create_entry(1, 6, max_level)
+
+    ################################
+    ######### User Section #########
+    ################################
+
+    # Second row: user inputs and dropdown
+    shoot_var = tk.StringVar()
+    shoot_entry = ttk.Entry(root, textvariable=shoot_var, width=col_width[0], style="App.TEntry", justify="center", validate="key", validatecommand=(vcmd, "%P"))
+    shoot_entry.grid(row=1, column=0, padx=5, pady=5)
+    obstacle_var = tk.StringVar()
+    obstacle_entry = ttk.Entry(root, textvariable=obstacle_var, width=col_width[1], style="App.TEntry", justify="center", validate="key", validatecommand=(vcmd, "%P"))
+    obstacle_entry.grid(row=1, column=1, padx=5, pady=5)
+    library_var = tk.StringVar()
+    library_entry = ttk.Entry(root, textvariable=library_var, width=col_width[2], style="App.TEntry", justify="center", validate="key", validatecommand=(vcmd, "%P"))
+    library_entry.grid(row=1, column=2, padx=5, pady=5)
+
+    success_var = tk.StringVar()
+    success_dropdown = ttk.Combobox(root, textvariable=success_var, width=col_width[3], style="App.TCombobox", 
+                                    values=[str(i) + "%" for i in range(100,49,-10)])
+    success_dropdown.current(0)
+    success_dropdown.grid(row=1, column=3, padx=5, pady=5)
+
+    top_inputs = [shoot_entry, obstacle_entry, library_entry, success_var]
+
+    # Auto-solve toggle
+    auto_var = tk.BooleanVar(value=True)
+    tk.Checkbutton(root, text="Auto", variable=auto_var, command=schedule_auto_solve).grid(row=1, column=4, padx=5, pady=5)
+
+    # Third row: Titles
+    labels_top = ["Slot", "Job", "Level", "", "Power", "Athletics", "Wit"]
+    for col, text in enumerate(labels_top):
+        tk.Label(root, text=text, font=("Arial", 10, "bold"), width=col_width[col]).grid(row=2, column=col, padx=5, pady=5)
+
+    for i in range(4):
+        # Slot numbers
+        slot_label = tk.StringVar()
+        slot_label.set(i+1)
+        class_label = tk.Label(root, textvariable=slot_label, width=col_width[0])
+        class_label.grid(row=i+3, column=0, padx=5, pady=5)
+        #class_vars.append(slot_label)
+    
+        # Class dropdown
+        c_var = tk.StringVar()
+        if i == 0:
+            c_var.set("Leader")
+            class_label = tk.Label(root, textvariable=c_var, width=col_width[1], justify="center")
+            class_label.grid(row=3, column=1, padx=5, pady=5)
+        else:
+            class_dropdown = ttk.Combobox(root, textvariable=c_var, values=class_options, style="App.TCombobox", width=col_width[1], justify="center", state="readonly")
+            class_dropdown.grid(row=i+3, column=1, padx=5, pady=5)
+            class_dropdown.current(i-1)
+        
+            class_dropdown_vars.append(class_dropdown)
+            class_vars.append(c_var)
+        
+    class_dropdown_vars[0].bind("<<ComboboxSelected>>", on_combo_change)
+    class_dropdown_vars[1].bind("<<ComboboxSelected>>", on_combo_change)
+
+    leader_lvl_var = tk.StringVar()
+    sold_1_lvl_var = tk.StringVar()
+    sold_2_lvl_var = tk.StringVar()
+    others_lvl_var = tk.StringVar()
+    lvl_vars.append(leader_lvl_var)
+    lvl_vars.append(sold_1_lvl_var)
+    lvl_vars.append(sold_2_lvl_var)
+    lvl_vars.append(others_lvl_var)
+    lvl_dropdown_vars.append(create_level_entry(3, leader_lvl_var))  # Leader level
+    lvl_dropdown_vars.append(create_level_entry(4, sold_1_lvl_var))  # Soldier's level
+    lvl_dropdown_vars.append(create_level_entry(5, sold_2_lvl_var))  # Soldier's level
+    lvl_dropdown_vars.append(create_level_entry(5, others_lvl_var, rowspan=2, sticky="ns"))  # Others' level
+
+    # Any change to an input can trigger an auto-solve
+    for var in class_vars + lvl_vars + [shoot_var, obstacle_var, library_var, success_var]:
+        var.trace_add("write", schedule_auto_solve)
+
+    ################################
+    ### PAW that gets calculated ###
+    ################################
+
+    # Power, Athlete, Wit (Leader)
+    leader_power_var = tk.StringVar()
+    leader_ath_var = tk.StringVar()
+    leader_wit_var = tk.StringVar()
+    create_entry(3, 4, leader_power_var)
+    create_entry(3, 5, leader_ath_var)
+    create_entry(3, 6, leader_wit_var)
+
+    # Power, Athlete, Wit (Soldier)
+    sold_1_power_var = tk.StringVar()
+    sold_1_ath_var = tk.StringVar()
+    sold_1_wit_var = tk.StringVar()
+    soldier_1_result_vars.append(create_entry(4, 4, sold_1_power_var))
+    soldier_1_result_vars.append(create_entry(4, 5, sold_1_ath_var))
+    soldier_1_result_vars.append(create_entry(4, 6, sold_1_wit_var))
+
+    # Power, Athlete, Wit (Soldier)
+    sold_2_power_var = tk.StringVar()
+    sold_2_ath_var = tk.StringVar()
+    sold_2_wit_var = tk.StringVar()
+    soldier_2_result_vars.append(create_entry(5, 4, sold_2_power_var))
+    soldier_2_result_vars.append(create_entry(5, 5, sold_2_ath_var))
+    soldier_2_result_vars.append(create_entry(5, 6, sold_2_wit_var))
+
+    # Power, Athlete, Wit (Others)
+    others_power_var = tk.StringVar()
+    others_ath_var = tk.StringVar()
+    others_wit_var = tk.StringVar()
+    others_result_vars.append(create_entry(5, 4, others_power_var, rowspan=2, sticky="ns"))
+    others_result_vars.append(create_entry(5, 5, others_ath_var, rowspan=2, sticky="ns"))
+    others_result_vars.append(create_entry(5, 6, others_wit_var, rowspan=2, sticky="ns"))
+
+    ################################
+    ##### Open window to center ####
+    ################################
+
+    # Style
+    style = ttk.Style(root)
+    apply_theme(curr_theme)
 
-# Force geometry calculation
-root.update_idletasks()
+    # Force geometry calculation
+    root.update_idletasks()
 
-# Window size
-window_width = root.winfo_width()
-window_height = root.winfo_height()
+    # Window size
+    window_width = root.winfo_width()
+    window_height = root.winfo_height()
 
-# Get screen dimensions
-screen_width = root.winfo_screenwidth()
-screen_height = root.winfo_screenheight()
+    # Get screen dimensions
+    screen_width = root.winfo_screenwidth()
+    screen_height = root.winfo_screenheight()
 
-# Calculate position
-x = (screen_width // 2) - (window_width // 2)
-y = (screen_height // 2) - (window_height // 2)
+    # Calculate position
+    x = (screen_width // 2) - (window_width // 2)
+    y = (screen_height // 2) - (window_height // 2)
 
-# Set geometry
-root.geometry(f"{window_width}x{window_height}+{x}+{y}")
+    # Set geometry
+    root.geometry(f"{window_width}x{window_height}+{x}+{y}")
+    mark_startup("window built")
 
-root.mainloop()
\ No newline at end of file
+    threading.Thread(target=solve_worker, daemon=True).start()
+    root.after(POLL_MS, poll_results)
+    root.after(0, on_window_shown)
+    root.mainloop()
+    sys.exit(startup_exit)
\ No newline at end of file
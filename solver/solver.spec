@@ -1,34 +1,34 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
 
 
 a = Analysis(
     ['solver.py'],
     pathex=[],
-    binaries=[('C:/Users/matte/Anaconda3/Lib/site-packages/pulp/solverdir/cbc/win/i64/cbc.exe', 'pulp/solverdir/cbc/win/i64/')],
-    datas=[('tt.png', '.')],
-    hiddenimports=[],
+    binaries=[],
+    # answers.tbl is the precomputed answer table, when one was built (build_table.py)
+    datas=[('tt.png', '.')] + ([('answers.tbl', '.')] if os.path.exists('answers.tbl') else []),
+    hiddenimports=['wgc.native'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=['pulp'],
     noarchive=False,
     optimize=0,
 )
 pyz = PYZ(a.pure)
 
+# Folder build: nothing to unpack on launch, unlike a single-file EXE
 exe = EXE(
     pyz,
     a.scripts,
-    a.binaries,
-    a.datas,
     [],
+    exclude_binaries=True,
     name='solver',
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
-    upx_exclude=[],
-    runtime_tmpdir=None,
+    upx=False,
     console=False,
     disable_windowed_traceback=False,
     argv_emulation=False,
@@ -37,3 +37,11 @@ exe = EXE(
     entitlements_file=None,
     icon=['tt.png'],
 )
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=False,
+    name='solver',
+)
@@ -0,0 +1,223 @@
+import argparse
+import csv
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from wgc.game import JOB, HAZARD, COMPOSITIONS, probability, success_rolls, convert_to_skill_point
+from wgc.team import best_hazard
+from wgc import batch
+
+# Grid sweep over member levels, facility levels, success chances, hazard
+# approaches and job compositions (the old scorecard experiment).
+#
+#   python sweep.py --levels 10-100 --facility 0,33,66,100 --out sweep.csv
+#
+# Facility levels are the ones typed in the GUI (a multiplier of 1 + level/100,
+# like calc and build_table.py). One task is one (leader level, member level,
+# success chance): every composition, facility combination and hazard of it
+# goes through batch.solve_batch in one call, one row each. "best" marks the
+# row of the composition and hazard that win a facility combination. Tasks run on a process pool and their rows are
+# streamed to the output as they finish. Every finished task is appended to a
+# checkpoint file (<out>.ckpt) with its part of the scorecard, so rerunning the
+# same command picks up where it stopped.
+
+COLUMNS = ["leader_lvl", "member_lvl", "success", "obst", "shoot", "lib",
+           "composition", "hazard", "t", "best"]
+
+def composition_key(option):
+    return ", ".join(job.name for job in option)
+
+def parse_levels(text):
+    # "1,5,10-20" -> [1, 5, 10, 11, ..., 20]
+    levels = []
+    for part in text.split(","):
+        if "-" in part:
+            lo, hi = part.split("-")
+            levels += range(int(lo), int(hi) + 1)
+        else:
+            levels.append(int(part))
+    return levels
+
+def parse_ints(text):
+    return [int(x) for x in text.split(",")]
+
+################################
+############ Tasks #############
+################################
+
+def run_task(task, facility):
+    leader_lvl, member_lvl, success = task
+    ri, rg = success_rolls(success)
+    skill_member = convert_to_skill_point(member_lvl, False)
+
+    # Soldiers come first in a composition, like in the GUI; the first two
+    # slots are explicit soldiers and everyone else shares the 'a' allocation
+    hazards = list(HAZARD)
+    points = [(ol, sl, ll) for ol in facility for sl in facility for ll in facility]
+    obst, shoot, lib, soldiers, options, approaches = [], [], [], [], [], []
+    for option in COMPOSITIONS:
+        nb_explicit = 2 if option[:2] == (JOB.Soldier, JOB.Soldier) else int(option[0] == JOB.Soldier)
+        for haz in hazards:
+            for ol, sl, ll in points:
+                obst.append(1 + ol/100)
+                shoot.append(1 + sl/100)
+                lib.append(1 + ll/100)
+                soldiers.append([skill_member] * nb_explicit)
+                options.append(list(option))
+                approaches.append(haz)
+
+    t = batch.solve_batch(obst, shoot, lib, convert_to_skill_point(leader_lvl, True), soldiers, skill_member,
+                          ri, rg, options, hazard_approach=approaches)["t"]
+    t = t.reshape(len(COMPOSITIONS), len(hazards), len(points))
+
+    # Winner per facility combination: the best hazard of every composition
+    # (see team.best_hazard), then the best composition, ties going to the
+    # first one like the old loop did
+    rows = []
+    counts = {}
+    for p, (ol, sl, ll) in enumerate(points):
+        wins = [best_hazard(list(t[c, :, p])) for c in range(len(COMPOSITIONS))]
+        best = max(range(len(COMPOSITIONS)), key=lambda c: (t[c, wins[c], p], -c))
+        key = composition_key(COMPOSITIONS[best])
+        counts[key] = counts.get(key, 0) + 1
+        for c, option in enumerate(COMPOSITIONS):
+            for h, haz in enumerate(hazards):
+                rows.append([leader_lvl, member_lvl, success, ol, sl, ll, composition_key(option),
+                             haz.name, float(t[c, h, p]), c == best and h == wins[c]])
+    return task, rows, counts
+
+################################
+########### Outputs ############
+################################
+
+class CsvOutput:
+    # One CSV file. The checkpoint keeps its size after every task so a crashed
+    # run can drop the rows of the task that did not finish.
+    def __init__(self, path, offset):
+        new = offset is None or not os.path.exists(path)
+        self.f = open(path, "w+" if new else "r+", newline="")
+        if not new:
+            self.f.truncate(offset)
+            self.f.seek(offset)
+        self.writer = csv.writer(self.f)
+        if new:
+            self.writer.writerow(COLUMNS)
+
+    def write(self, task, rows):
+        self.writer.writerows(rows)
+        self.f.flush()
+        os.fsync(self.f.fileno())
+        return self.f.tell()
+
+    def close(self):
+        self.f.close()
+
+class ParquetOutput:
+    # A directory of Parquet files, one per task, written under a temporary
+    # name first so a file only shows up once it is complete
+    def __init__(self, path, offset):
+        try:
+            import pyarrow as pa # type: ignore
+            import pyarrow.parquet as pq # type: ignore
+        except ImportError:
+            sys.exit("Parquet output needs pyarrow (pip install pyarrow), or pass a .csv output")
+        self.pa, self.pq = pa, pq
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def write(self, task, rows):
+        table = self.pa.table({name: [row[i] for row in rows] for i, name in enumerate(COLUMNS)})
+        name = os.path.join(self.path, "part-{}-{}-{}.parquet".format(*task).replace("%", ""))
+        self.pq.write_table(table, name + ".tmp")
+        os.replace(name + ".tmp", name)
+        return None
+
+    def close(self):
+        pass
+
+################################
+######### Checkpoints ##########
+################################
+
+def load_checkpoint(path, spec):
+    # Finished tasks, their scorecards and the output size after the last one
+    done, scorecard, offset = set(), {}, None
+    if not os.path.exists(path):
+        return done, scorecard, offset
+    with open(path) as f:
+        lines = [json.loads(line) for line in f if line.strip()]
+    if lines and lines[0] != spec:
+        sys.exit(f"{path} belongs to a sweep with other settings, remove it or use --restart")
+    for entry in lines[1:]:
+        done.add(tuple(entry["task"]))
+        for key, count in entry["counts"].items():
+            scorecard[key] = scorecard.get(key, 0) + count
+        offset = entry["offset"]
+    return done, scorecard, offset
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep the WGC team optimizer over a grid of inputs")
+    parser.add_argument("--levels", default="50", help="leader levels, e.g. 10,20,50-60 (default 50)")
+    parser.add_argument("--member-levels", default=None,
+                        help="levels of the other members (default: same as the leader)")
+    parser.add_argument("--facility", default="0,33,66,100",
+                        help="facility levels (as typed in the GUI) tried for obstacle, shooting and library")
+    parser.add_argument("--success", default=",".join(probability),
+                        help="success chances, e.g. 100%%,75%%,50%%")
+    parser.add_argument("--out", default="sweep.csv", help="a .csv file, or a directory for Parquet")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--restart", action="store_true", help="ignore and overwrite an earlier checkpoint")
+    args = parser.parse_args(argv)
+
+    leader_levels = parse_levels(args.levels)
+    try:
+        facility = parse_ints(args.facility)
+    except ValueError:
+        parser.error(f"facility levels are whole numbers, e.g. 0,33,66,100: {args.facility!r}")
+    successes = args.success.split(",")
+    for success in successes:
+        try:
+            success_rolls(success)
+        except ValueError as e:
+            parser.error(str(e))
+    if args.member_levels is None:
+        pairs = [(lvl, lvl) for lvl in leader_levels]
+    else:
+        pairs = [(lvl, m) for lvl in leader_levels for m in parse_levels(args.member_levels)]
+    tasks = [(lvl, m, s) for lvl, m in pairs for s in successes]
+
+    ckpt = args.out.rstrip("/\\") + ".ckpt"
+    spec = {"levels": [list(pair) for pair in pairs], "facility_levels": facility, "success": successes,
+            "rows": "hazard"}
+    if args.restart and os.path.exists(ckpt):
+        os.remove(ckpt)
+    done, scorecard, offset = load_checkpoint(ckpt, spec)
+    if not done and os.path.exists(ckpt):
+        os.remove(ckpt)
+    todo = [task for task in tasks if task not in done]
+    print(f"{len(tasks)} tasks, {len(done)} already done, {len(todo)} to go")
+
+    out = (CsvOutput if args.out.endswith(".csv") else ParquetOutput)(args.out, offset if done else None)
+    with open(ckpt, "a") as log:
+        if not done:
+            log.write(json.dumps(spec) + "\n")
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            futures = [pool.submit(run_task, task, facility) for task in todo]
+            for i, future in enumerate(as_completed(futures), start=1):
+                task, rows, counts = future.result()
+                offset = out.write(task, rows)
+                log.write(json.dumps({"task": task, "counts": counts, "offset": offset}) + "\n")
+                log.flush()
+                for key, count in counts.items():
+                    scorecard[key] = scorecard.get(key, 0) + count
+                print(f"[{i}/{len(todo)}] leader {task[0]}, members {task[1]}, {task[2]}")
+    out.close()
+
+    for option in COMPOSITIONS:
+        key = composition_key(option)
+        print(f"{key}: {scorecard.get(key, 0)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+import pytest
+
+from wgc import calc
+
+@pytest.fixture
+def no_caches():
+    # calc without the user's disk cache or answer table, and nothing in
+    # memory from other tests
+    calc.use_disk_cache(None)
+    calc.use_answer_table(None)
+    calc.reset_caches()
+    yield
+    calc.use_disk_cache(None)
+    calc.use_answer_table(None)
+    calc.reset_caches()
@@ -0,0 +1,49 @@
+import random
+
+import pytest
+
+import golden
+from wgc import backends
+from wgc.game import HAZARD, convert_to_skill_point
+
+def grid(seed, cases):
+    # Cases like golden.py's, at levels 1-60 where CBC stays quick
+    rng = random.Random(seed)
+    out = []
+    for _ in range(cases):
+        case = golden.random_case(rng)
+        case["skill_leader"] = convert_to_skill_point(rng.randint(1, 60), True)
+        case["skill_soldiers"] = [convert_to_skill_point(rng.randint(1, 60), False) for _ in case["skill_soldiers"]]
+        case["skill_other"] = convert_to_skill_point(rng.randint(1, 60), False)
+        out.append(case)
+    return out
+
+@pytest.mark.parametrize("name", ["highs", "cbc"])
+def test_backends_agree_with_native(name):
+    # Same t, max level and winning hazard, and valid allocations: what
+    # golden.py check fails on
+    if not backends.available(name):
+        pytest.skip(f"{name} is not installed")
+    for case in grid(1, 8):
+        ref = {**case, "answers": golden.solve_case("native", case)}
+        found = golden.compare(ref, golden.solve_case(name, case))
+        assert set(found) <= set(golden.ALLOWED), (case, found)
+
+def test_unknown_backend():
+    with pytest.raises(ValueError, match="unknown backend"):
+        backends.solve_maxmin_all_hazards(1, 1, 1, 30, [20], 20, backend="gurobi")
+
+def test_auto_answers_like_native():
+    res = backends.solve_maxmin_all_hazards(1.2, 1.1, 1.0, 40, [30], 30, backend="auto")
+    ref = backends.solve_maxmin_all_hazards(1.2, 1.1, 1.0, 40, [30], 30, backend="native")
+    assert res["backend"] in backends.AUTO and ref["backend"] == "native"
+    assert res["t"] == pytest.approx(ref["t"], rel=1e-6) and res["hazard"] == ref["hazard"]
+
+@pytest.mark.parametrize("name", list(backends.MODULES))
+def test_same_status_and_t(name):
+    # Every backend reports pulp's status words and t as the lowest z
+    if not backends.available(name):
+        pytest.skip(f"{name} is not installed")
+    res = backends.get(name).solve_team(golden.case_team(grid(2, 1)[0], HAZARD.Recon))
+    assert res["status"] == "Optimal"
+    assert res["t"] == min(res["z"].values())
@@ -0,0 +1,30 @@
+import random
+
+import numpy as np
+import pytest
+
+from wgc import batch, native
+from wgc.game import JOB, HAZARD, COMPOSITIONS, probability
+
+def test_batch_matches_native():
+    rng = random.Random(3)
+    queries = []
+    for _ in range(40):
+        option = list(rng.choice(COMPOSITIONS))
+        nb_soldiers = 2 if option[:2] == [JOB.Soldier, JOB.Soldier] else int(option[0] == JOB.Soldier)
+        queries.append((1 + rng.randint(0, 100) / 100, 1 + rng.randint(0, 100) / 100, 1 + rng.randint(0, 100) / 100,
+                        rng.choice([20, 40]), [30] * nb_soldiers, 30, *rng.choice(list(probability.values())), option))
+    columns = list(zip(*queries))
+    res = batch.solve_batch(*[np.array(c) for c in columns[:4]], list(columns[4]), np.array(columns[5]),
+                            np.array(columns[6]), np.array(columns[7]), list(columns[8]), hazard_approach=None)
+    for k, query in enumerate(queries):
+        ref = native.solve_maxmin_all_hazards(*query[:8], options=query[8])
+        assert res["t"][k] == pytest.approx(ref["t"], rel=1e-9)
+        assert res["hazard"][k] == ref["hazard"]
+
+def test_one_hazard_matches_solve_team():
+    res = batch.solve_batch(np.array([1.0, 1.5, 2.0]), 1.2, 1.1, 40, [30], 30,
+                            hazard_approach=HAZARD.Recon)
+    for k, obst in enumerate([1.0, 1.5, 2.0]):
+        ref = native.solve_maxmin_soldier(obst, 1.2, 1.1, 40, 30, 30, hazard_approach=HAZARD.Recon)
+        assert res["t"][k] == pytest.approx(ref["t"], rel=1e-9)
@@ -0,0 +1,39 @@
+import random
+
+from wgc import calc
+from wgc.game import JOB, COMPOSITIONS, probability
+
+def random_inputs(rng):
+    option = list(rng.choice(COMPOSITIONS))
+    soldier_1 = rng.randint(10, 80) if option[0] == JOB.Soldier else None
+    soldier_2 = rng.randint(10, 80) if option[:2] == [JOB.Soldier, JOB.Soldier] else None
+    return [option, rng.randint(10, 80), soldier_1, soldier_2, rng.randint(10, 80),
+            rng.randrange(0, 101, 10), rng.randrange(0, 101, 10), rng.randrange(0, 101, 10),
+            rng.choice(list(probability))]
+
+def test_warm_start_gives_the_cold_answer(no_caches):
+    rng = random.Random(5)
+    for _ in range(20):
+        args = random_inputs(rng)
+        moved = list(args)
+        i = rng.choice([1, 4, 5, 6, 7] + [i for i in (2, 3) if args[i] is not None])
+        moved[i] += rng.choice([-1, 1]) * (10 if i >= 5 else 1)
+        moved[i] = max(moved[i], 0 if i >= 5 else 1)
+        calc.calculate(*args)
+        calc.reset_caches(keep_warm=True)
+        warm = calc.calculate(*moved)
+        calc.reset_caches()
+        assert calc.calculate(*moved) == warm
+
+def test_answers_come_back_from_memory_and_disk(no_caches, tmp_path):
+    args = [[JOB.Soldier, JOB.Nat_Scientist, JOB.Soc_Scientist], 30, 25, None, 20, 10, 0, 20, "80%"]
+    assert calc.cached(*args) is None
+    calc.use_disk_cache(str(tmp_path / "answers.sqlite"))
+    res = calc.calculate(*args)
+    assert calc.cached(*args) == res
+    calc.reset_caches()
+    assert calc.cached(*args) == res
+    assert calc.cache_stats()["disk"]["hits"] == 1
+    calc.use_disk_cache(None)
+    calc.reset_caches()
+    assert calc.cached(*args) is None
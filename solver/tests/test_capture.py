@@ -0,0 +1,47 @@
+import logging
+import os
+
+import pytest
+
+from wgc import capture, native
+from wgc.game import JOB, HAZARD
+from wgc.team import legacy_team
+
+TEAM = legacy_team(1.2, 1.1, 1.0, 40, [30], 30, 1, 4, [JOB.Soldier, JOB.Nat_Scientist, JOB.Soc_Scientist],
+                   HAZARD.Neutral)
+
+@pytest.fixture
+def capturing(monkeypatch):
+    # Every solve kept, in a folder the test picks
+    def start(folder):
+        monkeypatch.setattr(capture, "enabled", True)
+        monkeypatch.setattr(capture, "folder", str(folder))
+        monkeypatch.setattr(capture, "THRESHOLD", 0.0)
+    return start
+
+def test_solve_is_kept_and_loads_back(capturing, tmp_path):
+    capturing(tmp_path)
+    res = native.solve_team(TEAM)
+    (entry,) = capture.entries(str(tmp_path))
+    inputs, args = capture.load(entry)
+    assert inputs["backend"] == "native" and inputs["call"] == "solve_team"
+    assert native.solve_team(**args)["t"] == res["t"]
+
+def test_ring_keeps_the_newest(capturing, tmp_path, monkeypatch):
+    capturing(tmp_path)
+    monkeypatch.setattr(capture, "MAX_ENTRIES", 2)
+    for _ in range(4):
+        native.solve_team(TEAM)
+    kept = capture.entries(str(tmp_path))
+    assert [int(os.path.basename(path).split("-")[0]) for path in kept] == [3, 4]
+
+def test_failed_capture_does_not_fail_the_solve(capturing, tmp_path, caplog):
+    # A file where the captures folder should be: every write fails
+    blocked = tmp_path / "captures"
+    blocked.write_text("")
+    capturing(blocked)
+    with caplog.at_level(logging.WARNING, logger="wgc.capture"):
+        res = native.solve_team(TEAM)
+    assert res["t"] == min(res["z"].values())
+    assert "could not capture" in caplog.text
+    assert capture.save("native", "solve_team", TEAM, 2.0, "Optimal") is None
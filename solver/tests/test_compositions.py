@@ -0,0 +1,30 @@
+import pytest
+
+from wgc import calc
+from wgc.game import COMPOSITIONS
+
+def cold(*args):
+    calc.reset_caches()
+    return calc.calculate(*args)
+
+@pytest.mark.parametrize("inputs", [(40, 30, 20, 10, 0, "90%"), (12, 15, 0, 0, 0, "100%"), (80, 60, 50, 0, 30, "70%")])
+def test_ranking_matches_cold_solves(no_caches, inputs):
+    leader, member, shoot, obst, lib, success = inputs
+    options = [list(option) for option in COMPOSITIONS]
+    answers = [cold(option, leader, member, member, member, shoot, obst, lib, success) for option in options]
+    # Best first, ties in the order of COMPOSITIONS
+    order = sorted(range(len(options)), key=lambda c: (-answers[c]["t"], c))
+
+    calc.reset_caches()
+    ranked = calc.rank_compositions(*inputs)
+    assert [res["option"] for res in ranked] == [options[c] for c in order]
+    for res, c in zip(ranked, order):
+        assert (res["t"], res["max_level"], res["hazard"]) == \
+               (answers[c]["t"], answers[c]["max_level"], answers[c]["hazard"])
+
+    # With top the other compositions only have to beat the top-th answer,
+    # those that cannot are dropped without a full search
+    for top in (1, 3, len(options)):
+        calc.reset_caches()
+        best = calc.rank_compositions(*inputs, top=top)
+        assert [(res["option"], res["t"]) for res in best] == [(res["option"], res["t"]) for res in ranked[:top]]
@@ -0,0 +1,24 @@
+import pytest
+
+from wgc.dice import success_rolls, chance_at_least, INDIV, GROUP
+from wgc.game import probability
+
+# The table the app started with, picked by hand
+ORIGINAL = {"100%": [1, 4], "90%": [3, 27], "80%": [5, 32], "70%": [7, 36], "60%": [9, 39], "50%": [11, 42]}
+
+def test_dropdown_is_the_original_table():
+    assert probability == ORIGINAL
+    for success, rolls in ORIGINAL.items():
+        assert success_rolls(success) == rolls
+
+def test_offsets_clear_their_chance():
+    for success in ["99.5%", "72.5", 64, "51%"]:
+        p = float(str(success).rstrip("%")) / 100
+        ri, rg = success_rolls(success)
+        assert chance_at_least(ri, *INDIV) >= p > chance_at_least(ri + 1, *INDIV)
+        assert chance_at_least(rg, *GROUP) >= p > chance_at_least(rg + 1, *GROUP)
+
+@pytest.mark.parametrize("success", ["nan%", "inf", "-inf", "abc", "", "0%", "-5%", "100.5%", "1e400"])
+def test_bad_chances_raise(success):
+    with pytest.raises(ValueError):
+        success_rolls(success)
@@ -0,0 +1,17 @@
+import pytest
+
+from wgc import calc
+from wgc.game import JOB, probability
+
+@pytest.mark.parametrize("inputs", [
+    ([JOB.Soldier, JOB.Nat_Scientist, JOB.Soc_Scientist], 40, 35, None, 30, 20, 10, 0),
+    ([JOB.Soldier, JOB.Soldier, JOB.Soc_Scientist], 60, 45, 50, 40, 0, 0, 30),
+    ([JOB.Nat_Scientist, JOB.Soc_Scientist, JOB.Soc_Scientist], 8, None, None, 5, 0, 0, 0)
+])
+def test_every_chance_matches_a_cold_solve(no_caches, inputs):
+    answers = calc.frontier(*inputs)
+    assert list(answers) == list(probability)
+    for success, res in answers.items():
+        calc.reset_caches()
+        ref = calc.calculate(*inputs, success)
+        assert (res["t"], res["max_level"], res["hazard"]) == (ref["t"], ref["max_level"], ref["hazard"])
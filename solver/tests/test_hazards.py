@@ -0,0 +1,24 @@
+import pytest
+
+from wgc import native, backends
+from wgc.game import JOB, HAZARD
+from wgc.team import legacy_team, best_hazard, TIE
+
+def test_ties_go_to_the_earliest():
+    assert best_hazard([1.0, 2.0, 2.0]) == 1
+    assert best_hazard([2.0 - TIE, 2.0, 1.0]) == 0
+    assert best_hazard([2.0 - 3 * TIE, 2.0, 1.0]) == 1
+    assert best_hazard([-5.0, -5.0 + 2 * TIE, -6.0]) == 0
+
+@pytest.mark.parametrize("name", ["highs", "cbc"])
+def test_backends_pick_the_same_hazard(name):
+    if not backends.available(name):
+        pytest.skip(f"{name} is not installed")
+    module = backends.get(name)
+    for skills, options in [((40, [30], 30), [JOB.Soldier, JOB.Nat_Scientist, JOB.Soc_Scientist]),
+                            ((20, [], 50), [JOB.Nat_Scientist, JOB.Soc_Scientist, JOB.Nat_Scientist]),
+                            ((60, [25, 25], 10), [JOB.Soldier, JOB.Soldier, JOB.Nat_Scientist])]:
+        team = legacy_team(1.3, 1.1, 1.0, *skills, 1, 4, options, HAZARD.Neutral)
+        ours, theirs = native.solve_team_all_hazards(team), module.solve_team_all_hazards(team)
+        assert theirs["hazard"] == ours["hazard"]
+        assert theirs["t"] == pytest.approx(ours["t"], rel=TIE)
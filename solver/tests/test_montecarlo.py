@@ -0,0 +1,29 @@
+from wgc import montecarlo, native
+from wgc.game import JOB, probability
+
+OPTIONS = [JOB.Soldier, JOB.Nat_Scientist, JOB.Soc_Scientist]
+
+def close(rate):
+    # Within five standard errors of the exact chance: 95% intervals of seven
+    # checks miss now and then
+    exact, trials = rate["exact"], 200_000
+    return abs(rate["rate"] - exact) <= 5 * (exact * (1 - exact) / trials) ** 0.5
+
+def test_answer_clears_its_success_chance():
+    inputs = (1.2, 1.1, 1.0, 60, [45], 40)
+    for success in ["90%", "70%"]:
+        res = native.solve_maxmin_all_hazards(*inputs, *probability[success], options=OPTIONS)
+        out = montecarlo.simulate(res, *inputs, OPTIONS, trials=200_000, seed=1)
+        p = int(success[:-1]) / 100
+        for check in out["checks"].values():
+            assert check["exact"] >= p - 1e-9
+            assert close(check)
+        assert close(out["all"])
+
+def test_seeded_runs_repeat():
+    res = native.solve_maxmin_all_hazards(1.0, 1.0, 1.0, 30, [], 30, 1, 4,
+                                          options=[JOB.Nat_Scientist, JOB.Soc_Scientist, JOB.Soc_Scientist])
+    args = (res, 1.0, 1.0, 1.0, 30, [], 30, [JOB.Nat_Scientist, JOB.Soc_Scientist, JOB.Soc_Scientist])
+    first = montecarlo.simulate(*args, trials=50_000, seed=3)
+    again = montecarlo.simulate(*args, trials=50_000, seed=3)
+    assert first["all"] == again["all"] and first["checks"] == again["checks"]
@@ -0,0 +1,27 @@
+import pytest
+
+from wgc import native
+from wgc.game import JOB, HAZARD
+from wgc.team import legacy_team
+
+# Run from the solver folder: python -m pytest
+
+OPTIONS = [JOB.Soldier, JOB.Nat_Scientist, JOB.Soc_Scientist]
+
+def team(skill_leader, skill_soldiers, skill_other, hazard=HAZARD.Neutral):
+    return legacy_team(1.0, 1.0, 1.0, skill_leader, skill_soldiers, skill_other, 1, 4, OPTIONS, hazard)
+
+@pytest.mark.parametrize("skills", [
+    (30, [1], 20), # a soldier below its lower bounds (1, 1, 0)
+    (2, [20], 20), # the leader below (1, 1, 1)
+    (30, [], 1)    # the others below (1, 1, 2)
+])
+def test_infeasible_team_raises(skills):
+    with pytest.raises(RuntimeError, match="infeasible"):
+        native.solve_team(team(*skills))
+    with pytest.raises(RuntimeError, match="infeasible"):
+        native.solve_team_all_hazards(team(*skills))
+
+def test_smallest_team_solves():
+    res = native.solve_team(team(8, [7], 7))
+    assert res["t"] == min(res["z"].values())
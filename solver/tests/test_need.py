@@ -0,0 +1,54 @@
+import pytest
+
+from wgc import calc
+from wgc.game import JOB
+
+LIMIT = 150
+
+def max_level(args, field, value):
+    # A cold calculate with one field moved
+    args = list(args)
+    args[calc.LEVEL_FIELDS[field][0]] = value
+    calc.reset_caches()
+    return calc.calculate(*args)["max_level"]
+
+def check(args, target):
+    # Every field's answer reaches target and the value below it does not;
+    # None means not even LIMIT does
+    found = calc.minimum_levels(target, *args, limit=LIMIT)
+    assert set(found) == {field for field, (i, _, _) in calc.LEVEL_FIELDS.items() if args[i] is not None}
+    for field, level in found.items():
+        lowest = calc.LEVEL_FIELDS[field][1]
+        if level is None:
+            assert max_level(args, field, LIMIT) < target
+            continue
+        assert max_level(args, field, level) >= target
+        if level > lowest:
+            assert max_level(args, field, level - 1) < target
+    return found
+
+@pytest.mark.parametrize("args", [
+    ([JOB.Soldier, JOB.Soldier, JOB.Nat_Scientist], 30, 25, 20, 20, 10, 0, 0, "90%"),
+    ([JOB.Soldier, JOB.Nat_Scientist, JOB.Soc_Scientist], 50, 40, None, 35, 0, 20, 10, "70%")
+])
+def test_every_field_is_the_lowest(no_caches, args):
+    now = calc.calculate(*args)["max_level"]
+    for target in (now - 2, now, now + 3):
+        check(args, target)
+
+def test_negative_target(no_caches):
+    # max_level rounds towards 0: -4 takes t above -5, not above -4
+    args = ([JOB.Nat_Scientist, JOB.Soc_Scientist, JOB.Soc_Scientist], 1, None, None, 1, 0, 0, 0, "100%")
+    assert calc.calculate(*args)["max_level"] < -4
+    found = check(args, -4)
+    assert found["leader"] is not None and found["others"] is not None
+
+def test_out_of_reach(no_caches):
+    args = ([JOB.Soldier, JOB.Nat_Scientist, JOB.Soc_Scientist], 3, 1, None, 1, 0, 0, 0, "50%")
+    found = check(args, 5)
+    assert found["shoot"] is None and found["soldier_1"] is None
+    assert calc.minimum_level("leader", 1000, *args, limit=LIMIT) is None
+
+def test_field_not_in_team():
+    with pytest.raises(ValueError, match="not part of this team"):
+        calc.minimum_level("soldier_1", 10, [JOB.Nat_Scientist] * 3, 10, None, None, 10, 0, 0, 0, "90%")
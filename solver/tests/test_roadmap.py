@@ -0,0 +1,20 @@
+import pytest
+
+from wgc import calc
+from wgc.game import JOB
+
+@pytest.mark.parametrize("team", [
+    ([JOB.Soldier, JOB.Nat_Scientist, JOB.Soc_Scientist], 20, 18, None, 15),
+    ([JOB.Soldier, JOB.Soldier, JOB.Nat_Scientist], 5, 3, 4, 1)
+])
+def test_rows_match_cold_solves(no_caches, team):
+    option, *levels = team
+    rows = calc.roadmap(option, *levels, 10, 0, 20, "90%", levels[0] + 12)
+    assert [row["levels"][0] for row in rows] == list(range(levels[0], levels[0] + 13))
+    for row in rows[::4]:
+        calc.reset_caches()
+        ref = calc.calculate(option, *row["levels"], 10, 0, 20, "90%")
+        assert (row["t"], row["max_level"], row["hazard"]) == (ref["t"], ref["max_level"], ref["hazard"])
+
+def test_past_the_target_is_empty(no_caches):
+    assert calc.roadmap([JOB.Soldier, JOB.Nat_Scientist, JOB.Soc_Scientist], 30, 20, None, 20, 0, 0, 0, "90%", 29) == []
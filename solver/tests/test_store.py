@@ -0,0 +1,24 @@
+from wgc.store import DiskCache
+
+def test_least_recently_used_go_first(tmp_path):
+    cache = DiskCache(str(tmp_path / "answers.sqlite"), max_entries=10)
+    for k in range(10):
+        cache.put(f"k{k}", {"t": k})
+    assert cache.get("k0") == {"t": 0} # k0 is now the newest
+    cache.put("k10", {"t": 10})
+    # A tenth of the entries went, the oldest one used
+    assert cache.stats()["entries"] == 9
+    assert cache.get("k1") is None
+    assert cache.get("k0") == {"t": 0} and cache.get("k10") == {"t": 10}
+    cache.close()
+
+def test_answers_outlive_the_session(tmp_path):
+    path = str(tmp_path / "answers.sqlite")
+    cache = DiskCache(path)
+    cache.put("key", {"t": 1.5, "hazard": "Recon"})
+    cache.put("key", {"t": 2.5, "hazard": "Recon"})
+    cache.close()
+    cache = DiskCache(path)
+    assert cache.get("key") == {"t": 2.5, "hazard": "Recon"}
+    assert cache.stats() == {"hits": 1, "misses": 0, "entries": 1}
+    cache.close()
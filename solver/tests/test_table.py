@@ -0,0 +1,30 @@
+import itertools
+
+from wgc import calc, table
+from wgc.game import JOB, HAZARD
+
+OPTION = [JOB.Soldier, JOB.Nat_Scientist, JOB.Soc_Scientist]
+
+def test_lookups_give_the_solved_answers(no_caches, tmp_path):
+    # A small grid built like build_table.py does
+    axes = {"option": [[job.name for job in OPTION]], "leader_lvl": [10, 12], "member_lvl": [8, 9],
+            "shoot": [0, 20], "obst": [0], "lib": [10], "success": ["100%", "70%"]}
+    answers = [calc.calculate(OPTION, leader, member, member, member, shoot, obst, lib, success)
+               for _, leader, member, shoot, obst, lib, success in itertools.product(*axes.values())]
+    hazards = [h.name for h in HAZARD]
+    values = {"t": [res["t"] for res in answers], "max_level": [res["max_level"] for res in answers],
+              "hazard": [hazards.index(res["hazard"].name) for res in answers]}
+    for row in table.ROWS:
+        values[row] = [x for res in answers for x in res[row]]
+    path = str(tmp_path / "answers.tbl")
+    table.write_table(path, calc.SOLVER_VERSION, axes, hazards, values)
+
+    answers_table = table.AnswerTable(path)
+    assert answers_table.lookup(OPTION, 12, 9, None, 9, 20, 0, 10, "70%") == answers[-1]
+    assert answers_table.lookup(OPTION, 12, 9, None, 9, 30, 0, 10, "70%") is None # off the grid
+    assert answers_table.lookup(OPTION, 12, 8, None, 9, 20, 0, 10, "70%") is None # soldier at another level
+    answers_table.close()
+
+    calc.use_answer_table(path)
+    calc.reset_caches()
+    assert calc.cached(OPTION, 10, 8, None, 8, 0, 0, 10, "100%") == answers[0]
@@ -0,0 +1,45 @@
+import json
+
+import pytest
+
+from wgc import trace, native
+from wgc.game import JOB, HAZARD
+from wgc.team import legacy_team
+
+@pytest.fixture
+def tracing(monkeypatch):
+    monkeypatch.setattr(trace, "enabled", True)
+    monkeypatch.setattr(trace, "_path", None)
+    trace.clear()
+    yield
+    trace.clear()
+
+def test_nothing_is_recorded_while_off(monkeypatch):
+    monkeypatch.setattr(trace, "enabled", False)
+    trace.clear()
+    with trace.phase("calc/lookup") as info:
+        info["source"] = "memory"
+    assert trace.recent() == []
+
+def test_phases_are_recorded_per_request(tracing):
+    with trace.request("click 1"):
+        with trace.phase("calc/lookup", hazard="Recon") as info:
+            info["source"] = "disk"
+    with pytest.raises(KeyError):
+        with trace.phase("gui/parse"):
+            raise KeyError("leader")
+    lookup, parse = trace.recent()
+    assert lookup["phase"] == "calc/lookup" and lookup["request"] == "click 1"
+    assert lookup["source"] == "disk" and lookup["hazard"] == "Recon"
+    assert parse["error"] == "KeyError" and parse["request"] is None
+    assert trace.summary()["calc/lookup"]["count"] == 1
+
+def test_solves_are_traced_and_exported(tracing, tmp_path):
+    native.solve_team_all_hazards(legacy_team(1.2, 1.1, 1.0, 40, [30], 30, 1, 4,
+                                                 [JOB.Soldier, JOB.Nat_Scientist, JOB.Soc_Scientist], HAZARD.Neutral))
+    (event,) = [e for e in trace.recent() if e["phase"] == "native/search"]
+    assert event["status"] == "Optimal" and event["variants"] == len(HAZARD)
+    path = tmp_path / "trace.jsonl"
+    trace.export(str(path))
+    assert [json.loads(line)["phase"] for line in path.read_text().splitlines()] == \
+           [e["phase"] for e in trace.recent()]
@@ -0,0 +1,13 @@
+import importlib
+
+from .game import JOB, HAZARD, COMPOSITIONS, probability, success_rolls, convert_to_skill_point
+from .calc import calculate, rank_compositions, frontier, roadmap
+
+# The backends pull in numpy (and scipy for highs, pulp for cbc), so they are
+# only imported the first time wgc.native, wgc.cbc, ... is used
+BACKENDS = ("native", "highs", "cbc", "backends", "batch", "team")
+
+def __getattr__(name):
+    if name in BACKENDS:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,132 @@
+import importlib
+import os
+import threading
+import time
+
+from .game import JOB, HAZARD
+from .team import legacy_team, legacy_result, model_size
+from . import trace
+
+# The solvers behind calc, all answering the same question exactly:
+#   native: the in-process search of native.py (warm starts, progress)
+#   highs:  the MILP of cbc.py solved by HiGHS through scipy, in-process
+#   cbc:    the MILP through pulp, one CBC process per solve
+# Each module has solve_team_all_hazards(team, hazards, progress), returning
+# the result dict of team.py plus the winning "hazard".
+#
+# backend=None (or "auto") picks one per team: native while its leader splits
+# stay cheap, HiGHS past that (native's exact checks grow with the square of
+# the leader's points, the MILP barely moves). Solve times are measured per
+# backend and team size (powers of two of the leader splits): once both have
+# been timed at a size the faster one wins there, native keeps the smaller
+# sizes it won at and loses the bigger ones it lost at. In between a solve
+# slower than EXPLORE_SECONDS gets the other backend tried once.
+# CBC is never picked on its own, starting a process per solve costs more than
+# either of the others takes. WGC_BACKEND sets the default for the session.
+
+MODULES = {"native": ".native", "highs": ".highs", "cbc": ".cbc"}
+AUTO = ["native", "highs"]
+NATIVE_SPLITS = 150_000 # leader splits above which HiGHS is tried first
+EXPLORE_SECONDS = 0.25 # a solve this slow gets the other backend tried
+_available = {}
+_latency = {} # (backend, size bucket) -> seconds, moving average
+_lock = threading.Lock()
+
+def get(name):
+    return importlib.import_module(MODULES[name], __package__)
+
+def available(name):
+    # Whether the backend can run here: scipy or pulp installed (and the CBC
+    # binary found), which a frozen app may leave out
+    if name not in _available:
+        try:
+            module = get(name)
+            _available[name] = name != "cbc" or module.pulp.PULP_CBC_CMD(msg=False).available()
+        except ImportError:
+            _available[name] = False
+    return _available[name]
+
+def _bucket(team):
+    return model_size(team)["leader_splits"].bit_length()
+
+def choose(team):
+    # The backend for this team when none is asked for. Only a backend that
+    # gets picked is imported (scipy takes a while), native is always there.
+    bucket = _bucket(team)
+    with _lock:
+        seen = dict(_latency)
+    here = {name: seen[name, bucket] for name in AUTO if (name, bucket) in seen}
+    if len(here) == len(AUTO):
+        name = min(here, key=here.get)
+    else:
+        # Native only gets slower with size: it wins below any size it won at
+        # and loses above any size it lost at
+        both = [b for b in {b for _, b in seen} if all((name, b) in seen for name in AUTO)]
+        won = [b for b in both if seen["native", b] <= min(seen[name, b] for name in AUTO)]
+        lost = [b for b in both if b not in won]
+        if won and bucket <= max(won):
+            name = "native"
+        elif lost and bucket >= min(lost):
+            name = min(AUTO, key=lambda name: seen[name, min(lost)])
+        else:
+            name = "native" if model_size(team)["leader_splits"] <= NATIVE_SPLITS else "highs"
+            if here.get(name, 0) > EXPLORE_SECONDS:
+                name = next(other for other in AUTO if other not in here)
+    return name if available(name) else "native"
+
+def _resolve(team, backend):
+    backend = backend or os.environ.get("WGC_BACKEND") or "auto"
+    if backend == "auto":
+        return choose(team)
+    if backend not in MODULES:
+        raise ValueError(f"unknown backend {backend!r}, pick from auto, {', '.join(MODULES)}")
+    return backend
+
+def _record(name, team, seconds):
+    key = name, _bucket(team)
+    with _lock:
+        _latency[key] = seconds if key not in _latency else 0.7 * _latency[key] + 0.3 * seconds
+
+def latency():
+    # Measured seconds per solve: backend -> {size bucket: seconds}
+    with _lock:
+        out = {}
+        for (name, bucket), seconds in _latency.items():
+            out.setdefault(name, {})[bucket] = seconds
+        return out
+
+def solve_maxmin_all_hazards(obst_lvl,
+                             shoot_lvl,
+                             lib_lvl,
+                             skill_leader,
+                             skill_soldiers,
+                             skill_other,
+                             roll_indiv = 1,
+                             roll_group = 4,
+                             options = [JOB.Soldier, JOB.Nat_Scientist, JOB.Soc_Scientist],
+                             get_integer_results = False,
+                             progress = None,
+                             warm = None,
+                             backend = None):
+    # native.solve_maxmin_all_hazards on the backend asked for (a key of
+    # MODULES, or "auto"); the result also says which one under "backend".
+    # Only native uses warm.
+    team = legacy_team(obst_lvl, shoot_lvl, lib_lvl, skill_leader, skill_soldiers, skill_other,
+                       roll_indiv, roll_group, options, HAZARD.Neutral)
+    name = _resolve(team, backend)
+    module = get(name) # imports are not solve time
+    start = time.perf_counter()
+    if name == "native":
+        out = module.solve_maxmin_all_hazards(obst_lvl, shoot_lvl, lib_lvl, skill_leader, skill_soldiers,
+                                                 skill_other, roll_indiv, roll_group, options,
+                                                 get_integer_results=get_integer_results,
+                                                 progress=progress, warm=warm)
+    else:
+        res = module.solve_team_all_hazards(team, progress=progress)
+        out = legacy_result(res, len(skill_soldiers), get_integer_results)
+    seconds = time.perf_counter() - start
+    _record(name, team, seconds)
+    if trace.enabled:
+        trace.record("solve", seconds, backend=name, hazard=out["hazard"].name)
+    out["backend"] = name
+    return out
@@ -0,0 +1,213 @@
+import numpy as np
+
+from .game import JOB, HAZARD
+from .team import LEADER_LB, legacy_team, z_values, tie_floor
+from .native import EPS, _ceil, _splits, _thresholds, _candidates, _pool_state, _min_need, _relaxed_need
+
+# Many queries in one call, for sweeps. Queries with the same team (skill
+# points and jobs) only differ in facility levels, rolls and hazard approach,
+# so they share the leader lattice and bisect in lockstep: every step checks
+# one candidate per query against every leader split in a single array pass.
+#
+# Rows are first checked with the fractional relaxation. Rounding its answer
+# costs at most _rounding_slack() extra soldier points, so rows with that much
+# room are feasible as is and only the rows in between need the exact greedy.
+
+MAX_ROWS = 200_000 # leader splits x queries per array pass
+
+def _rounding_slack(w_U, w_V):
+    # Rounding U down per stat leaves < w_U uncovered, one more V point each
+    return float(np.sum(w_U / w_V + 1))
+
+def _take(q, idx):
+    return {k: v[idx] for k, v in q.items()}
+
+def _as_team(team, q):
+    # Team dict whose levels, rolls and haz_mod are per-query arrays
+    return {**team, **{k: v for k, v in q.items() if k != "haz_mod"}, "haz_mod": tuple(q["haz_mod"].T)}
+
+def _query_team(team, q, k):
+    return {**team, **{key: v[k] for key, v in q.items() if key != "haz_mod"}, "haz_mod": list(q["haz_mod"][k])}
+
+def _lower_bound(team, q):
+    # Same even split as native._lower_bound, scored for every query at once
+    def even(budget, lb):
+        free = budget - sum(lb)
+        return [lb[g] + free // 3 + (g < free % 3) for g in range(3)]
+    leader = even(team["skill_leader"], LEADER_LB)
+    pools = [np.array([even(m["budget"], p["lb"]) for m in p["members"]], dtype=float).reshape(-1, 3)
+             for p in team["pools"]]
+    return np.min(np.stack(list(z_values(_as_team(team, q), leader, pools).values())), axis=0)
+
+def _upper_bound(team, q):
+    leader = team["skill_leader"]
+    group = np.full(3, float(leader))
+    for pool in team["pools"]:
+        for member in pool["members"]:
+            group += pool["w"] * member["budget"]
+    mods = q["haz_mod"][:, [1, 3, 2]]
+    lvls = np.stack([q["shoot_lvl"], q["obst_lvl"], q["lib_lvl"]], axis=1)
+    group_t = (lvls * group + q["roll_group"][:, None] - 40 * mods) / (4 * mods)
+    power_t = (leader * q["shoot_lvl"] + q["roll_indiv"] - 10) / 1.5
+    return np.minimum(group_t.min(axis=1), power_t)
+
+def _feasible(team, q, t, l, chunk=256):
+    # native._first_row for a batch of queries, without picking the row
+    th = _thresholds(_as_team(team, q), t)
+    keep = l[None, :, 0] >= th["pow"][:, None] - EPS
+    if team["leader_nat"] or team["leader_soc"]:
+        keep &= l[None, :, 2] >= th["lead_wit"][:, None] - EPS
+    qi, li = np.nonzero(keep)
+    l = l[li]
+    n = len(qi)
+
+    pow_min = _ceil(th["pow"][qi] - 0.5 * l[:, 0])
+    ath_min = _ceil(th["ath"][qi] - 0.5 * l[:, 1])
+    nat_min = _ceil(th["nat"][qi] - 0.5 * l[:, 2])
+    soc_min = _ceil(th["soc"][qi] - 0.5 * l[:, 2])
+
+    U, V = team["pools"]
+    M_U, E_U, ok_U, top_U = _pool_state(U, n, pow_min, nat_min, soc_min)
+    M_V, E_V, ok_V, top_V = _pool_state(V, n, pow_min, nat_min, soc_min)
+    base = ok_U & ok_V
+    raise_U = np.maximum(0, ath_min - U["lb"][1])
+    raise_V = np.maximum(0, ath_min - V["lb"][1])
+    B0 = th["sum"].T[qi] - l - U["w"] * M_U - V["w"] * M_V
+
+    carriers = [
+        (base & (l[:, 1] >= th["ath"][qi] - EPS), 0, 0),
+        (base & (top_U >= raise_U), raise_U, 0),
+        (base & (top_V >= raise_V), 0, raise_V)
+    ]
+    w_V = V["w"] if V["members"] else np.ones(3)
+    accept = _rounding_slack(U["w"], w_V) + EPS
+    ok = np.zeros(len(t), dtype=bool)
+    rows, B, E_U_rows, E_V_rows, slack = [], [], [], [], []
+    for valid, r_U, r_V in carriers:
+        r_U = np.broadcast_to(r_U, (n,))[valid]
+        r_V = np.broadcast_to(r_V, (n,))[valid]
+        B_c = B0[valid]
+        B_c[:, 1] -= U["w"][1] * r_U + V["w"][1] * r_V
+        E_U_c = E_U[valid] - r_U
+        E_V_c = E_V[valid] - r_V
+        slack_c = E_V_c - _relaxed_need(B_c, E_U_c, U["w"], w_V)
+        ok[qi[valid][slack_c >= accept]] = True
+        # Rows the relaxation cannot decide
+        keep = (slack_c >= -EPS) & (slack_c < accept)
+        rows.append(qi[valid][keep])
+        B.append(B_c[keep])
+        E_U_rows.append(E_U_c[keep])
+        E_V_rows.append(E_V_c[keep])
+        slack.append(slack_c[keep])
+    rows = np.concatenate(rows)
+    B = np.concatenate(B)
+    E_U = np.concatenate(E_U_rows)
+    E_V = np.concatenate(E_V_rows)
+    slack = np.concatenate(slack)
+
+    # Exact greedy only where the relaxation cannot decide, most promising rows
+    # of every query first and stopping once a query has a feasible one
+    unsure = np.nonzero(~ok[rows])[0]
+    unsure = unsure[np.lexsort((-slack[unsure], rows[unsure]))]
+    first = np.searchsorted(rows[unsure], rows[unsure])
+    rank = np.arange(len(unsure)) - first
+    for start in range(0, len(unsure), chunk):
+        pick = unsure[(rank >= start) & (rank < start + chunk)]
+        pick = pick[~ok[rows[pick]]]
+        if not len(pick):
+            break
+        need = _min_need(B[pick], E_U[pick], U["w"], w_V)
+        ok[rows[pick][need <= E_V[pick] + EPS]] = True
+    return ok
+
+def _solve_shared(team, q):
+    # Optimum t of queries sharing one team, see native._search
+    lo = _lower_bound(team, q)
+    hi = _upper_bound(team, q)
+    cands = [_candidates(_query_team(team, q, k), lo[k], hi[k]) for k in range(len(lo))]
+    size = max(len(c) for c in cands)
+    padded = np.full((len(cands), size), np.inf)
+    for k, c in enumerate(cands):
+        padded[k, :len(c)] = c
+
+    l = _splits(team["skill_leader"], LEADER_LB)
+    chunk = max(1, MAX_ROWS // max(1, len(l)))
+    i = np.zeros(len(cands), dtype=int)
+    j = np.array([len(c) for c in cands])
+    while True:
+        active = np.nonzero(j - i > 1)[0]
+        if not len(active):
+            break
+        for start in range(0, len(active), chunk):
+            idx = active[start:start + chunk]
+            mid = (i[idx] + j[idx]) // 2
+            ok = _feasible(team, _take(q, idx), padded[idx, mid], l)
+            i[idx[ok]] = mid[ok]
+            j[idx[~ok]] = mid[~ok]
+    return padded[np.arange(len(cands)), i]
+
+def _as_list(x, n, single):
+    return [x] * n if single else list(x)
+
+def solve_batch(obst_lvl,
+                shoot_lvl,
+                lib_lvl,
+                skill_leader,
+                skill_soldiers,
+                skill_other,
+                roll_indiv = 1,
+                roll_group = 4,
+                options = [JOB.Soldier, JOB.Nat_Scientist, JOB.Soc_Scientist],
+                hazard_approach = HAZARD.Neutral):
+    # Same inputs as native.solve_maxmin_all_hazards, but each one is either a
+    # single value for the whole batch or one value per query (arrays for the
+    # numbers, lists for skill_soldiers, options and hazard_approach).
+    # hazard_approach=None keeps the best hazard of every query.
+    # Returns {"t": array of optima} plus "hazard" when hazards were searched.
+    numbers = [obst_lvl, shoot_lvl, lib_lvl, skill_leader, skill_other, roll_indiv, roll_group]
+    single_soldiers = len(skill_soldiers) == 0 or np.ndim(skill_soldiers[0]) == 0
+    single_options = isinstance(options[0], JOB)
+    single_hazard = hazard_approach is None or isinstance(hazard_approach, HAZARD)
+    n = max([np.size(x) for x in numbers]
+            + [1 if single_soldiers else len(skill_soldiers)]
+            + [1 if single_options else len(options)]
+            + [1 if single_hazard else len(hazard_approach)])
+
+    obst_lvl, shoot_lvl, lib_lvl, skill_leader, skill_other, roll_indiv, roll_group = \
+        [np.broadcast_to(np.asarray(x, dtype=float), (n,)) for x in numbers]
+    skill_soldiers = _as_list(skill_soldiers, n, single_soldiers)
+    options = _as_list(options, n, single_options)
+
+    if hazard_approach is None:
+        # Every query once per hazard in the same batch, ties (see team.TIE)
+        # go to the earliest hazard like the backends do
+        hazards = list(HAZARD)
+        h = len(hazards)
+        ts = solve_batch(np.tile(obst_lvl, h), np.tile(shoot_lvl, h), np.tile(lib_lvl, h),
+                         np.tile(skill_leader, h), skill_soldiers * h, np.tile(skill_other, h),
+                         np.tile(roll_indiv, h), np.tile(roll_group, h), options * h,
+                         [haz for haz in hazards for _ in range(n)])["t"].reshape(h, n)
+        best = np.argmax(ts >= tie_floor(ts.max(axis=0)), axis=0)
+        return {"t": ts[best, np.arange(n)], "hazard": [hazards[k] for k in best]}
+    hazards = _as_list(hazard_approach, n, single_hazard)
+
+    # Queries sharing skill points and jobs share a team
+    groups = {}
+    for k in range(n):
+        key = (int(skill_leader[k]), tuple(int(s) for s in skill_soldiers[k]), int(skill_other[k]), tuple(options[k]))
+        groups.setdefault(key, []).append(k)
+
+    t = np.empty(n)
+    for (leader, soldiers, other, option), idx in groups.items():
+        team = legacy_team(1, 1, 1, leader, list(soldiers), other, 1, 4, list(option), HAZARD.Neutral)
+        idx = np.array(idx)
+        q = {
+            "obst_lvl": obst_lvl[idx],
+            "shoot_lvl": shoot_lvl[idx],
+            "lib_lvl": lib_lvl[idx],
+            "roll_indiv": roll_indiv[idx],
+            "roll_group": roll_group[idx],
+            "haz_mod": np.array([hazards[k]._value_ for k in idx], dtype=float)
+        }
+        t[idx] = _solve_shared(team, q)
+    return {"t": t}
@@ -0,0 +1,400 @@
+import threading
+from collections import OrderedDict
+
+from .game import JOB, HAZARD, probability, success_rolls, convert_to_skill_point, whole_level
+from . import trace
+
+# What the Calculate button does, without any window: turns the inputs of the
+# GUI into one solve and returns the points of every row. The solver backend
+# (and numpy with it) is only imported on the first call.
+#
+# Answers are kept in memory keyed on what the solver actually sees, so the same
+# team typed in again (or a soldier level that does not matter changing) costs
+# a dict lookup. Behind that sit the precomputed answer table of table.py (when
+# one was built) and the disk cache of store.py, shared between sessions.
+#
+# The last answer of every team shape (jobs and explicit soldiers) is kept as
+# well, so that nudging one input re-solves warm from it (see native._search).
+
+# Bump whenever the model or the solver can give a different answer for the
+# same inputs, so answers cached on disk by an older version are not used
+SOLVER_VERSION = 3
+
+CACHE_SIZE = 256
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+_disk = None
+_disk_opened = False
+_table = None
+_table_opened = False
+_last = {}
+_reached = OrderedDict()
+
+def answer_table():
+    # The precomputed AnswerTable, or None when there is none for this version
+    global _table, _table_opened
+    with _cache_lock:
+        if not _table_opened:
+            _table_opened = True
+            from . import table
+            try:
+                _table = table.AnswerTable(table.default_path())
+                if _table.version != SOLVER_VERSION:
+                    _table.close()
+                    _table = None
+            except (OSError, ValueError):
+                _table = None
+        return _table
+
+def disk_cache():
+    # The DiskCache of this session, or None when it is off or cannot be opened
+    global _disk, _disk_opened
+    with _cache_lock:
+        if not _disk_opened:
+            _disk_opened = True
+            from . import store
+            path = store.default_path()
+            try:
+                _disk = store.DiskCache(path) if path else None
+            except Exception:
+                _disk = None
+        return _disk
+
+def use_disk_cache(path):
+    # The disk cache at path from now on instead of the default one (None for
+    # no disk cache), e.g. to time lookups on a file of their own
+    global _disk, _disk_opened
+    from . import store
+    with _cache_lock:
+        if _disk is not None:
+            _disk.close()
+        _disk = store.DiskCache(path) if path else None
+        _disk_opened = True
+
+def use_answer_table(path):
+    # Same for the answer table: the one at path, or None to solve everything
+    global _table, _table_opened
+    from . import table
+    with _cache_lock:
+        if _table is not None:
+            _table.close()
+        _table = table.AnswerTable(path) if path else None
+        _table_opened = True
+
+def reset_caches(keep_warm=False):
+    # Forgets every answer held in memory, and the last answers the next solves
+    # warm-start from unless keep_warm: the next calculate solves again. The
+    # disk cache and the answer table stay, see the two above.
+    with _cache_lock:
+        _cache.clear()
+        _reached.clear()
+        if not keep_warm:
+            _last.clear()
+
+def cache_stats():
+    disk = disk_cache()
+    return {"memory": {**_stats, "entries": len(_cache)}, "disk": disk.stats() if disk else None}
+
+def solve_key(option, leader_lvl, soldier_1_lvl, soldier_2_lvl, others_lvl, shoot, obst, lib, success):
+    # Canonical form of the inputs: jobs, skill points, facility multipliers and
+    # the roll pair; the soldier levels only when those slots are soldiers
+    soldierLvls = []
+    if option[0] == JOB.Soldier:
+        soldierLvls.append(convert_to_skill_point(soldier_1_lvl, False))
+    if option[0] == JOB.Soldier and option[1] == JOB.Soldier:
+        soldierLvls.append(convert_to_skill_point(soldier_2_lvl, False))
+    return (tuple(job.name for job in option),
+            convert_to_skill_point(leader_lvl, True),
+            tuple(soldierLvls),
+            convert_to_skill_point(others_lvl, False),
+            1 + obst/100,
+            1 + shoot/100,
+            1 + lib/100,
+            tuple(success_rolls(success)))
+
+def _disk_key(key):
+    # All hazards are searched, hence "all"
+    return repr((SOLVER_VERSION, "all") + key)
+
+def _lookup(key, args):
+    # The answer from memory, the answer table or the disk cache, in that
+    # order (fastest first), and which one it came from
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            _stats["hits"] += 1
+            return _cache[key], "memory"
+        _stats["misses"] += 1
+    res = answer_table().lookup(*args) if answer_table() else None
+    if res is not None:
+        _remember(key, res, disk=False)
+        return res, "table"
+    disk = disk_cache()
+    value = disk.get(_disk_key(key)) if disk else None
+    if value is None:
+        return None, None
+    res = {**value, "hazard": HAZARD[value["hazard"]]}
+    _remember(key, res, disk=False)
+    return res, "disk"
+
+def _remember(key, res, disk=True):
+    with _cache_lock:
+        _cache[key] = res
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    if disk and disk_cache():
+        with trace.phase("calc/store"):
+            disk_cache().put(_disk_key(key), {**res, "hazard": res["hazard"].name})
+
+def _shape(key):
+    return key[0], len(key[2])
+
+def _keep_last(key, res):
+    # The warm start for the next solve of this team shape
+    with _cache_lock:
+        _last[_shape(key)] = key, res
+
+def cached(*args):
+    # The answer for these inputs if it is already known, without solving
+    with trace.phase("calc/lookup") as info:
+        key = solve_key(*args)
+        res, info["source"] = _lookup(key, args)
+    if res is not None:
+        _keep_last(key, res)
+    return res
+
+def _warm(key):
+    # The last answer for this team shape, in the form of native's results
+    with _cache_lock:
+        last = _last.get(_shape(key))
+    if last is None:
+        return None
+    (_, skill_leader, soldierLvls, skill_other, obst_lvl, shoot_lvl, lib_lvl, (ri, rg)), res = last
+    return {"t": res["t"], "x1": res["leader"], "x2": res["slot1"], "x3": res["slot2"], "a": res["others"],
+            "hazard": res["hazard"],
+            "inputs": {"obst_lvl": obst_lvl, "shoot_lvl": shoot_lvl, "lib_lvl": lib_lvl,
+                       "skill_leader": skill_leader, "skill_soldiers": list(soldierLvls), "skill_other": skill_other,
+                       "roll_indiv": ri, "roll_group": rg}}
+
+def calculate(option, leader_lvl, soldier_1_lvl, soldier_2_lvl, others_lvl, shoot, obst, lib, success,
+              progress = None, backend = None):
+    # option: JOBs of slots 2-4; levels are member levels, soldier_1_lvl and
+    # soldier_2_lvl only matter when slots 2 and 3 are soldiers (None otherwise);
+    # shoot, obst and lib are the facility levels as typed in the GUI;
+    # success is a chance such as "75%" (see dice.py); progress is handed to the solver (see
+    # native._search); backend picks the solver (see backends.py), all of them
+    # give answers of the same max level
+    res = cached(option, leader_lvl, soldier_1_lvl, soldier_2_lvl, others_lvl, shoot, obst, lib, success)
+    if res is not None:
+        return res
+    key = solve_key(option, leader_lvl, soldier_1_lvl, soldier_2_lvl, others_lvl, shoot, obst, lib, success)
+
+    from . import backends
+
+    _, skill_leader, soldierLvls, skill_other, obst_lvl, shoot_lvl, lib_lvl, (ri, rg) = key
+
+    # Every hazard approach in one search, the winner comes back in "hazard"
+    res_best = backends.solve_maxmin_all_hazards(obst_lvl=obst_lvl,
+                                                 shoot_lvl=shoot_lvl,
+                                                 lib_lvl=lib_lvl,
+                                                 skill_leader=skill_leader,
+                                                 skill_soldiers=list(soldierLvls),
+                                                 skill_other=skill_other,
+                                                 roll_indiv=ri,
+                                                 roll_group=rg,
+                                                 options=option,
+                                                 get_integer_results = True,
+                                                 progress=progress,
+                                                 warm=_warm(key),
+                                                 backend=backend)
+    res = _result(res_best, len(soldierLvls))
+    _remember(key, res)
+    _keep_last(key, res)
+    return res
+
+def _result(res_best, nb_explicit):
+    # A result of native.solve_maxmin_all_hazards as rows of the GUI
+    return {
+        "leader": [int(x) for x in res_best["x1"]],
+        "slot1": [int(x) for x in (res_best["x2"] if nb_explicit >= 1 else res_best["a"])],
+        "slot2": [int(x) for x in (res_best["x3"] if nb_explicit == 2 else res_best["a"])],
+        "others": [int(x) for x in res_best["a"]],
+        "hazard": res_best["hazard"],
+        "max_level": whole_level(res_best["t"]),
+        "t": float(res_best["t"])
+    }
+
+def rank_compositions(leader_lvl, member_lvl, shoot, obst, lib, success, top = None, progress = None):
+    # Every job composition for slots 2-4 with all three members at member_lvl,
+    # best first: the answers of calculate plus the "option" they are for.
+    # Every answer also goes into the cache, so picking a composition from the
+    # list needs no solve. top and progress as in native.solve_compositions.
+    from . import native
+
+    ri, rg = success_rolls(success)
+    ranked = native.solve_compositions(obst_lvl=1 + obst/100,
+                                       shoot_lvl=1 + shoot/100,
+                                       lib_lvl=1 + lib/100,
+                                       skill_leader=convert_to_skill_point(leader_lvl, True),
+                                       skill_member=convert_to_skill_point(member_lvl, False),
+                                       roll_indiv=ri,
+                                       roll_group=rg,
+                                       top=top,
+                                       get_integer_results=True,
+                                       progress=progress)
+    out = []
+    for res_best in ranked:
+        option = res_best["option"]
+        nb_explicit = 2 if option[:2] == [JOB.Soldier, JOB.Soldier] else int(option[0] == JOB.Soldier)
+        res = _result(res_best, nb_explicit)
+        _remember(solve_key(option, leader_lvl, member_lvl, member_lvl, member_lvl, shoot, obst, lib, success), res)
+        out.append({**res, "option": option})
+    return out
+
+def frontier(option, leader_lvl, soldier_1_lvl, soldier_2_lvl, others_lvl, shoot, obst, lib, progress = None):
+    # calculate for every success chance of probability at once (arguments as
+    # in calculate, without success): success -> answer. Chances already known
+    # are not solved again, the rest go through native.solve_frontier.
+    args = (option, leader_lvl, soldier_1_lvl, soldier_2_lvl, others_lvl, shoot, obst, lib)
+    out = {success: cached(*args, success) for success in probability}
+    missing = [success for success in probability if out[success] is None]
+    if not missing:
+        return out
+
+    from . import native
+
+    _, skill_leader, soldierLvls, skill_other, obst_lvl, shoot_lvl, lib_lvl, _ = solve_key(*args, missing[0])
+    answers = native.solve_frontier(obst_lvl=obst_lvl,
+                                    shoot_lvl=shoot_lvl,
+                                    lib_lvl=lib_lvl,
+                                    skill_leader=skill_leader,
+                                    skill_soldiers=list(soldierLvls),
+                                    skill_other=skill_other,
+                                    rolls=[probability[success] for success in missing],
+                                    options=option,
+                                    get_integer_results=True,
+                                    progress=progress)
+    for success, res_best in zip(missing, answers):
+        key = solve_key(*args, success)
+        out[success] = _result(res_best, len(soldierLvls))
+        _remember(key, out[success])
+    return out
+
+def roadmap(option, leader_lvl, soldier_1_lvl, soldier_2_lvl, others_lvl, shoot, obst, lib, success, to_level,
+            progress = None):
+    # calculate for the team as it levels up: one row per leader level from
+    # leader_lvl to to_level, every member gaining a level along with the
+    # leader. Rows are the answers of calculate plus the levels they are for,
+    # solved in one pass by native.solve_roadmap and all cached.
+    from . import native
+
+    levels = []
+    for step in range(max(to_level - leader_lvl + 1, 0)):
+        levels.append((leader_lvl + step,
+                       None if soldier_1_lvl is None else soldier_1_lvl + step,
+                       None if soldier_2_lvl is None else soldier_2_lvl + step,
+                       others_lvl + step))
+    keys = [solve_key(option, *lvls, shoot, obst, lib, success) for lvls in levels]
+    if not keys:
+        return []
+    _, _, _, _, obst_lvl, shoot_lvl, lib_lvl, (ri, rg) = keys[0]
+    answers = native.solve_roadmap(obst_lvl=obst_lvl,
+                                   shoot_lvl=shoot_lvl,
+                                   lib_lvl=lib_lvl,
+                                   steps=[(key[1], list(key[2]), key[3]) for key in keys],
+                                   roll_indiv=ri,
+                                   roll_group=rg,
+                                   options=option,
+                                   get_integer_results=True,
+                                   progress=progress)
+    rows = []
+    for lvls, key, res_best in zip(levels, keys, answers):
+        res = _result(res_best, len(key[2]))
+        _remember(key, res)
+        rows.append({**res, "levels": lvls})
+    _keep_last(key, res)
+    return rows
+
+# Inputs the reverse queries can move: position in the arguments of calculate,
+# the lowest value the GUI takes and the highest one searched. Member levels
+# stop at 500, past that the leader splits of one exact check need gigabytes.
+LEVEL_FIELDS = {"leader": (1, 1, 500), "soldier_1": (2, 1, 500), "soldier_2": (3, 1, 500), "others": (4, 1, 500),
+                "shoot": (5, 0, 100_000), "obst": (6, 0, 100_000), "lib": (7, 0, 100_000)}
+
+def reaches(option, leader_lvl, soldier_1_lvl, soldier_2_lvl, others_lvl, shoot, obst, lib, success, target):
+    # Whether calculate shows a max level of at least target for these inputs,
+    # from a known answer when there is one, else from native.reaches. Those
+    # are kept as well (in memory only), so reverse queries on the same team
+    # share their checks.
+    args = (option, leader_lvl, soldier_1_lvl, soldier_2_lvl, others_lvl, shoot, obst, lib, success)
+    res = cached(*args)
+    if res is not None:
+        return res["max_level"] >= target
+    key = solve_key(*args), target
+    with _cache_lock:
+        if key in _reached:
+            _reached.move_to_end(key)
+            return _reached[key]
+    from . import native
+
+    _, skill_leader, soldierLvls, skill_other, obst_lvl, shoot_lvl, lib_lvl, (ri, rg) = key[0]
+    # max_level is whole_level(t), which rounds towards 0
+    t = target if target > 0 else target - 1 + native.EPS
+    ok = native.reaches(obst_lvl, shoot_lvl, lib_lvl, skill_leader, list(soldierLvls), skill_other, t,
+                        ri, rg, option)
+    with _cache_lock:
+        _reached[key] = ok
+        while len(_reached) > 16 * CACHE_SIZE:
+            _reached.popitem(last=False)
+    return ok
+
+def minimum_level(field, target, option, leader_lvl, soldier_1_lvl, soldier_2_lvl, others_lvl, shoot, obst, lib,
+                  success, limit = None):
+    # Lowest value of one input (a key of LEVEL_FIELDS) at which calculate
+    # shows a max level of at least target, everything else as given; None
+    # when not even limit (the highest of LEVEL_FIELDS by default) gets there. The max level only goes up with every
+    # one of them, so this gallops up from the value given (or down to the
+    # lowest) and bisects: a handful of checks, each at most one exact check
+    # per hazard.
+    position, lowest, highest = LEVEL_FIELDS[field]
+    limit = highest if limit is None else limit
+    args = [option, leader_lvl, soldier_1_lvl, soldier_2_lvl, others_lvl, shoot, obst, lib, success]
+    if args[position] is None:
+        raise ValueError(f"{field} is not part of this team")
+
+    def ok(value):
+        args[position] = value
+        return reaches(*args, target)
+
+    # Bracket: lo does not reach target (or is below the lowest), hi does
+    current = min(max(args[position], lowest), limit)
+    if ok(current):
+        lo, hi = lowest - 1, current
+    else:
+        lo, hi = current, None
+        step = max(current, 1)
+        while hi is None:
+            value = min(current + step, limit)
+            if ok(value):
+                hi = value
+            elif value == limit:
+                return None
+            else:
+                lo = value
+                step *= 2
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if ok(mid):
+            hi = mid
+        else:
+            lo = mid
+    return hi
+
+def minimum_levels(target, option, leader_lvl, soldier_1_lvl, soldier_2_lvl, others_lvl, shoot, obst, lib, success,
+                   fields = LEVEL_FIELDS, limit = None):
+    # minimum_level of every field that is part of the team, each one moved
+    # on its own: field -> level (or None)
+    args = (option, leader_lvl, soldier_1_lvl, soldier_2_lvl, others_lvl, shoot, obst, lib, success)
+    return {field: minimum_level(field, target, *args, limit=limit)
+            for field in fields if args[LEVEL_FIELDS[field][0]] is not None}
@@ -0,0 +1,153 @@
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+
+import numpy as np
+
+from .game import HAZARD
+
+# Slow or failed solves kept on disk, to profile them later. Off unless
+# WGC_CAPTURE is set (to 1 for a captures folder next to the disk cache, or to
+# a folder) or enable() is called. Every solve_team of a backend that takes
+# longer than THRESHOLD seconds (WGC_CAPTURE_SECONDS) or does not end Optimal
+# becomes one entry, a folder holding:
+#   inputs.json  the exact input of the call (the team dict of team.py, plus
+#                the hazards and warm start of native's searches), the
+#                backend, its seconds and status and why it was kept
+#   model.lp, model.mps  the MILP of cbc.py for the team (needs pulp)
+#   solver.log   CBC's log, HiGHS's message or native's search stats
+# Only the newest MAX_ENTRIES stay. replay.py solves an entry again:
+#
+#   python replay.py 3 --profile
+#
+# model.mps also runs on its own, e.g. cbc model.mps -max -solve.
+
+THRESHOLD = float(os.environ.get("WGC_CAPTURE_SECONDS", 1.0))
+MAX_ENTRIES = 50
+enabled = False
+folder = None
+_lock = threading.Lock()
+_log = logging.getLogger(__name__)
+
+def default_folder():
+    from . import store
+    return os.path.join(store.cache_folder(), "captures")
+
+def enable(path=None, threshold=None):
+    global enabled, folder, THRESHOLD
+    folder = path or default_folder()
+    if threshold is not None:
+        THRESHOLD = threshold
+    enabled = True
+
+def disable():
+    global enabled
+    enabled = False
+
+def wants(seconds, status):
+    # Whether a solve that took seconds and ended with status gets kept
+    return enabled and (seconds >= THRESHOLD or status != "Optimal")
+
+################################
+########### Encoding ###########
+################################
+
+def _plain(x):
+    # JSON for teams and warm starts: arrays become lists, hazards names
+    if isinstance(x, dict):
+        return {k: _plain(v) for k, v in x.items()}
+    if isinstance(x, (list, tuple)):
+        return [_plain(v) for v in x]
+    if isinstance(x, np.ndarray):
+        return x.tolist()
+    if isinstance(x, np.generic):
+        return x.item()
+    if isinstance(x, HAZARD):
+        return x.name
+    return x
+
+def _team(team):
+    # The team dict back from JSON, with the arrays and tuples team.py uses
+    pools = [{**pool, "w": np.array(pool["w"], dtype=float), "lb": tuple(pool["lb"])} for pool in team["pools"]]
+    return {**team, "pools": pools}
+
+def _warm(warm):
+    if warm is None:
+        return None
+    out = {**warm, "leader": np.array(warm["leader"])}
+    out["pools"] = [[np.array(x) for x in alloc] for alloc in warm["pools"]]
+    if warm.get("hazard") is not None:
+        out["hazard"] = HAZARD[warm["hazard"]]
+    return out
+
+################################
+########### Entries ############
+################################
+
+def entries(path=None):
+    # Entry folders, oldest first
+    path = path or folder or default_folder()
+    if not os.path.isdir(path):
+        return []
+    names = sorted(name for name in os.listdir(path) if name.split("-")[0].isdigit())
+    return [os.path.join(path, name) for name in names]
+
+def save(backend, call, team, seconds, status, log="", hazards=None, warm=None):
+    # Keeps one solve; call is the backend function replay.py runs again.
+    # Returns the entry, or None when it could not be written (a full disk, a
+    # read-only folder, ...): that only logs a warning, the solve it was
+    # called from goes on.
+    reason = "status" if status != "Optimal" else "slow"
+    with _lock:
+        entry = None
+        try:
+            os.makedirs(folder, exist_ok=True)
+            kept = entries(folder)
+            number = int(os.path.basename(kept[-1]).split("-")[0]) + 1 if kept else 1
+            entry = os.path.join(folder, f"{number:06d}-{backend}-{reason}")
+            os.makedirs(entry)
+            inputs = {"backend": backend, "call": call, "team": _plain(team), "seconds": seconds, "status": status,
+                      "reason": reason, "threshold": THRESHOLD, "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+                      "hazards": None if hazards is None else [haz.name for haz in hazards], "warm": _plain(warm)}
+            with open(os.path.join(entry, "inputs.json"), "w") as f:
+                json.dump(inputs, f, indent=1)
+            with open(os.path.join(entry, "solver.log"), "w") as f:
+                f.write(log)
+            _write_model(team, entry)
+            for old in (kept + [entry])[:-MAX_ENTRIES]:
+                shutil.rmtree(old, ignore_errors=True)
+        except OSError as e:
+            if entry is not None:
+                shutil.rmtree(entry, ignore_errors=True)
+            _log.warning("could not capture a %s solve in %s: %s", backend, folder, e)
+            return None
+    return entry
+
+def _write_model(team, entry):
+    try:
+        from . import cbc
+    except ImportError:
+        return
+    # A model of its own, the shared ones of cbc.py may be busy
+    model = cbc.Model(team)
+    model.update(team)
+    model.prob.writeLP(os.path.join(entry, "model.lp"))
+    model.prob.writeMPS(os.path.join(entry, "model.mps"))
+
+def load(entry):
+    # (inputs, args) of an entry: the inputs.json dict and the arguments to
+    # call its backend function with
+    with open(os.path.join(entry, "inputs.json")) as f:
+        inputs = json.load(f)
+    args = {"team": _team(inputs["team"])}
+    if inputs["hazards"] is not None:
+        args["hazards"] = [HAZARD[name] for name in inputs["hazards"]]
+    if inputs["warm"] is not None:
+        args["warm"] = _warm(inputs["warm"])
+    return inputs, args
+
+if os.environ.get("WGC_CAPTURE"):
+    enable(None if os.environ["WGC_CAPTURE"] in ("1", "on") else os.environ["WGC_CAPTURE"])
@@ -0,0 +1,277 @@
+import os
+import re
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pulp # type: ignore
+
+from .game import JOB, HAZARD
+from .team import legacy_team, member_team, z_values, z_rows, legacy_result, members_result, print_verbose, best_hazard
+from . import trace, capture
+
+# The MILP solved by CBC, built from a team dict (see team.py) so that every
+# team shape goes through the same model.
+#
+# Building the pulp model (variables, expressions, constraints) costs about as
+# much Python time as CBC spends solving it, and only the coefficients depend
+# on the query: the facility levels, rolls and haz_mod in the z rows and the
+# skill points on the right of the row sums. So there is one Model per team
+# shape, built once and then updated in place for every query.
+
+M = 10_000
+
+def shape_key(team):
+    # What decides the variables and rows of the model; the rest of the team
+    # only changes coefficients
+    return (team["leader_nat"], team["leader_soc"],
+            tuple((tuple(pool["w"]), tuple(pool["lb"]), tuple((m["nat"], m["soc"]) for m in pool["members"]))
+                  for pool in team["pools"]))
+
+class Model:
+    def __init__(self, team):
+        start = time.perf_counter()
+
+        # Define the problem
+        self.prob = pulp.LpProblem("MaxMinProblem", pulp.LpMaximize)
+
+        # Decision variables, x1* is the leader and x2*, x3*, ... the members
+        self.leader = [pulp.LpVariable(f"x1{g + 1}", lowBound=1, cat="Integer") for g in range(3)]
+        self.pools = []
+        n = 1
+        for pool in team["pools"]:
+            xs = []
+            for member in pool["members"]:
+                n += 1
+                xs.append([pulp.LpVariable(f"x{n}{g + 1}", lowBound=pool["lb"][g], cat="Integer") for g in range(3)])
+            self.pools.append(xs)
+        members = self._members(team)
+
+        self.t = pulp.LpVariable("t", cat="Continuous")  # max-min varValue
+
+        # Auxiliary variables for min/max
+        w0 = pulp.LpVariable("w0")
+        w1 = pulp.LpVariable("w1")
+        self.w = (w0, w1)
+
+        # y values
+        y_pow = [self.leader[0]] + [x[0] + 0.5 * self.leader[0] for _, _, x in members]
+        y_ath = [self.leader[1]] + [x[1] + 0.5 * self.leader[1] for _, _, x in members]
+
+        # Binaries
+        b = [pulp.LpVariable(f"b{i + 1}_w1", cat="Binary") for i in range(len(y_ath))]
+
+        # Row-sum constraints, their right-hand sides are set by update
+        self.row_sums = [pulp.lpSum(self.leader) == 0] + [pulp.lpSum(x) == 0 for _, _, x in members]
+        for row in self.row_sums:
+            self.prob += row
+        for y in y_pow:
+            self.prob += w0 <= y
+        for y in y_ath:
+            self.prob += w1 >= y
+
+        self.prob += pulp.lpSum(b) == 1
+        for b_i, y in zip(b, y_ath):
+            self.prob += w1 <= y + M * (1 - b_i)
+
+        # Max–min constraints t <= z, coefficients set by update
+        self.z_rows = []
+        for terms, _ in z_rows(team, self.leader, members, w0, w1):
+            row = pulp.LpConstraint(pulp.LpAffineExpression([(self.t, 1)] + [(v, -1) for v, _ in terms]),
+                                    pulp.LpConstraintLE)
+            self.prob += row
+            self.z_rows.append(row)
+
+        # Objective
+        self.prob += self.t
+        self.lock = threading.Lock()
+        self.build_time = time.perf_counter() - start
+
+    def _members(self, team):
+        return [(pool, member, x) for pool, xs in zip(team["pools"], self.pools)
+                for member, x in zip(pool["members"], xs)]
+
+    def update(self, team):
+        # Coefficients and right-hand sides of this query
+        members = self._members(team)
+        self.row_sums[0].changeRHS(team["skill_leader"])
+        for row, (_, member, _) in zip(self.row_sums[1:], members):
+            row.changeRHS(member["budget"])
+        for row, (terms, constant) in zip(self.z_rows, z_rows(team, self.leader, members, *self.w)):
+            for v, c in terms:
+                row.expr[v] = -c
+            row.changeRHS(constant)
+
+_models = {}
+_models_lock = threading.Lock()
+# Seconds spent building models, and updating and solving them
+timings = {"models": 0, "build": 0.0, "update": 0.0, "solve": 0.0}
+
+def get_model(team):
+    # The Model of this team's shape, built on first use
+    key = shape_key(team)
+    with _models_lock:
+        model = _models.get(key)
+        if model is None:
+            model = _models[key] = Model(team)
+            timings["models"] += 1
+            timings["build"] += model.build_time
+            if trace.enabled:
+                trace.record("cbc/build", model.build_time)
+    return model
+
+def build_model(team):
+    # A model set up for this team: (prob, t, leader, pools). Shared with
+    # every team of the same shape, so it only holds until the next query.
+    model = get_model(team)
+    model.update(team)
+    return model.prob, model.t, model.leader, model.pools
+
+def read_log(text):
+    # What CBC's log says about a solve: its own wall time, the nodes of the
+    # branch and bound and the gap left (0 once optimal)
+    def number(pattern):
+        found = re.search(pattern, text)
+        return float(found.group(1)) if found else None
+    nodes = number(r"Enumerated nodes:\s*(\d+)")
+    gap = number(r"Gap:\s*([-\d.e+]+)")
+    if gap is None and "Optimal solution found" in text:
+        gap = 0.0
+    return {"seconds": number(r"Wallclock seconds\):\s*([\d.]+)"),
+            "nodes": None if nodes is None else int(nodes), "gap": gap}
+
+def solve_team(team):
+    model = get_model(team)
+    log = None
+    if trace.enabled or capture.enabled:
+        # CBC writes its log here, to split the solve time into the process
+        # and the branch and bound, and to keep with a captured solve
+        handle, log = tempfile.mkstemp(suffix=".log", prefix="wgc-cbc-")
+        os.close(handle)
+    with model.lock:
+        start = time.perf_counter()
+        model.update(team)
+        update_time = time.perf_counter() - start
+        model.prob.solve(pulp.PULP_CBC_CMD(msg=False, logPath=log))
+        solve_time = time.perf_counter() - start - update_time
+
+        leader_vals = np.array([v.varValue for v in model.leader]).astype(int)
+        pool_vals = [np.array([[v.varValue for v in x] for x in xs]).astype(int).reshape(-1, 3) for xs in model.pools]
+        status = pulp.LpStatus[model.prob.status]
+    z = z_values(team, leader_vals, pool_vals)
+    # t is the lowest z, like the other backends: CBC's own t variable can
+    # differ from it in the last digits
+    t = min(z.values())
+    extract_time = time.perf_counter() - start - update_time - solve_time
+    with _models_lock:
+        timings["update"] += update_time
+        timings["solve"] += solve_time
+    if log is not None:
+        with open(log) as f:
+            text = f.read()
+        os.remove(log)
+        if trace.enabled:
+            stats = read_log(text)
+            hazard = trace.hazard_name(team["haz_mod"])
+            cbc_time = min(stats.pop("seconds") or 0.0, solve_time)
+            trace.record("cbc/update", update_time, hazard=hazard)
+            trace.record("cbc/process", solve_time - cbc_time, hazard=hazard)
+            trace.record("cbc/solve", cbc_time, hazard=hazard, status=status, **stats)
+            trace.record("cbc/extract", extract_time, hazard=hazard)
+        if capture.wants(update_time + solve_time, status):
+            capture.save("cbc", "solve_team", team, update_time + solve_time, status, log=text)
+    return {
+        "t": t,
+        "leader": leader_vals,
+        "pools": pool_vals,
+        "z": z,
+        "status": status,
+        "time": {"update": update_time, "solve": solve_time}
+    }
+
+def solve_team_all_hazards(team, hazards=HAZARD, progress=None):
+    # One solve per hazard; ties (see team.TIE) go to the earliest hazard
+    hazards = list(hazards)
+    results = []
+    for k, haz in enumerate(hazards):
+        if progress is not None:
+            progress(k, len(hazards))
+        results.append(solve_team({**team, "haz_mod": haz._value_}))
+    k = best_hazard([res["t"] for res in results])
+    return {**results[k], "hazard": hazards[k]}
+
+def _solve_legacy(team, nb_explicit, options, hazard_approach, verbose, get_integer_results):
+    res = solve_team(team)
+    out = legacy_result(res, nb_explicit, get_integer_results)
+    if verbose:
+        print_verbose(out, options, hazard_approach, res["status"])
+    return out
+
+def solve_maxmin_no_soldier(obst_lvl,
+                            shoot_lvl,
+                            lib_lvl,
+                            skill_leader,
+                            skill_other,
+                            roll_indiv = 1,
+                            roll_group = 4,
+                            options = [JOB.Soldier, JOB.Nat_Scientist, JOB.Soc_Scientist],
+                            hazard_approach = HAZARD.Neutral,
+                            verbose=False,
+                            get_integer_results = False):
+    team = legacy_team(obst_lvl, shoot_lvl, lib_lvl, skill_leader, [], skill_other,
+                       roll_indiv, roll_group, options, hazard_approach)
+    return _solve_legacy(team, 0, options, hazard_approach, verbose, get_integer_results)
+
+def solve_maxmin_soldier(obst_lvl,
+                        shoot_lvl,
+                        lib_lvl,
+                        skill_leader,
+                        skill_soldier,
+                        skill_other,
+                        roll_indiv = 1,
+                        roll_group = 4,
+                        options = [JOB.Soldier, JOB.Nat_Scientist, JOB.Soc_Scientist],
+                        hazard_approach = HAZARD.Neutral,
+                        verbose=False,
+                        get_integer_results = False):
+    team = legacy_team(obst_lvl, shoot_lvl, lib_lvl, skill_leader, [skill_soldier], skill_other,
+                       roll_indiv, roll_group, options, hazard_approach)
+    return _solve_legacy(team, 1, options, hazard_approach, verbose, get_integer_results)
+
+def solve_maxmin_soldier_two_or_three(obst_lvl,
+                        shoot_lvl,
+                        lib_lvl,
+                        skill_leader,
+                        skill_soldier_1,
+                        skill_soldier_2,
+                        skill_other,
+                        roll_indiv = 1,
+                        roll_group = 4,
+                        options = [JOB.Soldier, JOB.Nat_Scientist, JOB.Soc_Scientist],
+                        hazard_approach = HAZARD.Neutral,
+                        verbose=False,
+                        get_integer_results = False):
+    team = legacy_team(obst_lvl, shoot_lvl, lib_lvl, skill_leader, [skill_soldier_1, skill_soldier_2], skill_other,
+                       roll_indiv, roll_group, options, hazard_approach)
+    return _solve_legacy(team, 2, options, hazard_approach, verbose, get_integer_results)
+
+def solve_maxmin_team(obst_lvl,
+                      shoot_lvl,
+                      lib_lvl,
+                      leader_level,
+                      members,
+                      roll_indiv = 1,
+                      roll_group = 4,
+                      hazard_approach = HAZARD.Neutral,
+                      verbose=False,
+                      get_integer_results = False):
+    # members is a list of (JOB, level), each with its own allocation. Passing
+    # hazard_approach=None solves every hazard and returns the winner.
+    team = member_team(obst_lvl, shoot_lvl, lib_lvl, leader_level, members, roll_indiv, roll_group,
+                       hazard_approach or HAZARD.Neutral)
+    res = solve_team(team) if hazard_approach else solve_team_all_hazards(team)
+    out = members_result(team, res, get_integer_results)
+    if verbose:
+        print_verbose(out, [job for job, _ in members], out.get("hazard", hazard_approach), res["status"])
+    return out
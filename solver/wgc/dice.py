@@ -0,0 +1,66 @@
+import bisect
+from fractions import Fraction
+
+# Roll offsets for any success chance, worked out from the dice instead of
+# picked by hand. Every member check rolls one d20 (the individual roll) and
+# a team check adds up the d20s of all four members (the group roll); a check
+# succeeds with chance p when the roll clears the offset with chance p, so
+# the offset of p is the largest r with P(roll >= r) >= p. For the six
+# chances of the dropdown that is exactly the old table: [1, 4] for 100%
+# down to [11, 42] for 50%.
+#
+# The distributions are counted exactly in integers (convolving one die at a
+# time) the first time they are needed and kept, after which an offset is one
+# bisect. Chances are Fractions so 90% lands on 18/20 and not just below it.
+
+INDIV = (1, 20) # dice, sides
+GROUP = (4, 20)
+
+_tails = {}
+
+def tails(dice, sides):
+    # Number of outcomes with a sum of at least r, for r = 0 .. dice*sides,
+    # negated so the list goes up (for bisect), and the number of outcomes
+    if (dice, sides) not in _tails:
+        ways = [1]
+        for _ in range(dice):
+            new = [0] * (len(ways) + sides)
+            for s, w in enumerate(ways):
+                for face in range(1, sides + 1):
+                    new[s + face] += w
+            ways = new
+        tail = []
+        total = 0
+        for w in reversed(ways):
+            total += w
+            tail.append(-total)
+        tail.reverse()
+        _tails[dice, sides] = tail, total
+    return _tails[dice, sides]
+
+def chance_at_least(r, dice, sides):
+    tail, total = tails(dice, sides)
+    if r <= 0:
+        return Fraction(1)
+    return Fraction(-tail[r], total) if r < len(tail) else Fraction(0)
+
+def offset(p, dice, sides):
+    # Largest r with P(sum of the dice >= r) >= p, p in (0, 1]
+    tail, total = tails(dice, sides)
+    return bisect.bisect_right(tail, -p * total) - 1
+
+def parse_success(success):
+    # "72.5%", "72.5" or a number of percent -> chance as a Fraction
+    text = str(success).strip().removesuffix("%").strip()
+    try:
+        p = Fraction(text) / 100
+    except (ValueError, ZeroDivisionError):
+        raise ValueError(f"not a success chance: {success!r}")
+    if not 0 < p <= 1:
+        raise ValueError(f"success chance must be above 0% and at most 100%: {success!r}")
+    return p
+
+def success_rolls(success):
+    # [roll_indiv, roll_group] for a success chance such as "75%"
+    p = parse_success(success)
+    return [offset(p, *INDIV), offset(p, *GROUP)]
@@ -0,0 +1,47 @@
+from enum import Enum
+
+from .dice import success_rolls
+
+class JOB(Enum):
+    Soldier = 1
+    Nat_Scientist = 2
+    Soc_Scientist = 3
+
+    @classmethod
+    def toEnumOption(cls, stringJob):
+        match stringJob:
+            case "Soldier":
+                return JOB.Soldier
+            case "Natural Scientist":
+                return JOB.Nat_Scientist
+            case "Social Scientist":
+                return JOB.Soc_Scientist
+        return None
+
+class HAZARD(Enum):
+    Neutral =   [1, 1, 1, 1]
+    Negotiation = [0.9, 1.1, 1, 1]
+    Agressive = [1.25, 0.85, 1, 1]
+    Recon =     [1, 0.85, 0.9, 1.25]
+
+# [roll_indiv, roll_group] of the success chances offered in the dropdown,
+# 100% ([1, 4]) down to 50% ([11, 42]); any other chance goes through
+# success_rolls (see dice.py)
+probability = {f"{p}%": success_rolls(p) for p in range(100, 49, -10)}
+
+def convert_to_skill_point(points, is_leader):
+    modifier = 8 if is_leader else 7
+    return (points-1) * 2 + modifier
+
+LEVEL_EPS = 1e-9
+
+def whole_level(x):
+    # The level a t or z value makes, rounded towards 0 like int() but with
+    # room for float error: sums of exact values can land a hair below a
+    # whole number (60 as 59.99999999999999) and int() would lose a level.
+    # Below 0 the room goes the other way, -5 stays -5.
+    return int(x + LEVEL_EPS) if x >= 0 else int(x - LEVEL_EPS)
+
+# Every team of three members as a multiset of jobs, soldiers first like the
+# GUI wants them
+COMPOSITIONS = [(a, b, c) for a in JOB for b in JOB for c in JOB if a.value <= b.value <= c.value]
@@ -0,0 +1,120 @@
+import time
+
+import numpy as np
+from scipy.optimize import milp, LinearConstraint, Bounds # type: ignore
+from scipy.sparse import coo_matrix # type: ignore
+
+from .game import HAZARD
+from .team import z_values, z_rows, best_hazard
+from . import trace, capture
+
+# The MILP of cbc.py handed to HiGHS through scipy.optimize.milp, inside the
+# process: no model files and no CBC subprocess per solve. Same variables and
+# rows as cbc.Model, as columns of one sparse matrix:
+#   leader (3), every member (3 each), t, w0, w1, one binary per athletics term
+
+M = 10_000
+# milp's res.status in pulp's words, so every backend reports the same status
+STATUS = {0: "Optimal", 1: "Not Solved", 2: "Infeasible", 3: "Unbounded"}
+
+def _model(team):
+    # (c, constraints, bounds, integrality) of the MILP for this team
+    n_members = sum(len(pool["members"]) for pool in team["pools"])
+    leader = [0, 1, 2]
+    members = []
+    col = 3
+    lower = [1, 1, 1]
+    for pool in team["pools"]:
+        for member in pool["members"]:
+            members.append((pool, member, [col, col + 1, col + 2]))
+            lower += list(pool["lb"])
+            col += 3
+    t, w0, w1 = col, col + 1, col + 2
+    b = list(range(col + 3, col + 3 + n_members + 1))
+    n = b[-1] + 1
+    lower += [-np.inf, -np.inf, -np.inf] + [0] * len(b)
+    upper = [np.inf] * (t + 3) + [1] * len(b)
+    integrality = np.ones(n)
+    integrality[[t, w0, w1]] = 0
+
+    rows, cols, vals, lo, hi = [], [], [], [], []
+    def add(terms, row_lo, row_hi):
+        r = len(lo)
+        for v, c in terms:
+            rows.append(r)
+            cols.append(v)
+            vals.append(c)
+        lo.append(row_lo)
+        hi.append(row_hi)
+
+    # Row sums: every point gets spent
+    add([(v, 1) for v in leader], team["skill_leader"], team["skill_leader"])
+    for _, member, x in members:
+        add([(v, 1) for v in x], member["budget"], member["budget"])
+    # w0 below every power, w1 the highest athletics (picked by one binary)
+    y_pow = [[(leader[0], 1)]] + [[(x[0], 1), (leader[0], 0.5)] for _, _, x in members]
+    y_ath = [[(leader[1], 1)]] + [[(x[1], 1), (leader[1], 0.5)] for _, _, x in members]
+    for y in y_pow:
+        add([(w0, 1)] + [(v, -c) for v, c in y], -np.inf, 0)
+    for y in y_ath:
+        add([(w1, -1)] + y, -np.inf, 0)
+    add([(v, 1) for v in b], 1, 1)
+    for b_i, y in zip(b, y_ath):
+        add([(w1, 1), (b_i, M)] + [(v, -c) for v, c in y], -np.inf, M)
+    # t <= z
+    for terms, constant in z_rows(team, leader, members, w0, w1):
+        add([(t, 1)] + [(v, -c) for v, c in terms], -np.inf, constant)
+
+    A = coo_matrix((vals, (rows, cols)), shape=(len(lo), n)).tocsr()
+    c = np.zeros(n)
+    c[t] = -1
+    return c, LinearConstraint(A, lo, hi), Bounds(lower, upper), integrality, members
+
+def solve_team(team):
+    start = time.perf_counter()
+    c, constraints, bounds, integrality, members = _model(team)
+    build_time = time.perf_counter() - start
+    res = milp(c, constraints=constraints, bounds=bounds, integrality=integrality)
+    solve_time = time.perf_counter() - start - build_time
+    status = STATUS.get(res.status, "Undefined")
+    if capture.wants(build_time + solve_time, status):
+        capture.save("highs", "solve_team", team, build_time + solve_time, status,
+                     log=f"{res.message}\nnodes: {getattr(res, 'mip_node_count', None)}\n"
+                         f"gap: {getattr(res, 'mip_gap', None)}\n")
+    if res.x is None:
+        raise RuntimeError(f"HiGHS found no solution: {res.message}")
+
+    x = np.round(res.x).astype(int)
+    leader_vals = x[:3]
+    pool_vals = []
+    i = 0
+    for pool in team["pools"]:
+        k = len(pool["members"])
+        pool_vals.append(np.array([x[m[2]] for m in members[i:i + k]], dtype=int).reshape(-1, 3))
+        i += k
+    z = z_values(team, leader_vals, pool_vals)
+    if trace.enabled:
+        hazard = trace.hazard_name(team["haz_mod"])
+        trace.record("highs/build", build_time, hazard=hazard)
+        trace.record("highs/solve", solve_time, hazard=hazard, status=status,
+                     nodes=getattr(res, "mip_node_count", None), gap=getattr(res, "mip_gap", None))
+        trace.record("highs/extract", time.perf_counter() - start - build_time - solve_time, hazard=hazard)
+    return {
+        "t": min(z.values()),
+        "leader": leader_vals,
+        "pools": pool_vals,
+        "z": z,
+        "status": status,
+        "time": {"update": build_time, "solve": solve_time}
+    }
+
+def solve_team_all_hazards(team, hazards=HAZARD, progress=None):
+    # One solve per hazard; ties (see team.TIE) go to the earliest hazard
+    hazards = list(hazards)
+    results = []
+    for k, haz in enumerate(hazards):
+        if progress is not None:
+            progress(k, len(hazards))
+        results.append(solve_team({**team, "haz_mod": haz._value_}))
+    k = best_hazard([res["t"] for res in results])
+    return {**results[k], "hazard": hazards[k]}
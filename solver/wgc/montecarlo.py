@@ -0,0 +1,124 @@
+import time
+
+import numpy as np
+
+from .dice import INDIV, GROUP, tails, chance_at_least
+from .game import HAZARD, whole_level
+from .team import legacy_team, member_team, z_values
+
+# Monte Carlo check of an answer: rolls the dice of the seven challenges for
+# many expeditions and counts how often each one is cleared at a level, to
+# compare with the success chance the answer was solved for.
+#
+# Every z of team.py is linear in its roll (z0-z3 the d20 of one member, z4-z6
+# the four d20s of the group), so a check at level L is passed when the roll
+# is at least need = the roll that brings z up to L. Rolls are drawn by
+# inverse transform: the outcomes of the dice sorted by sum, one uniform
+# integer index into them, and the roll clears need when the index is past
+# the outcomes below need. That is one bounded integer and one compare per
+# check and expedition, done a chunk of expeditions at a time.
+
+CHECKS = ["z0", "z1", "z2", "z3", "z4", "z5", "z6"]
+DICE = {k: GROUP if k in ("z4", "z5", "z6") else INDIV for k in CHECKS}
+TRIALS = 10_000_000
+CHUNK = 1 << 20
+Z95 = 1.959963984540054
+EPS = 1e-9
+
+def needs(team, leader, pools, level):
+    # Smallest roll that clears each check at this level
+    base = z_values({**team, "roll_indiv": 0, "roll_group": 0}, leader, pools)
+    step = z_values({**team, "roll_indiv": 1, "roll_group": 1}, leader, pools)
+    return {k: int(np.ceil((level - base[k]) / (step[k] - base[k]) - EPS)) for k in CHECKS}
+
+def wilson(passed, trials, z=Z95):
+    # Confidence interval of a success rate (Wilson score, 95% by default)
+    p = passed / trials
+    denom = 1 + z * z / trials
+    mid = (p + z * z / (2 * trials)) / denom
+    half = z * np.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denom
+    return max(0.0, float(mid - half)), min(1.0, float(mid + half))
+
+def _rate(passed, trials, exact):
+    low, high = wilson(passed, trials)
+    return {"rate": passed / trials, "low": low, "high": high, "exact": exact}
+
+def simulate_team(team, leader, pools, level, trials=TRIALS, seed=0):
+    # Success rates of every check, of the weakest one and of clearing all
+    # seven in one expedition, for the allocation (leader, pools) of team at
+    # level; seeded so the same call gives the same numbers
+    need = needs(team, leader, pools, level)
+    rng = np.random.default_rng(seed)
+    # Outcomes below need, out of all outcomes of the dice
+    below = {}
+    for k in CHECKS:
+        total = tails(*DICE[k])[1]
+        below[k] = (total - int(chance_at_least(need[k], *DICE[k]) * total), total)
+
+    passed = dict.fromkeys(CHECKS, 0)
+    passed_all = 0
+    start = time.perf_counter()
+    done = 0
+    while done < trials:
+        n = min(CHUNK, trials - done)
+        ok = np.ones(n, dtype=bool)
+        for k in CHECKS:
+            lo, total = below[k]
+            hit = rng.integers(0, total, n, dtype=np.uint32) >= lo
+            passed[k] += int(np.count_nonzero(hit))
+            ok &= hit
+        passed_all += int(np.count_nonzero(ok))
+        done += n
+    elapsed = time.perf_counter() - start
+
+    checks = {k: {"need": need[k], **_rate(passed[k], trials, float(chance_at_least(need[k], *DICE[k])))}
+              for k in CHECKS}
+    weakest = min(CHECKS, key=lambda k: checks[k]["exact"])
+    exact_all = float(np.prod([checks[k]["exact"] for k in CHECKS]))
+    return {"level": level, "trials": trials, "seed": seed, "checks": checks,
+            "weakest": {"check": weakest, **checks[weakest]},
+            "all": _rate(passed_all, trials, exact_all),
+            "trials_per_s": trials / elapsed if elapsed > 0 else float("inf")}
+
+def _level(res, level):
+    # The level the GUI shows for this answer unless one is given
+    return whole_level(res["t"]) if level is None else level
+
+def simulate(res,
+             obst_lvl,
+             shoot_lvl,
+             lib_lvl,
+             skill_leader,
+             skill_soldiers,
+             skill_other,
+             options,
+             hazard_approach = None,
+             level = None,
+             trials = TRIALS,
+             seed = 0):
+    # A result of solve_maxmin_no_soldier / _soldier / _soldier_two_or_three /
+    # _all_hazards with the inputs it was solved for; the hazard is the one of
+    # the result when it has one
+    hazard_approach = res.get("hazard", hazard_approach) or HAZARD.Neutral
+    team = legacy_team(obst_lvl, shoot_lvl, lib_lvl, skill_leader, skill_soldiers, skill_other,
+                       0, 0, options, hazard_approach)
+    pools = [np.array([res["a"]], dtype=float),
+             np.array([res[f"x{i + 2}"] for i in range(len(skill_soldiers))], dtype=float).reshape(-1, 3)]
+    return simulate_team(team, res["x1"], pools, _level(res, level), trials, seed)
+
+def simulate_members(res,
+                     obst_lvl,
+                     shoot_lvl,
+                     lib_lvl,
+                     leader_level,
+                     members,
+                     hazard_approach = None,
+                     level = None,
+                     trials = TRIALS,
+                     seed = 0):
+    # A result of solve_maxmin_team with the inputs it was solved for
+    hazard_approach = res.get("hazard", hazard_approach) or HAZARD.Neutral
+    team = member_team(obst_lvl, shoot_lvl, lib_lvl, leader_level, members, 0, 0, hazard_approach)
+    pools = [np.array([res["members"][m["slot"]] for m in pool["members"]], dtype=float).reshape(-1, 3)
+             for pool in team["pools"]]
+    return simulate_team(team, res["x1"], pools, _level(res, level), trials, seed)
@@ -0,0 +1,896 @@
+import functools
+import itertools
+import json
+import time
+
+import numpy as np
+
+from .game import JOB, HAZARD, COMPOSITIONS, probability
+from .team import LEADER_LB, legacy_team, member_team, z_values, legacy_result, members_result, print_verbose, tie_floor
+from . import trace, capture
+
+# In-process replacement for the CBC models. Instead of handing a MILP to an
+# external solver we bisect on the difficulty t and answer "can every
+# challenge reach t?" exactly over the integer lattice of point splits.
+#
+# Teams come from team.py: a leader plus the pools U and V. Members of the
+# same pool weigh the same in z4-z6, so once each member has its individual
+# minimums (z0-z3) their spare points can be treated as one budget. For a fixed leader split the rest is a covering problem that is
+# solved exactly by a greedy over points taken two at a time (see _min_need).
+#
+# Anything here that changes answers needs calc.SOLVER_VERSION bumped, or
+# the disk cache keeps serving the old ones.
+
+EPS = 1e-9
+PARITIES = np.array(list(itertools.product((0, 1), repeat=3)))
+
+# Totals of the per-search stats of _search, over every search so far
+search_stats = {"searches": 0, "checks": 0, "exact": 0, "pruned": 0}
+
+def _ceil(x):
+    return np.ceil(x - EPS)
+
+@functools.lru_cache(maxsize=64)
+def _splits(total, lb):
+    # Every (power, athletics, wit) >= lb summing to total
+    free = total - sum(lb)
+    if free < 0:
+        return np.zeros((0, 3), dtype=np.int64)
+    i, j = np.triu_indices(free + 1)
+    return np.stack([i + lb[0], j - i + lb[1], free - j + lb[2]], axis=1)
+
+################################
+######## Team evaluation #######
+################################
+
+def _thresholds(team, t):
+    # Smallest stat value that lets each challenge reach difficulty t
+    ri, rg = team["roll_indiv"], team["roll_group"]
+    haz_mod = team["haz_mod"]
+    shoot, obst, lib = team["shoot_lvl"], team["obst_lvl"], team["lib_lvl"]
+    return {
+        "pow": (1.5 * t - ri + 10) / shoot,
+        "ath": (1.5 * haz_mod[3] * t - ri + 10 * haz_mod[3]) / obst,
+        "nat": (1.5 * t - ri + 10) / lib,
+        "soc": (1.5 * haz_mod[0] * t - ri + 10 * haz_mod[0]) / lib,
+        "lead_wit": (t - ri + 10) / lib,
+        "sum": np.array([(4 * haz_mod[1] * t - rg + 40 * haz_mod[1]) / shoot,
+                         (4 * haz_mod[3] * t - rg + 40 * haz_mod[3]) / obst,
+                         (4 * haz_mod[2] * t - rg + 40 * haz_mod[2]) / lib])
+    }
+
+def _upper_bound(team):
+    # No challenge can beat the leader's power alone or a group check with
+    # every point of the team thrown at it. Nor can the three group checks
+    # together: a point adds at most the largest weight of its stat, so the
+    # group demands scaled by those weights cannot add up to more points than
+    # the team has.
+    leader = team["skill_leader"]
+    group = np.full(3, float(leader))
+    total = float(leader)
+    top = np.ones(3)
+    for pool in team["pools"]:
+        for member in pool["members"]:
+            group += pool["w"] * member["budget"]
+            total += member["budget"]
+            top = np.maximum(top, pool["w"])
+    haz_mod = team["haz_mod"]
+    mods = np.array([haz_mod[1], haz_mod[3], haz_mod[2]])
+    lvls = np.array([team["shoot_lvl"], team["obst_lvl"], team["lib_lvl"]])
+    group_t = (lvls * group + team["roll_group"] - 40 * mods) / (4 * mods)
+    power_t = (leader * team["shoot_lvl"] + team["roll_indiv"] - 10) / 1.5
+    # demand of group check g at t is (4 * mods * t - rg + 40 * mods) / lvls
+    sum_t = ((total + ((team["roll_group"] - 40 * mods) / (lvls * top)).sum())
+             / (4 * mods / (lvls * top)).sum())
+    return min(group_t.min(), power_t, sum_t)
+
+def _lower_bound(team):
+    # Any allocation scores a lower bound, an even split scores a decent one
+    def even(budget, lb):
+        free = budget - sum(lb)
+        return [lb[g] + free // 3 + (g < free % 3) for g in range(3)]
+    leader = even(team["skill_leader"], LEADER_LB)
+    pools = [np.array([even(m["budget"], p["lb"]) for m in p["members"]], dtype=float).reshape(-1, 3)
+             for p in team["pools"]]
+    return min(z_values(team, leader, pools).values())
+
+def _candidates(team, lo, hi):
+    # Every value a z formula takes on half-integer stats, within [lo, hi]
+    ri, rg = team["roll_indiv"], team["roll_group"]
+    haz_mod = team["haz_mod"]
+    shoot, obst, lib = team["shoot_lvl"], team["obst_lvl"], team["lib_lvl"]
+    lines = [
+        ((ri - 10) / 1.5, shoot / 1.5),
+        ((ri - 10 * haz_mod[3]) / (1.5 * haz_mod[3]), obst / (1.5 * haz_mod[3])),
+        ((ri - 10) / 1.5, lib / 1.5),
+        ((ri - 10 * haz_mod[0]) / (1.5 * haz_mod[0]), lib / (1.5 * haz_mod[0])),
+        (ri - 10, lib),
+        ((rg - 40 * haz_mod[1]) / (4 * haz_mod[1]), shoot / (4 * haz_mod[1])),
+        ((rg - 40 * haz_mod[3]) / (4 * haz_mod[3]), obst / (4 * haz_mod[3])),
+        ((rg - 40 * haz_mod[2]) / (4 * haz_mod[2]), lib / (4 * haz_mod[2]))
+    ]
+    out = [np.array([lo])]
+    for offset, slope in lines:
+        v = np.arange(np.ceil(2 * (lo - offset) / slope), np.floor(2 * (hi - offset) / slope) + 1) / 2
+        out.append(offset + slope * v)
+    cands = np.unique(np.concatenate(out))
+    return cands[cands >= lo]
+
+################################
+####### Feasibility check ######
+################################
+
+def _pool_state(pool, n, pow_min, nat_min, soc_min):
+    # Minimum stats of every member of a pool and the spare points left over
+    lb = pool["lb"]
+    mins = np.zeros((n, 3))
+    spares = []
+    for member in pool["members"]:
+        m1 = np.maximum(lb[0], pow_min)
+        m3 = np.full(n, float(lb[2]))
+        if member["nat"]:
+            m3 = np.maximum(m3, nat_min)
+        if member["soc"]:
+            m3 = np.maximum(m3, soc_min)
+        mins[:, 0] += m1
+        mins[:, 1] += lb[1]
+        mins[:, 2] += m3
+        spares.append(member["budget"] - m1 - lb[1] - m3)
+    if spares:
+        spares = np.stack(spares, axis=1)
+        return mins, spares.sum(axis=1), (spares >= 0).all(axis=1), spares.max(axis=1)
+    return mins, np.zeros(n), np.ones(n, dtype=bool), np.full(n, -np.inf)
+
+def _min_need(B, E_U, w_U, w_V):
+    # Fewest V points that cover the demands B once U has spent up to E_U
+    # points on them. Taken two points at a time, every demand drops by a fixed
+    # integer step until it is met, so the choice per parity is a plain greedy.
+    # All eight parities at once, along the middle axis.
+    delta = 2 * w_U / w_V
+    rem = E_U[:, None] - PARITIES.sum(axis=1)
+    Z = np.floor(rem / 2)
+    F = np.maximum(0, _ceil((B[:, None, :] - w_U * PARITIES) / w_V))
+    full = np.floor(F / delta)
+    part = F - full * delta
+    values = np.concatenate([np.broadcast_to(delta, F.shape), part], axis=2)
+    counts = np.concatenate([full, (part > 0).astype(float)], axis=2)
+    order = np.argsort(-values, axis=2, kind="stable")
+    values = np.take_along_axis(values, order, axis=2)
+    counts = np.take_along_axis(counts, order, axis=2)
+    before = np.cumsum(counts, axis=2) - counts
+    taken = np.clip(Z[:, :, None] - before, 0, counts)
+    need = F.sum(axis=2) - (taken * values).sum(axis=2)
+    need[rem < 0] = np.inf
+    return need.min(axis=1)
+
+def _relaxed_need(B, E_U, w_U, w_V):
+    # Fractional version of _min_need, a cheap lower bound to drop rows early
+    left = E_U.copy()
+    need = np.zeros(len(B))
+    for g in np.argsort(-(w_U / w_V), kind="stable"):
+        demand = np.maximum(0, B[:, g])
+        use = np.minimum(left, demand / w_U[g])
+        left -= use
+        need += (demand - w_U[g] * use) / w_V[g]
+    return need
+
+BLOCK = 4 # leader splits per side of a block, see _blocks
+COARSE = 4096 # rows from which _first_row checks blocks first
+
+@functools.lru_cache(maxsize=64)
+def _blocks(total, lb):
+    # The splits of _splits in blocks of BLOCK x BLOCK (power, athletics),
+    # as (top, order, bounds, block): the highest of each stat any split of a
+    # block has, the indices of its splits, order[bounds[b]:bounds[b + 1]],
+    # and the block of every split
+    l = _splits(total, lb)
+    key = (l[:, 0] - lb[0]) // BLOCK * (len(l) + 1) + (l[:, 1] - lb[1]) // BLOCK
+    order = np.argsort(key, kind="stable")
+    key = key[order]
+    starts = np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+    top = np.stack([np.maximum.reduceat(l[order, g], starts) for g in range(3)], axis=1)
+    block = np.empty(len(l), dtype=np.int64)
+    block[order] = np.cumsum(np.r_[True, key[1:] != key[:-1]]) - 1
+    return top, order, np.r_[starts, len(l)], block
+
+def _rows(team, th, l):
+    # The rows of leader splits l at thresholds th, per z1 carrier (the
+    # leader, someone from U or someone from V): whether every member's
+    # minimums fit, the group demands B left to cover and the spare points
+    # E_U and E_V. Only ever gets easier when a stat of l goes up. Leader
+    # splits that fail the leader's own checks are dropped first (_keep).
+    n = len(l)
+    pow_min = _ceil(th["pow"] - 0.5 * l[:, 0])
+    ath_min = _ceil(th["ath"] - 0.5 * l[:, 1])
+    nat_min = _ceil(th["nat"] - 0.5 * l[:, 2])
+    soc_min = _ceil(th["soc"] - 0.5 * l[:, 2])
+
+    U, V = team["pools"]
+    M_U, E_U, ok_U, top_U = _pool_state(U, n, pow_min, nat_min, soc_min)
+    M_V, E_V, ok_V, top_V = _pool_state(V, n, pow_min, nat_min, soc_min)
+    base = ok_U & ok_V
+    raise_U = np.maximum(0, ath_min - U["lb"][1])
+    raise_V = np.maximum(0, ath_min - V["lb"][1])
+
+    carriers = [
+        (base & (l[:, 1] >= th["ath"] - EPS), 0, 0),
+        (base & (top_U >= raise_U), raise_U, 0),
+        (base & (top_V >= raise_V), 0, raise_V)
+    ]
+    out = []
+    base_B = th["sum"] - l - U["w"] * M_U - V["w"] * M_V
+    for valid, r_U, r_V in carriers:
+        r_U = np.broadcast_to(r_U, (n,))
+        r_V = np.broadcast_to(r_V, (n,))
+        B = base_B.copy()
+        B[:, 1] -= U["w"][1] * r_U + V["w"][1] * r_V
+        out.append((valid, B, E_U - r_U, E_V - r_V))
+    return out
+
+def _keep(team, th, l):
+    # Leader splits that pass the leader's own power and wit checks
+    keep = l[:, 0] >= th["pow"] - EPS
+    if team["leader_nat"] or team["leader_soc"]:
+        keep &= l[:, 2] >= th["lead_wit"] - EPS
+    return keep
+
+def _slack(team, B, E_U, E_V):
+    # V points left over once the relaxation has covered B, negative when
+    # even it cannot
+    U, V = team["pools"]
+    w_V = V["w"] if V["members"] else np.ones(3)
+    return E_V - _relaxed_need(B, E_U, U["w"], w_V)
+
+def _coarse(team, th, alive=None):
+    # The rows (of alive, or all) worth looking at at th, from whole blocks of
+    # leader splits: a block whose best stats (top) cannot reach th has no
+    # split that can
+    top, order, bounds, block = _blocks(team["skill_leader"], LEADER_LB)
+    if alive is None:
+        blocks = np.arange(len(top))
+    else:
+        blocks = np.zeros(len(top), dtype=bool)
+        blocks[block[alive[0]]] = True
+        blocks = np.flatnonzero(blocks)
+    blocks = blocks[_keep(team, th, top[blocks])]
+    carried = np.zeros((len(top), 3), dtype=bool)
+    for c, (valid, B, E_U, E_V) in enumerate(_rows(team, th, top[blocks])):
+        carried[blocks[valid], c] = _slack(team, B[valid], E_U[valid], E_V[valid]) >= -EPS
+    if alive is not None:
+        idx, rows = alive
+        rows = rows & carried[block[idx]]
+        some = rows.any(axis=1)
+        return idx[some], rows[some]
+    some = np.flatnonzero(carried.any(axis=1))
+    sizes = bounds[some + 1] - bounds[some]
+    first = np.repeat(bounds[some] - np.cumsum(sizes) + sizes, sizes)
+    idx = order[first + np.arange(sizes.sum())]
+    carried = np.repeat(carried[some], sizes, axis=0)
+    # Back in the order of _splits, so ties go the same way
+    back = np.argsort(idx, kind="stable")
+    return idx[back], carried[back]
+
+def _first_row(team, t, alive=None, chunk=256):
+    # A leader split and z1 carrier (0 leader, 1 U, 2 V) that can reach t, or
+    # None, and which rows (leader split, carrier) still might at a higher t.
+    # Reaching t is monotone, and so is the relaxation: a row it rules out at
+    # t is out for good. alive, the rows of an earlier call at a lower t
+    # (leader split indices and their carriers), limits the rows looked at;
+    # near the answer only a few percent are left. Blocks of splits go first
+    # (see _coarse) when there are many rows.
+    th = _thresholds(team, t)
+    l = _splits(team["skill_leader"], LEADER_LB)
+    if alive is None and len(l) <= COARSE:
+        alive = np.arange(len(l)), np.ones((len(l), 3), dtype=bool)
+    elif alive is None or len(alive[0]) > COARSE:
+        alive = _coarse(team, th, alive)
+    idx, carried = alive
+    keep = _keep(team, th, l[idx])
+    idx, carried = idx[keep], carried[keep]
+    l = l[idx]
+    n = len(l)
+    out = _rows(team, th, l)
+
+    valid = np.concatenate([o[0] & carried[:, c] for c, o in enumerate(out)])
+    carrier = np.repeat(np.arange(3), n)[valid]
+    B = np.concatenate([o[1] for o in out])[valid]
+    E_U = np.concatenate([o[2] for o in out])[valid]
+    E_V = np.concatenate([o[3] for o in out])[valid]
+    at = np.concatenate([np.arange(n)] * 3)[valid]
+
+    # Most promising rows first, by how much room the relaxation leaves
+    U, V = team["pools"]
+    w_V = V["w"] if V["members"] else np.ones(3)
+    slack = _slack(team, B, E_U, E_V)
+    order = np.argsort(-slack, kind="stable")
+    order = order[slack[order] >= -EPS]
+    left = np.zeros((n, 3), dtype=bool)
+    left[at[order], carrier[order]] = True
+    for start in range(0, len(order), chunk):
+        rows = order[start:start + chunk]
+        need = _min_need(B[rows], E_U[rows], U["w"], w_V)
+        fits = need <= E_V[rows] + EPS
+        if fits.any():
+            row = rows[np.argmax(fits)]
+            some = left.any(axis=1)
+            return (l[at[row]], int(carrier[row])), (idx[some], left[some])
+        left[at[rows], carrier[rows]] = False
+    some = left.any(axis=1)
+    return None, (idx[some], left[some])
+
+def feasible(team, t):
+    return _first_row(team, t)[0] is not None
+
+################################
+####### Allocation rebuild #####
+################################
+
+def _greedy_steps(F, delta, Z):
+    # Scalar version of the greedy in _min_need, returning the steps per demand
+    items = []
+    for g in range(3):
+        full = int(F[g] // delta[g])
+        items.append((delta[g], full, g))
+        part = F[g] - full * delta[g]
+        if part > 0:
+            items.append((part, 1, g))
+    items.sort(key=lambda item: -item[0])
+    steps = [0, 0, 0]
+    gain = 0
+    for value, count, g in items:
+        take = int(min(count, max(0, Z)))
+        steps[g] += take
+        gain += take * value
+        Z -= take
+    return steps, gain
+
+def _fill(alloc, spares, extra, order):
+    # Hand out extra points per stat to members with spare points, in order
+    for g in order:
+        left = extra[g]
+        for j in range(len(alloc)):
+            take = min(left, spares[j])
+            alloc[j][g] += take
+            spares[j] -= take
+            left -= take
+    return alloc
+
+def _build(team, t, leader, carrier):
+    th = _thresholds(team, t)
+    U, V = team["pools"]
+    pow_min = int(_ceil(th["pow"] - 0.5 * leader[0]))
+    ath_min = int(_ceil(th["ath"] - 0.5 * leader[1]))
+    nat_min = int(_ceil(th["nat"] - 0.5 * leader[2]))
+    soc_min = int(_ceil(th["soc"] - 0.5 * leader[2]))
+
+    pools = []
+    for c, pool in enumerate(team["pools"], start=1):
+        lb = pool["lb"]
+        alloc = []
+        for member in pool["members"]:
+            m3 = lb[2]
+            if member["nat"]:
+                m3 = max(m3, nat_min)
+            if member["soc"]:
+                m3 = max(m3, soc_min)
+            alloc.append([max(lb[0], pow_min), lb[1], m3])
+        spares = [m["budget"] - sum(x) for m, x in zip(pool["members"], alloc)]
+        if carrier == c:
+            j = int(np.argmax(spares))
+            bump = max(0, ath_min - lb[1])
+            alloc[j][1] += bump
+            spares[j] -= bump
+        pools.append((alloc, spares))
+
+    (alloc_U, spare_U), (alloc_V, spare_V) = pools
+    w_V = V["w"] if V["members"] else np.ones(3)
+    B = th["sum"] - np.asarray(leader, dtype=float)
+    for pool, (alloc, _) in zip(team["pools"], pools):
+        for x in alloc:
+            B = B - pool["w"] * np.asarray(x, dtype=float)
+
+    # Same greedy as _min_need, for the single winning row
+    E_U = sum(spare_U)
+    delta = 2 * U["w"] / w_V
+    best = None
+    for p in PARITIES:
+        if E_U - p.sum() < 0:
+            continue
+        F = np.maximum(0, _ceil((B - U["w"] * p) / w_V))
+        steps, gain = _greedy_steps(F, delta, (E_U - p.sum()) // 2)
+        need = F.sum() - gain
+        if best is None or need < best[0]:
+            best = (need, p, steps)
+    _, p, steps = best
+    y = [int(p[g] + 2 * steps[g]) for g in range(3)]
+    # Cap at what the demand actually needs, leftovers are handed out below
+    for g in range(3):
+        while y[g] > 0 and U["w"][g] * (y[g] - 1) >= B[g] - EPS:
+            y[g] -= 1
+    x = [max(0, int(_ceil((B[g] - U["w"][g] * y[g]) / w_V[g]))) for g in range(3)]
+    _fill(alloc_U, spare_U, y, range(3))
+    _fill(alloc_V, spare_V, x, range(3))
+
+    # Spend whatever is left where the team is weakest
+    z = z_values(team, leader, [np.array(alloc_U, dtype=float), np.array(alloc_V, dtype=float)])
+    order = sorted(range(3), key=lambda g: z[f"z{g + 4}"])
+    _fill(alloc_U, spare_U, [sum(spare_U)] * 3, order)
+    _fill(alloc_V, spare_V, [sum(spare_V)] * 3, order)
+    return np.array(alloc_U, dtype=int).reshape(-1, 3), np.array(alloc_V, dtype=int).reshape(-1, 3)
+
+################################
+########## Entry point #########
+################################
+
+def _repair(x, budget, lb):
+    # x moved onto a new budget: points added to the lowest stat or taken from
+    # the highest one still above its lower bound
+    x = [int(v) for v in x]
+    while sum(x) < budget:
+        x[x.index(min(x))] += 1
+    while sum(x) > budget:
+        g = max((g for g in range(3) if x[g] > lb[g]), key=lambda g: x[g])
+        x[g] -= 1
+    return x
+
+def _incumbent(team, warm):
+    # Score of a previous answer ({"leader", "pools"}) moved onto this team, or
+    # None when it had other members
+    pools = []
+    for pool, alloc in zip(team["pools"], warm["pools"]):
+        if len(alloc) != len(pool["members"]):
+            return None
+        pools.append(np.array([_repair(x, m["budget"], pool["lb"]) for m, x in zip(pool["members"], alloc)],
+                              dtype=float).reshape(-1, 3))
+    leader = _repair(warm["leader"], team["skill_leader"], LEADER_LB)
+    return min(z_values(team, leader, pools).values())
+
+def _search(teams, progress=None, warm=None, floor=None):
+    # Best difficulty over variants of one team (e.g. one per hazard approach).
+    # The optimum is whatever the binding challenge scores, so only the values a
+    # z formula can take need checking, each against the variants in order.
+    # progress(step, steps) is called before every bisection step; raising
+    # from it abandons the search.
+    #
+    # warm is the answer to a nearby query ({"t", "leader", "pools"}, same
+    # members, "variant" the index into teams that won, "ceiling" when the new
+    # answer is known to be at most that, "guess" where the new answer is
+    # expected when that is not the old t). Its allocation, fitted to the new
+    # budgets, is a lower bound to start from, and the search first probes
+    # around its t (or the guess), galloping away from it, before bisecting. One changed input usually moves the answer by a few
+    # candidates, which then takes a handful of checks instead of a full
+    # bisection.
+    #
+    # Every variant has a cap: it cannot reach any t >= cap. Caps start at the
+    # closed-form _upper_bound and drop to t whenever a variant fails a check,
+    # since reaching t is monotone. Checks skip capped variants and try the
+    # others best first (highest t reached so far, then highest cap), so a
+    # hazard that lost once is not checked again further up. stats counts the
+    # exact checks (_first_row calls) made and skipped. Every variant keeps
+    # the rows its last successful check left alive, later checks are higher.
+    #
+    # With tracing on (see trace.py) every finished search is a native/search
+    # event, its exact checks standing in for the nodes of a MILP.
+    #
+    # With a floor, only answers of at least floor are of interest: the search
+    # starts there and gives up (returning None) when no variant reaches it.
+    start = time.perf_counter()
+    lows = [_lower_bound(team) for team in teams]
+    if warm is not None:
+        lows += [v for v in (_incumbent(team, warm) for team in teams) if v is not None]
+    uppers = [_upper_bound(team) for team in teams]
+    lo, hi = max(lows), max(uppers)
+    ceiling = warm.get("ceiling") if warm is not None else None
+    if ceiling is not None:
+        hi = max(lo, min(hi, ceiling))
+    above = floor is not None and floor > lo
+    if above:
+        if floor > hi + EPS:
+            return None
+        lo = floor
+    cands = np.unique(np.concatenate([_candidates(team, lo, hi) for team in teams]))
+
+    cap = [u + EPS for u in uppers]
+    reached = [-np.inf] * len(teams)
+    alive = [None] * len(teams)
+    if warm is not None:
+        reached[warm.get("variant", 0)] = lo
+    stats = {"checks": 0, "exact": 0, "pruned": 0}
+
+    def first_feasible(t, order=None):
+        # The first variant that reaches t, in order (best first by default)
+        if order is None:
+            order = sorted(range(len(teams)), key=lambda k: (-reached[k], -cap[k], k))
+        for k in order:
+            if t >= cap[k]:
+                stats["pruned"] += 1
+                continue
+            stats["exact"] += 1
+            row, left = _first_row(teams[k], t, alive[k])
+            if row is not None:
+                if t >= reached[k]:
+                    alive[k] = left
+                reached[k] = max(reached[k], t)
+                return k, row
+            cap[k] = t
+        return None
+
+    # cands[0] is the score of an even split (or of the warm allocation), so
+    # it is always reachable; cands[i] is reachable and cands[j] is not
+    i, j = 0, len(cands)
+    found = None
+    steps = int(np.ceil(np.log2(len(cands))))
+    step = 0
+
+    def check(mid):
+        nonlocal i, j, found, step
+        if progress is not None:
+            progress(min(step, steps), steps)
+        step += 1
+        stats["checks"] += 1
+        hit = first_feasible(cands[mid])
+        if hit is not None:
+            i, found = mid, hit
+        else:
+            j = mid
+        return hit is not None
+
+    if above and not check(0):
+        return None
+    if warm is not None:
+        # The old t (or the guess), unless the warm allocation already scores at
+        # least that.
+        # Bounded from above there is no need to gallop, the bisection below
+        # only has [i, j) left anyway.
+        h = int(np.searchsorted(cands, warm.get("guess", warm["t"]) - EPS))
+        if h < j:
+            up = h == 0 or check(h)
+            gap = 1
+            while j - i > 1 and ceiling is None:
+                mid = i + gap if up else j - gap
+                if not i < mid < j:
+                    break
+                if check(mid) != up:
+                    break
+                gap *= 2
+    while j - i > 1:
+        check((i + j) // 2)
+    # Ties go to the earliest variant that reaches the answer, or comes within
+    # team.TIE of it: that one's own best is then bisected for between there
+    # and the answer
+    if found is None:
+        found = first_feasible(cands[i], range(len(teams)))
+    if found is not None and found[0] != 0:
+        low = int(np.searchsorted(cands, tie_floor(cands[i]) - EPS))
+        tied = first_feasible(cands[low], range(found[0]))
+        if tied is not None:
+            high = i + 1
+            while high - low > 1:
+                mid = (low + high) // 2
+                hit = first_feasible(cands[mid], [tied[0]])
+                if hit is not None:
+                    low, tied = mid, hit
+                else:
+                    high = mid
+            i, found = low, tied
+    if found is None:
+        # Not even the lower bound is reachable, so no allocation is valid: a
+        # budget is below the lower bounds of its stats. cbc reports such a
+        # team as Infeasible and highs raises as well.
+        raise RuntimeError("native search found no solution: the team is infeasible "
+                           "(a skill budget is below its minimum stats)")
+    k, (leader, carrier) = found
+    team = teams[k]
+    search_stats["searches"] += 1
+    for name, value in stats.items():
+        search_stats[name] += value
+    alloc_U, alloc_V = _build(team, cands[i], leader, carrier)
+    z = z_values(team, leader, [alloc_U, alloc_V])
+    if trace.enabled:
+        trace.record("native/search", time.perf_counter() - start, hazard=trace.hazard_name(team["haz_mod"]),
+                     status="Optimal", nodes=stats["exact"], checks=stats["checks"], variants=len(teams))
+    return k, {
+        "t": min(z.values()),
+        "leader": np.asarray(leader, dtype=int),
+        "pools": [alloc_U, alloc_V],
+        "z": z,
+        "status": "Optimal",
+        "stats": stats
+    }
+
+def _capture(call, team, start, res, hazards=None, warm=None):
+    # Keeps a slow search for replay.py (see capture.py)
+    seconds = time.perf_counter() - start
+    if capture.wants(seconds, "Optimal"):
+        capture.save("native", call, team, seconds, "Optimal", log=json.dumps(res["stats"]) + "\n",
+                     hazards=hazards, warm=warm)
+
+def solve_team(team, progress=None, warm=None):
+    start = time.perf_counter()
+    res = _search([team], progress, warm)[1]
+    _capture("solve_team", team, start, res, warm=warm)
+    return res
+
+def solve_team_all_hazards(team, hazards=HAZARD, progress=None, warm=None):
+    # One search over every hazard approach instead of one solve each. Ties go
+    # to the earliest hazard, like the loop in calculate_and_set did.
+    start = time.perf_counter()
+    hazards = list(hazards)
+    given = warm
+    if warm is not None and warm.get("hazard") in hazards:
+        warm = {**warm, "variant": hazards.index(warm["hazard"])}
+    k, res = _search([{**team, "haz_mod": haz._value_} for haz in hazards], progress, warm)
+    res["hazard"] = hazards[k]
+    _capture("solve_team_all_hazards", team, start, res, hazards=hazards, warm=given)
+    return res
+
+def solve_maxmin_no_soldier(obst_lvl,
+                            shoot_lvl,
+                            lib_lvl,
+                            skill_leader,
+                            skill_other,
+                            roll_indiv = 1,
+                            roll_group = 4,
+                            options = [JOB.Soldier, JOB.Nat_Scientist, JOB.Soc_Scientist],
+                            hazard_approach = HAZARD.Neutral,
+                            verbose=False,
+                            get_integer_results = False):
+    team = legacy_team(obst_lvl, shoot_lvl, lib_lvl, skill_leader, [], skill_other,
+                       roll_indiv, roll_group, options, hazard_approach)
+    res = legacy_result(solve_team(team), 0, get_integer_results)
+    if verbose:
+        print_verbose(res, options, hazard_approach)
+    return res
+
+def solve_maxmin_soldier(obst_lvl,
+                        shoot_lvl,
+                        lib_lvl,
+                        skill_leader,
+                        skill_soldier,
+                        skill_other,
+                        roll_indiv = 1,
+                        roll_group = 4,
+                        options = [JOB.Soldier, JOB.Nat_Scientist, JOB.Soc_Scientist],
+                        hazard_approach = HAZARD.Neutral,
+                        verbose=False,
+                        get_integer_results = False):
+    team = legacy_team(obst_lvl, shoot_lvl, lib_lvl, skill_leader, [skill_soldier], skill_other,
+                       roll_indiv, roll_group, options, hazard_approach)
+    res = legacy_result(solve_team(team), 1, get_integer_results)
+    if verbose:
+        print_verbose(res, options, hazard_approach)
+    return res
+
+def solve_maxmin_soldier_two_or_three(obst_lvl,
+                        shoot_lvl,
+                        lib_lvl,
+                        skill_leader,
+                        skill_soldier_1,
+                        skill_soldier_2,
+                        skill_other,
+                        roll_indiv = 1,
+                        roll_group = 4,
+                        options = [JOB.Soldier, JOB.Nat_Scientist, JOB.Soc_Scientist],
+                        hazard_approach = HAZARD.Neutral,
+                        verbose=False,
+                        get_integer_results = False):
+    team = legacy_team(obst_lvl, shoot_lvl, lib_lvl, skill_leader, [skill_soldier_1, skill_soldier_2], skill_other,
+                       roll_indiv, roll_group, options, hazard_approach)
+    res = legacy_result(solve_team(team), 2, get_integer_results)
+    if verbose:
+        print_verbose(res, options, hazard_approach)
+    return res
+
+def solve_maxmin_all_hazards(obst_lvl,
+                             shoot_lvl,
+                             lib_lvl,
+                             skill_leader,
+                             skill_soldiers,
+                             skill_other,
+                             roll_indiv = 1,
+                             roll_group = 4,
+                             options = [JOB.Soldier, JOB.Nat_Scientist, JOB.Soc_Scientist],
+                             verbose=False,
+                             get_integer_results = False,
+                             progress = None,
+                             warm = None):
+    # skill_soldiers lists the explicit soldiers (slot 1, or slots 1 and 2) like
+    # the three functions above; the result also carries the winning "hazard".
+    # warm is an earlier result of this function with the same options and
+    # number of soldiers, to start the search from (see _search), plus the
+    # arguments it was solved for under "inputs" when they are known.
+    team = legacy_team(obst_lvl, shoot_lvl, lib_lvl, skill_leader, skill_soldiers, skill_other,
+                       roll_indiv, roll_group, options, HAZARD.Neutral)
+    if warm is not None:
+        # Every input only makes the team stronger when it goes up
+        inputs = {"obst_lvl": obst_lvl, "shoot_lvl": shoot_lvl, "lib_lvl": lib_lvl, "skill_leader": skill_leader,
+                  "skill_soldiers": skill_soldiers, "skill_other": skill_other,
+                  "roll_indiv": roll_indiv, "roll_group": roll_group}
+        old = warm.get("inputs")
+        weaker = old is not None and all(np.all(np.asarray(inputs[k]) <= np.asarray(old[k])) for k in inputs)
+        warm = {"t": warm["t"], "leader": warm["x1"], "hazard": warm.get("hazard"),
+                "ceiling": warm["t"] if weaker else None,
+                "pools": [[warm["a"]], [warm[f"x{i + 2}"] for i in range(len(skill_soldiers))]]}
+    res = solve_team_all_hazards(team, progress=progress, warm=warm)
+    out = legacy_result(res, len(skill_soldiers), get_integer_results)
+    if verbose:
+        print_verbose(out, options, out["hazard"])
+    return out
+
+def solve_compositions(obst_lvl,
+                       shoot_lvl,
+                       lib_lvl,
+                       skill_leader,
+                       skill_member,
+                       roll_indiv = 1,
+                       roll_group = 4,
+                       compositions = COMPOSITIONS,
+                       top = None,
+                       get_integer_results = False,
+                       progress = None):
+    # Every composition (three JOBs, soldiers first) with all members at
+    # skill_member, each against every hazard approach. Returns the results
+    # of solve_maxmin_all_hazards plus "option", best first; ties keep the
+    # order of compositions. progress(done, total) is called before each one.
+    #
+    # With top, only the best top are wanted: compositions go strongest bound
+    # first and each only has to beat the top-th answer found so far, which a
+    # single check at that value usually rules out.
+    entries = []
+    for c, option in enumerate(compositions):
+        option = list(option)
+        # Like the GUI: slots 1 and 2 get their own allocation when they are
+        # soldiers, everyone else shares 'a'
+        nb_explicit = 2 if option[:2] == [JOB.Soldier, JOB.Soldier] else int(option[0] == JOB.Soldier)
+        team = legacy_team(obst_lvl, shoot_lvl, lib_lvl, skill_leader, [skill_member] * nb_explicit, skill_member,
+                           roll_indiv, roll_group, option, HAZARD.Neutral)
+        teams = [{**team, "haz_mod": haz._value_} for haz in HAZARD]
+        entries.append((c, option, nb_explicit, teams, max(_upper_bound(team) for team in teams)))
+    if top is not None:
+        entries.sort(key=lambda entry: -entry[4])
+
+    ranked = []
+    for done, (c, option, nb_explicit, teams, _) in enumerate(entries):
+        if progress is not None:
+            progress(done, len(entries))
+        floor = None
+        if top is not None and len(ranked) >= top:
+            floor = sorted((res["t"] for _, res in ranked), reverse=True)[top - 1]
+        found = _search(teams, floor=floor)
+        if found is None:
+            continue
+        k, res = found
+        res["hazard"] = list(HAZARD)[k]
+        out = legacy_result(res, nb_explicit, get_integer_results)
+        out["option"] = option
+        ranked.append((c, out))
+    ranked.sort(key=lambda entry: (-entry[1]["t"], entry[0]))
+    return [out for _, out in ranked[:top]]
+
+def _roll_shift(team, d_indiv, d_group):
+    # How far any z formula of the team moves when the rolls move by d_indiv
+    # and d_group (the same for every allocation, the rolls are plain offsets)
+    haz_mod = team["haz_mod"]
+    shifts = [d_indiv / 1.5, d_indiv / (1.5 * haz_mod[3]),
+              d_group / (4 * haz_mod[1]), d_group / (4 * haz_mod[3]), d_group / (4 * haz_mod[2])]
+    if team["leader_nat"] or team["leader_soc"]:
+        shifts.append(d_indiv)
+    if not team["leader_soc"]:
+        shifts.append(d_indiv / (1.5 * haz_mod[0]))
+    return max(shifts)
+
+def solve_frontier(obst_lvl,
+                   shoot_lvl,
+                   lib_lvl,
+                   skill_leader,
+                   skill_soldiers,
+                   skill_other,
+                   rolls = list(probability.values()),
+                   options = [JOB.Soldier, JOB.Nat_Scientist, JOB.Soc_Scientist],
+                   get_integer_results = False,
+                   progress = None):
+    # solve_maxmin_all_hazards for every (roll_indiv, roll_group) in rolls,
+    # results in the same order. progress(done, total) is called before each.
+    #
+    # Only the roll offsets differ between the searches, so they run from the
+    # smallest rolls up and each starts from the answer before: the old
+    # allocation scores at least as well under the bigger rolls, and no
+    # allocation can gain more than the largest shift of a z formula.
+    team = legacy_team(obst_lvl, shoot_lvl, lib_lvl, skill_leader, skill_soldiers, skill_other,
+                       0, 0, options, HAZARD.Neutral)
+    hazards = list(HAZARD)
+    out = [None] * len(rolls)
+    prev = None
+    for done, r in enumerate(sorted(range(len(rolls)), key=lambda r: tuple(rolls[r]))):
+        if progress is not None:
+            progress(done, len(rolls))
+        ri, rg = rolls[r]
+        teams = [{**team, "roll_indiv": ri, "roll_group": rg, "haz_mod": haz._value_} for haz in hazards]
+        warm = None
+        if prev is not None:
+            (p_ri, p_rg), k, res = prev
+            shift = max(_roll_shift(t, ri - p_ri, rg - p_rg) for t in teams)
+            warm = {"t": res["t"], "leader": res["leader"], "pools": res["pools"], "variant": k,
+                    "ceiling": res["t"] + shift + EPS}
+        k, res = _search(teams, warm=warm)
+        prev = (ri, rg), k, res
+        res = {**res, "hazard": hazards[k]}
+        out[r] = legacy_result(res, len(skill_soldiers), get_integer_results)
+    return out
+
+def solve_roadmap(obst_lvl,
+                  shoot_lvl,
+                  lib_lvl,
+                  steps,
+                  roll_indiv = 1,
+                  roll_group = 4,
+                  options = [JOB.Soldier, JOB.Nat_Scientist, JOB.Soc_Scientist],
+                  get_integer_results = False,
+                  progress = None):
+    # solve_maxmin_all_hazards for every (skill_leader, skill_soldiers,
+    # skill_other) of steps, e.g. the levels a team goes through, each step at
+    # least as strong as the one before. progress(done, total) is called
+    # before each.
+    #
+    # Every step starts from the answer of the step before: its allocation
+    # with the new points added is a lower bound, and the search probes first
+    # where the last gain in t says the answer should be.
+    hazards = list(HAZARD)
+    out = []
+    prev = None
+    last_t = None
+    for done, (skill_leader, skill_soldiers, skill_other) in enumerate(steps):
+        if progress is not None:
+            progress(done, len(steps))
+        team = legacy_team(obst_lvl, shoot_lvl, lib_lvl, skill_leader, skill_soldiers, skill_other,
+                           roll_indiv, roll_group, options, HAZARD.Neutral)
+        warm = None
+        if prev is not None:
+            k, res = prev
+            warm = {"t": res["t"], "leader": res["leader"], "pools": res["pools"], "variant": k}
+            if last_t is not None:
+                warm["guess"] = 2 * res["t"] - last_t
+            last_t = res["t"]
+        k, res = _search([{**team, "haz_mod": haz._value_} for haz in hazards], warm=warm)
+        prev = k, res
+        out.append(legacy_result({**res, "hazard": hazards[k]}, len(skill_soldiers), get_integer_results))
+    return out
+
+def reaches(obst_lvl,
+            shoot_lvl,
+            lib_lvl,
+            skill_leader,
+            skill_soldiers,
+            skill_other,
+            t,
+            roll_indiv = 1,
+            roll_group = 4,
+            options = [JOB.Soldier, JOB.Nat_Scientist, JOB.Soc_Scientist]):
+    # Whether solve_maxmin_all_hazards would come out at t or more: one exact
+    # check per hazard (often none, the bounds settle it) instead of a search
+    team = legacy_team(obst_lvl, shoot_lvl, lib_lvl, skill_leader, skill_soldiers, skill_other,
+                       roll_indiv, roll_group, options, HAZARD.Neutral)
+    teams = [{**team, "haz_mod": haz._value_} for haz in HAZARD]
+    if any(_lower_bound(team) >= t for team in teams):
+        return True
+    return any(_upper_bound(team) + EPS >= t and feasible(team, t) for team in teams)
+
+def solve_maxmin_team(obst_lvl,
+                      shoot_lvl,
+                      lib_lvl,
+                      leader_level,
+                      members,
+                      roll_indiv = 1,
+                      roll_group = 4,
+                      hazard_approach = HAZARD.Neutral,
+                      verbose=False,
+                      get_integer_results = False):
+    # members is a list of (JOB, level), each with its own allocation. Passing
+    # hazard_approach=None searches every hazard and returns the winner.
+    team = member_team(obst_lvl, shoot_lvl, lib_lvl, leader_level, members, roll_indiv, roll_group,
+                       hazard_approach or HAZARD.Neutral)
+    res = solve_team(team) if hazard_approach else solve_team_all_hazards(team)
+    out = members_result(team, res, get_integer_results)
+    if verbose:
+        print_verbose(out, [job for job, _ in members], out.get("hazard", hazard_approach))
+    return out
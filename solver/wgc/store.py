@@ -0,0 +1,89 @@
+import json
+import os
+import sqlite3
+import sys
+import threading
+
+# Answers kept on disk between sessions, in a small SQLite file. Keys are the
+# canonical inputs (see calc.solve_key) with the solver version in front, so
+# answers from an older model are never served: they just stop matching and
+# get evicted like any other unused entry.
+#
+# The file sits in the user's cache folder; WGC_CACHE overrides the path and
+# WGC_CACHE=off turns the disk cache off.
+
+MAX_ENTRIES = 100_000
+
+def cache_folder():
+    # The app's folder in the user's cache folder
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA", os.path.expanduser("~"))
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache"))
+    return os.path.join(base, "wgc-team-optimizer")
+
+def default_path():
+    path = os.environ.get("WGC_CACHE")
+    if path:
+        return None if path == "off" else path
+    return os.path.join(cache_folder(), "answers.sqlite")
+
+class DiskCache:
+    def __init__(self, path, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # The GUI reads from the Tk thread and writes from the solver worker
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        # WAL without a sync per commit keeps a lookup (which bumps "used") cheap
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("CREATE TABLE IF NOT EXISTS answers (key TEXT PRIMARY KEY, value TEXT, used INTEGER)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS answers_used ON answers (used)")
+        self.clock, self.count = self.db.execute("SELECT COALESCE(MAX(used), 0), COUNT(*) FROM answers").fetchone()
+        self.db.commit()
+
+    def get(self, key):
+        with self.lock:
+            row = self.db.execute("SELECT value FROM answers WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.clock += 1
+            self.db.execute("UPDATE answers SET used = ? WHERE key = ?", (self.clock, key))
+            self.db.commit()
+            return json.loads(row[0])
+
+    def put(self, key, value):
+        with self.lock:
+            self.clock += 1
+            value = json.dumps(value)
+            if self.db.execute("INSERT OR IGNORE INTO answers VALUES (?, ?, ?)", (key, value, self.clock)).rowcount:
+                self.count += 1
+            else:
+                self.db.execute("UPDATE answers SET value = ?, used = ? WHERE key = ?", (value, self.clock, key))
+            # Least recently used entries go once the table is full, a tenth at
+            # a time so this does not run on every insert
+            if self.count > self.max_entries:
+                drop = self.count - self.max_entries + self.max_entries // 10
+                self.db.execute("DELETE FROM answers WHERE key IN (SELECT key FROM answers ORDER BY used LIMIT ?)", (drop,))
+                self.count -= drop
+            self.db.commit()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": self.count}
+
+    def clear(self):
+        with self.lock:
+            self.db.execute("DELETE FROM answers")
+            self.db.commit()
+            self.count = 0
+
+    def close(self):
+        with self.lock:
+            self.db.close()
@@ -0,0 +1,103 @@
+import json
+import mmap
+import os
+import struct
+
+# Precomputed answers for a grid of GUI inputs, built by build_table.py and
+# shipped next to the app. The file is a short JSON header followed by one
+# column per field (t, hazard and the points of every row), each a flat array
+# in grid order. Looking up an answer is an index computation and one read
+# per column out of a memory map, so nothing gets loaded up front.
+#
+# Grid axes: job option, leader level, member level (the soldiers and the
+# others all at that level), shooting, obstacle and library levels as typed in
+# the GUI, and success chance.
+
+MAGIC = b"WGCT"
+AXES = ["option", "leader_lvl", "member_lvl", "shoot", "obst", "lib", "success"]
+ROWS = ["leader", "slot1", "slot2", "others"]
+# name, struct format, values per grid point
+COLUMNS = [("t", "d", 1), ("max_level", "h", 1), ("hazard", "B", 1)] + [(row, "H", 3) for row in ROWS]
+
+def default_path():
+    # WGC_TABLE, or answers.tbl next to the wgc package (the solver folder, or
+    # the app folder of a PyInstaller build)
+    return os.environ.get("WGC_TABLE",
+                          os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "answers.tbl"))
+
+def _option_key(option):
+    return ",".join(job.name for job in option)
+
+def write_table(path, version, axes, hazards, values):
+    # axes: values of every axis in AXES (options as lists of JOB names);
+    # hazards: names in the order used by the "hazard" column;
+    # values: column name -> flat sequence in grid order
+    header = {"version": version, "axes": axes, "hazards": hazards, "columns": {}}
+    blobs = []
+    offset = 0
+    for name, fmt, width in COLUMNS:
+        blob = struct.pack(f"<{len(values[name])}{fmt}", *values[name])
+        header["columns"][name] = [offset, fmt, width]
+        blobs.append(blob)
+        offset += len(blob)
+    head = json.dumps(header).encode()
+    with open(path + ".tmp", "wb") as f:
+        f.write(MAGIC + struct.pack("<I", len(head)) + head)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(path + ".tmp", path)
+
+class AnswerTable:
+    def __init__(self, path):
+        self.f = open(path, "rb")
+        self.mm = mmap.mmap(self.f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.mm[:4] != MAGIC:
+            raise ValueError(f"{path} is not an answer table")
+        size = struct.unpack_from("<I", self.mm, 4)[0]
+        header = json.loads(self.mm[8:8 + size])
+        self.base = 8 + size
+        self.version = header["version"]
+        self.hazards = header["hazards"]
+        self.columns = header["columns"]
+        # Position of every axis value, and the stride of every axis
+        self.index = []
+        for name in AXES:
+            values = header["axes"][name]
+            if name == "option":
+                values = [",".join(v) for v in values]
+            self.index.append({v: i for i, v in enumerate(values)})
+        self.strides = []
+        stride = 1
+        for positions in reversed(self.index):
+            self.strides.append(stride)
+            stride *= len(positions)
+        self.strides.reverse()
+
+    def lookup(self, option, leader_lvl, soldier_1_lvl, soldier_2_lvl, others_lvl, shoot, obst, lib, success):
+        # The stored answer for these GUI inputs (same arguments as
+        # calc.calculate), or None when they are outside the grid
+        from .game import JOB, HAZARD
+
+        # Only the soldiers that get their own allocation need to match
+        if option[0] == JOB.Soldier and soldier_1_lvl != others_lvl:
+            return None
+        if option[0] == JOB.Soldier and option[1] == JOB.Soldier and soldier_2_lvl != others_lvl:
+            return None
+        point = 0
+        for positions, stride, value in zip(self.index, self.strides,
+                                            [_option_key(option), leader_lvl, others_lvl, shoot, obst, lib, success]):
+            if value not in positions:
+                return None
+            point += positions[value] * stride
+
+        res = {}
+        for name, (offset, fmt, width) in self.columns.items():
+            size = struct.calcsize(fmt)
+            values = struct.unpack_from(f"<{width}{fmt}", self.mm, self.base + offset + point * width * size)
+            res[name] = list(values) if width > 1 else values[0]
+        res["hazard"] = HAZARD[self.hazards[res["hazard"]]]
+        return res
+
+    def close(self):
+        self.mm.close()
+        self.f.close()
@@ -0,0 +1,231 @@
+import numpy as np
+
+from .game import JOB, HAZARD, convert_to_skill_point, whole_level
+
+# A team is a plain dict that both backends read:
+#   the facility levels, rolls and haz_mod of one query,
+#   the leader's skill points and whether the leader takes the wit checks
+#   (z2 when there is no natural scientist, z3 when there is no social one),
+#   two pools of members, U and V. Members of a pool weigh the same in the
+#   group checks z4-z6 ("w") and share the same lower bounds ("lb").
+# U holds the scientists (or the shared 'a' allocation of the old models),
+# V the soldiers.
+#
+# Anything here that changes answers needs calc.SOLVER_VERSION bumped, or
+# the disk cache keeps serving the old ones.
+
+SOLDIER_WEIGHTS = np.array([2, 1, 1], dtype=float)
+SCIENTIST_WEIGHTS = np.array([1, 1, 1.5], dtype=float)
+LEADER_LB = (1, 1, 1)
+SOLDIER_LB = (1, 1, 0)
+SCIENTIST_LB = (0, 0, 2)
+# Hazard approaches whose answers are this close (relative, like golden.py
+# compares backends) tie, and the earliest one wins: the MILP backends only
+# get t up to rounding.
+TIE = 1e-6
+
+def _others_bounds(nb_explicit, nb_soldier):
+    # Covering all cases
+    lb = [1, 1, 2]
+    if nb_soldier == 0: # No soldiers = lower bound for pow/ath doesn't matter
+        lb[0] = 0
+        lb[1] = 0
+    elif nb_soldier == 3 - nb_explicit: # All soldiers = lower bound for wit doesn't matter
+        lb[2] = 0
+    return tuple(lb)
+
+def _others_weights(nb_explicit, nb_soldier):
+    # Coefficients of 'a' in z4, z5 and z6 of the old hand-written models. These
+    # are the per-member weights summed over the members sharing 'a', except
+    # for the team without explicit soldiers whose wit weight is one lower.
+    wit = {0: 3.5, 1: 3, 2: 1.5}[nb_explicit] - 0.5 * nb_soldier
+    return np.array([3 - nb_explicit + nb_soldier, 3 - nb_explicit, wit], dtype=float)
+
+def _team(obst_lvl, shoot_lvl, lib_lvl, skill_leader, roll_indiv, roll_group, jobs, hazard_approach, pools):
+    return {
+        "obst_lvl": obst_lvl,
+        "shoot_lvl": shoot_lvl,
+        "lib_lvl": lib_lvl,
+        "roll_indiv": roll_indiv,
+        "roll_group": roll_group,
+        "haz_mod": hazard_approach._value_,
+        "skill_leader": skill_leader,
+        "leader_nat": all(j != JOB.Nat_Scientist for j in jobs),
+        "leader_soc": all(j != JOB.Soc_Scientist for j in jobs),
+        "pools": pools
+    }
+
+def legacy_team(obst_lvl, shoot_lvl, lib_lvl, skill_leader, skill_soldiers, skill_other,
+                roll_indiv, roll_group, options, hazard_approach):
+    # The team of solve_maxmin_no_soldier / _soldier / _soldier_two_or_three:
+    # skill_soldiers are the explicit soldiers, everyone else shares 'a'
+    nb_explicit = len(skill_soldiers)
+    nb_soldier = options.count(JOB.Soldier) - nb_explicit
+    use_leader_nat_sci = all(j != JOB.Nat_Scientist for j in options)
+    use_leader_soc_sci = all(j != JOB.Soc_Scientist for j in options)
+
+    others = {
+        "w": _others_weights(nb_explicit, nb_soldier),
+        "lb": _others_bounds(nb_explicit, nb_soldier),
+        "members": [{"budget": skill_other, "nat": not use_leader_nat_sci, "soc": not use_leader_soc_sci}]
+    }
+    soldiers = {
+        "w": SOLDIER_WEIGHTS,
+        "lb": SOLDIER_LB,
+        "members": [{"budget": s, "nat": False, "soc": False} for s in skill_soldiers]
+    }
+    return _team(obst_lvl, shoot_lvl, lib_lvl, skill_leader, roll_indiv, roll_group,
+                 options, hazard_approach, [others, soldiers])
+
+def member_team(obst_lvl, shoot_lvl, lib_lvl, leader_level, members,
+                roll_indiv = 1, roll_group = 4, hazard_approach = HAZARD.Neutral):
+    # Any team from a list of (JOB, level), one allocation per member
+    scientists = {"w": SCIENTIST_WEIGHTS, "lb": SCIENTIST_LB, "members": []}
+    soldiers = {"w": SOLDIER_WEIGHTS, "lb": SOLDIER_LB, "members": []}
+    for slot, (job, level) in enumerate(members):
+        member = {
+            "budget": convert_to_skill_point(level, False),
+            "nat": job == JOB.Nat_Scientist,
+            "soc": job == JOB.Soc_Scientist,
+            "slot": slot
+        }
+        if job == JOB.Soldier:
+            soldiers["members"].append(member)
+        else:
+            scientists["members"].append(member)
+    return _team(obst_lvl, shoot_lvl, lib_lvl, convert_to_skill_point(leader_level, True),
+                 roll_indiv, roll_group, [job for job, _ in members], hazard_approach, [scientists, soldiers])
+
+def model_size(team):
+    # What a team costs to model: members, integer variables, binaries and
+    # constraints of the MILP, and leader splits the native backend enumerates
+    nb_members = sum(len(pool["members"]) for pool in team["pools"])
+    nb_nat = 0 if team["leader_nat"] else sum(m["nat"] for pool in team["pools"] for m in pool["members"])
+    nb_soc = 0 if team["leader_soc"] else sum(m["soc"] for pool in team["pools"] for m in pool["members"])
+    free = team["skill_leader"] - sum(LEADER_LB)
+    return {
+        "members": nb_members + 1,
+        "integer_variables": 3 * (nb_members + 1),
+        "binaries": nb_members + 1,
+        "constraints": (nb_members + 1) * 4 + 1 + max(nb_nat, 1) + max(nb_soc, 1) + 5,
+        "leader_splits": (free + 1) * (free + 2) // 2
+    }
+
+def tie_floor(t):
+    # The lowest t that ties with t (or an array of them)
+    return t - TIE * np.maximum(1, np.abs(t))
+
+def best_hazard(ts):
+    # Index of the winning hazard from their answers t in order: the earliest
+    # one tying with the highest
+    floor = tie_floor(max(ts))
+    return next(k for k, t in enumerate(ts) if t >= floor)
+
+################################
+########### Results ############
+################################
+
+def z_values(team, leader, pools):
+    # z0-z6 of an allocation; pools holds one (n_members, 3) array per pool
+    ri, rg = team["roll_indiv"], team["roll_group"]
+    haz_mod = team["haz_mod"]
+    shoot, obst, lib = team["shoot_lvl"], team["obst_lvl"], team["lib_lvl"]
+    leader = np.asarray(leader, dtype=float)
+
+    power = [leader[0]]
+    athletics = [leader[1]]
+    group = leader.copy()
+    nat = [] if team["leader_nat"] else [np.inf]
+    soc = [] if team["leader_soc"] else [np.inf]
+    for pool, alloc in zip(team["pools"], pools):
+        for member, x in zip(pool["members"], alloc):
+            power.append(x[0] + 0.5 * leader[0])
+            athletics.append(x[1] + 0.5 * leader[1])
+            if member["nat"]:
+                nat.append(x[2] + 0.5 * leader[2])
+            if member["soc"]:
+                soc.append(x[2] + 0.5 * leader[2])
+            group += pool["w"] * x
+
+    return {
+        "z0": (min(power) * shoot + ri - 10) / 1.5,
+        "z1": (max(athletics) * obst + ri - (10 * haz_mod[3])) / (1.5 * haz_mod[3]),
+        "z2": lib * leader[2] + ri - 10 if team["leader_nat"] else (min(nat) * lib + ri - 10) / 1.5,
+        "z3": lib * leader[2] + ri - 10 if team["leader_soc"] else (min(soc) * lib + ri - (10 * haz_mod[0])) / (1.5 * haz_mod[0]),
+        "z4": (shoot * group[0] + rg - (40 * haz_mod[1])) / (4 * haz_mod[1]),
+        "z5": (obst * group[1] + rg - (40 * haz_mod[3])) / (4 * haz_mod[3]),
+        "z6": (lib * group[2] + rg - (40 * haz_mod[2])) / (4 * haz_mod[2])
+    }
+
+def z_rows(team, leader, members, w0, w1):
+    # z0-z6 (reduced & linearized) for the MILP backends, as
+    # ([(variable, coefficient)], constant). The variables are whatever the
+    # backend uses (pulp variables, column indices); members lists
+    # (pool, member, x) with x the three variables of the member, w0 the
+    # lowest power and w1 the highest athletics.
+    haz_mod = team["haz_mod"]
+    ri, rg = team["roll_indiv"], team["roll_group"]
+    shoot_lvl, obst_lvl, lib_lvl = team["shoot_lvl"], team["obst_lvl"], team["lib_lvl"]
+
+    rows = [([(w0, shoot_lvl / 1.5)], (ri - 10) / 1.5),
+            ([(w1, obst_lvl / (1.5 * haz_mod[3]))], (ri - 10 * haz_mod[3]) / (1.5 * haz_mod[3]))]
+    if team["leader_nat"]:
+        rows.append(([(leader[2], lib_lvl)], ri - 10))
+    else:
+        rows += [([(x[2], lib_lvl / 1.5), (leader[2], 0.5 * lib_lvl / 1.5)], (ri - 10) / 1.5)
+                 for _, member, x in members if member["nat"]]
+    if team["leader_soc"]:
+        rows.append(([(leader[2], lib_lvl)], ri - 10))
+    else:
+        d = 1.5 * haz_mod[0]
+        rows += [([(x[2], lib_lvl / d), (leader[2], 0.5 * lib_lvl / d)], (ri - 10 * haz_mod[0]) / d)
+                 for _, member, x in members if member["soc"]]
+
+    for g, (lvl, h) in enumerate([(shoot_lvl, haz_mod[1]), (obst_lvl, haz_mod[3]), (lib_lvl, haz_mod[2])]):
+        d = 4 * h
+        rows.append(([(leader[g], lvl / d)] + [(x[g], pool["w"][g] * lvl / d) for pool, _, x in members],
+                     (rg - 40 * h) / d))
+    return rows
+
+def _z_out(res, get_integer_results):
+    if get_integer_results:
+        return {k: whole_level(v) for k, v in res["z"].items()}
+    return res["z"]
+
+def legacy_result(res, nb_explicit, get_integer_results):
+    # The result dict of the old models: x1 leader, x2/x3 soldiers, a others
+    out = {"t": res["t"], "x1": res["leader"]}
+    for i in range(nb_explicit):
+        out[f"x{i + 2}"] = res["pools"][1][i]
+    out["a"] = res["pools"][0][0]
+    out["z"] = _z_out(res, get_integer_results)
+    if "hazard" in res:
+        out["hazard"] = res["hazard"]
+    if "stats" in res:
+        out["stats"] = res["stats"]
+    return out
+
+def members_result(team, res, get_integer_results):
+    # x1 for the leader and one allocation per member, in the order given
+    members = [None] * sum(len(pool["members"]) for pool in team["pools"])
+    for pool, alloc in zip(team["pools"], res["pools"]):
+        for member, x in zip(pool["members"], alloc):
+            members[member["slot"]] = x
+    out = {"t": res["t"], "x1": res["leader"], "members": members, "z": _z_out(res, get_integer_results)}
+    if "hazard" in res:
+        out["hazard"] = res["hazard"]
+    if "stats" in res:
+        out["stats"] = res["stats"]
+    return out
+
+def print_verbose(res, options, hazard_approach, status = None):
+    print(f"Conditions: {options}; {hazard_approach}")
+    if status is not None:
+        print("status:", status)
+    print("t:", res["t"])
+    print("x1:", *res["x1"])
+    if "a" in res:
+        print("a :", *res["a"])
+    else:
+        for x in res["members"]:
+            print("  :", *x)
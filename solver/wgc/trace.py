@@ -0,0 +1,135 @@
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+# Wall time per phase of a solve, to find out where a slow click goes. Off
+# unless WGC_TRACE is set (to 1, or to a .jsonl file every event is appended
+# to) or enable() is called. While off, phase() hands back one shared context
+# that does nothing, so instrumented code pays a function call per phase.
+#
+# An event is a flat dict: "phase", "seconds", "at" (seconds since tracing
+# started), "request" (see request()) and "thread", plus whatever the phase
+# knows: "backend", "hazard", "status", "nodes" (branch-and-bound nodes; exact
+# checks for native), "gap" (relative MIP gap), "source" (where an answer
+# came from). Phases:
+#   gui/parse     validate_user_inputs
+#   gui/show      set_results
+#   calc/lookup   answer from memory, the answer table or the disk cache
+#   calc/store    answer written to the disk cache
+#   solve         one solve on a backend, every hazard
+#   native/search the search over every hazard
+#   cbc/build     model built (first team of its shape)
+#   cbc/update    coefficients of this team set
+#   cbc/process   CBC's process: writing the model, starting CBC, reading the
+#                 solution (the solve's wall time minus CBC's own)
+#   cbc/solve     branch and bound as CBC timed it
+#   highs/build   sparse matrices built
+#   highs/solve   HiGHS's milp call
+#   <backend>/extract  results read back into numpy arrays and z values
+
+EVENTS = 2000 # kept in memory for the diagnostics panel
+enabled = False
+events = deque(maxlen=EVENTS)
+_path = None
+_start = time.perf_counter()
+_lock = threading.Lock()
+_local = threading.local()
+_requests = itertools.count(1)
+
+class _Off:
+    def __enter__(self):
+        return {}
+    def __exit__(self, *exc):
+        return False
+
+_OFF = _Off()
+
+class _Phase:
+    def __init__(self, name, fields):
+        self.name = name
+        self.info = fields
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self.info
+    def __exit__(self, exc_type, *exc):
+        if exc_type is not None:
+            self.info["error"] = exc_type.__name__
+        record(self.name, time.perf_counter() - self.start, **self.info)
+        return False
+
+def enable(path=None):
+    # Start recording; path also appends every event to a .jsonl file
+    global enabled, _path
+    _path = path
+    enabled = True
+
+def disable():
+    global enabled
+    enabled = False
+
+def phase(name, **fields):
+    # with trace.phase("cbc/solve", hazard=...) as info: ..., info takes more
+    # fields found out on the way (status, nodes, ...)
+    if not enabled:
+        return _OFF
+    return _Phase(name, fields)
+
+class request:
+    # Labels the events of this thread until the with block ends, e.g. with
+    # the GUI's request number; a new number when none is given
+    def __init__(self, label=None):
+        self.label = next(_requests) if label is None else label
+    def __enter__(self):
+        self.outer = getattr(_local, "request", None)
+        _local.request = self.label
+        return self.label
+    def __exit__(self, *exc):
+        _local.request = self.outer
+        return False
+
+def record(name, seconds, **fields):
+    event = {"phase": name, "seconds": seconds, "at": time.perf_counter() - _start,
+             "request": getattr(_local, "request", None), "thread": threading.current_thread().name, **fields}
+    with _lock:
+        events.append(event)
+        if _path:
+            with open(_path, "a") as f:
+                f.write(json.dumps(event, default=str) + "\n")
+
+def recent(n=None):
+    with _lock:
+        return list(events)[-n:] if n else list(events)
+
+def clear():
+    with _lock:
+        events.clear()
+
+def export(path):
+    # Every event in memory to a .jsonl file, one event per line
+    with open(path, "w") as f:
+        for event in recent():
+            f.write(json.dumps(event, default=str) + "\n")
+
+def summary():
+    # {phase: {"count", "seconds", "max"}} over the events in memory
+    out = {}
+    for event in recent():
+        total = out.setdefault(event["phase"], {"count": 0, "seconds": 0.0, "max": 0.0})
+        total["count"] += 1
+        total["seconds"] += event["seconds"]
+        total["max"] = max(total["max"], event["seconds"])
+    return out
+
+def hazard_name(haz_mod):
+    # The HAZARD of a team's haz_mod, for labelling events
+    from .game import HAZARD
+    for haz in HAZARD:
+        if list(haz._value_) == list(haz_mod):
+            return haz.name
+    return str(haz_mod)
+
+if os.environ.get("WGC_TRACE"):
+    enable(None if os.environ["WGC_TRACE"] in ("1", "on") else os.environ["WGC_TRACE"])